@@ -0,0 +1,193 @@
+"""Load strategies for ``property_data``.
+
+- ``load-data``: ``LOAD DATA LOCAL INFILE`` from a temp CSV. Fastest, but the
+  server needs ``local_infile=ON`` and the connection
+  ``allow_local_infile=True``. If the server refuses it, the batch is loaded
+  with ``multirow`` instead.
+- ``multirow``: ``INSERT ... VALUES (...), (...), ...`` with ``batch_size``
+  rows per statement.
+- ``executemany``: the original parameterized single-row INSERT.
+
+Every ``load()`` call is one transaction: committed on success, rolled back
+and re-raised on error.
+"""
+
+import csv
+import os
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+
+COLUMNS = (
+    "prop_type",
+    "purpose",
+    "covered_area",
+    "price",
+    "location",
+    "beds",
+    "baths",
+    "amenities",
+)
+STRATEGIES = ("load-data", "multirow", "executemany")
+
+# Secondary (non-unique) indexes from Mysql/init.sql. Dropping these during a
+# big load and rebuilding them once afterwards is safe: nothing enforces them.
+SECONDARY_INDEXES = {
+    "idx_location": "(location)",
+    "idx_purpose_prop_type": "(purpose, prop_type)",
+    "idx_price": "(price)",
+    "idx_covered_area": "(covered_area)",
+}
+
+_ROW_PLACEHOLDERS = f"({', '.join(['%s'] * len(COLUMNS))})"
+INSERT_PREFIX = f"INSERT INTO property_data ({', '.join(COLUMNS)}) VALUES "
+
+
+@dataclass
+class LoadReport:
+    strategy: str
+    rows: int = 0
+    seconds: float = 0.0
+    unchanged: int = 0  # incremental loads: rows skipped as already loaded
+
+    @property
+    def rows_per_second(self):
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def add(self, other):
+        self.rows += other.rows
+        self.seconds += other.seconds
+        self.unchanged += other.unchanged
+
+    def __str__(self):
+        skipped = f", {self.unchanged} unchanged skipped" if self.unchanged else ""
+        return (
+            f"📊 {self.strategy}: {self.rows} rows in {self.seconds:.2f}s "
+            f"({self.rows_per_second:,.0f} rows/s{skipped})"
+        )
+
+
+def insert_executemany(cursor, rows, batch_size):
+    cursor.executemany(INSERT_PREFIX + _ROW_PLACEHOLDERS, rows)
+
+
+def insert_multirow(cursor, rows, batch_size, columns=COLUMNS, suffix=""):
+    prefix = f"INSERT INTO property_data ({', '.join(columns)}) VALUES "
+    placeholders = f"({', '.join(['%s'] * len(columns))})"
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start : start + batch_size]
+        cursor.execute(
+            prefix + ", ".join([placeholders] * len(batch)) + suffix,
+            [value for row in batch for value in row],
+        )
+
+
+def write_load_csv(rows, path):
+    """Strings quoted, NULL as an empty unquoted field (see ``NULLIF`` below)."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f, quoting=csv.QUOTE_NONNUMERIC, lineterminator="\n").writerows(rows)
+
+
+def load_data_query():
+    # amenities is never NULL (blank is ''), every other column may be.
+    variables = [f"@{c}" if c != "amenities" else c for c in COLUMNS]
+    assignments = [f"{c} = NULLIF(@{c}, '')" for c in COLUMNS if c != "amenities"]
+    return (
+        "LOAD DATA LOCAL INFILE %s INTO TABLE property_data "
+        "CHARACTER SET utf8mb4 "
+        "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '' "
+        "LINES TERMINATED BY '\\n' "
+        f"({', '.join(variables)}) SET {', '.join(assignments)}"
+    )
+
+
+def load_data_infile(cursor, rows, batch_size):
+    fd, path = tempfile.mkstemp(prefix="property_data.", suffix=".csv")
+    os.close(fd)
+    try:
+        write_load_csv(rows, path)
+        cursor.execute(load_data_query(), (path,))
+    finally:
+        os.remove(path)
+
+
+LOADERS = {
+    "load-data": load_data_infile,
+    "multirow": insert_multirow,
+    "executemany": insert_executemany,
+}
+
+
+def load(connection, rows, strategy="multirow", batch_size=1000):
+    """Insert ``rows`` (tuples in ``COLUMNS`` order) in one transaction."""
+    start = time.perf_counter()
+    try:
+        _load(connection, rows, strategy, batch_size)
+    except Exception as e:
+        if strategy != "load-data":
+            raise
+        print(f"⚠️ LOAD DATA LOCAL INFILE failed ({e}), using multi-row INSERTs.")
+        strategy = "multirow"
+        _load(connection, rows, strategy, batch_size)
+    return LoadReport(strategy, len(rows), time.perf_counter() - start)
+
+
+def _load(connection, rows, strategy, batch_size):
+    cursor = connection.cursor()
+    try:
+        LOADERS[strategy](cursor, rows, batch_size)
+        connection.commit()
+    except BaseException:
+        try:
+            connection.rollback()
+        except Exception:
+            pass
+        raise
+    finally:
+        cursor.close()
+
+
+@contextmanager
+def deferred_indexes(connection):
+    """Drop the secondary listing indexes for the duration of a bulk load and
+    rebuild them once at the end (even if the load failed).
+
+    The rebuild adds back every ``SECONDARY_INDEXES`` entry missing from the
+    table, not just the ones dropped here, so a run resumed after a killed
+    one also restores the indexes the killed run had dropped.
+    """
+    cursor = connection.cursor()
+    deferred = []
+    try:
+        deferred = [name for name in SECONDARY_INDEXES if name in _index_names(cursor)]
+        if deferred:
+            cursor.execute(
+                "ALTER TABLE property_data "
+                + ", ".join(f"DROP INDEX {name}" for name in deferred)
+            )
+            print(f"⏸️ Deferred indexes: {', '.join(deferred)}")
+        yield deferred
+    finally:
+        existing = _index_names(cursor)
+        missing = [name for name in SECONDARY_INDEXES if name not in existing]
+        if missing:
+            leftover = [name for name in missing if name not in deferred]
+            if leftover:
+                print(
+                    f"⚠️ Restoring indexes missing before this load: {', '.join(leftover)}"
+                )
+            start = time.perf_counter()
+            cursor.execute(
+                "ALTER TABLE property_data "
+                + ", ".join(
+                    f"ADD INDEX {name} {SECONDARY_INDEXES[name]}" for name in missing
+                )
+            )
+            print(f"▶️ Rebuilt indexes in {time.perf_counter() - start:.2f}s")
+        cursor.close()
+
+
+def _index_names(cursor):
+    cursor.execute("SHOW INDEX FROM property_data")
+    return {row[2] for row in cursor.fetchall()}
@@ -0,0 +1,117 @@
+"""Partitioned Parquet copy of the cleaned listings.
+
+``format.py`` writes it next to the cleaned CSV as a hive-style dataset,
+``<root>/purpose=sale/city=Karachi/part-*.parquet``, with numeric dtypes and
+dictionary-encoded (categorical) text columns. Readers such as
+``mlflowserv.py`` then scan only the partitions and columns they need, through
+memory-mapped Arrow files, instead of re-parsing and re-normalizing the CSV.
+"""
+
+import os
+import shutil
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.fs
+import pyarrow.parquet as pq
+
+PARTITION_COLUMNS = ("purpose", "city")
+CATEGORICAL_COLUMNS = ("prop_type", "location")
+UNKNOWN = "unknown"
+
+# Fixed so every chunk writes the same schema (pandas would pick int8/int16
+# dictionary indices, or int64/float64 areas, depending on the chunk).
+CATEGORY = pa.dictionary(pa.int32(), pa.string())
+SCHEMA = pa.schema(
+    [
+        ("prop_type", CATEGORY),
+        ("covered_area", pa.float64()),
+        ("price", pa.float64()),
+        ("location", CATEGORY),
+        ("beds", pa.int16()),
+        ("baths", pa.int16()),
+        ("amenities", pa.string()),
+        ("purpose", pa.string()),
+        ("city", pa.string()),
+    ]
+)
+
+
+def purpose_key(purpose):
+    """``"For Sale "`` -> ``"sale"``; blanks -> ``"unknown"``."""
+    key = purpose.fillna("").astype(str).str.strip().str.lower()
+    key = key.str.replace(r"^for\s+", "", regex=True)
+    return key.mask(key == "", UNKNOWN)
+
+
+def city_of(location):
+    """``"Clifton, Karachi, Sindh"`` -> ``"Karachi"`` (the second-to-last
+    part); a bare ``"Karachi"`` is its own city."""
+    parts = location.fillna("").astype(str).str.split(",")
+    city = parts.map(lambda p: p[-2] if len(p) > 1 else p[0]).str.strip()
+    return city.mask(city == "", UNKNOWN)
+
+
+def to_frame(df):
+    """The cleaned frame with dataset dtypes and the partition columns."""
+    out = pd.DataFrame(
+        {
+            "prop_type": df["prop_type"],
+            "covered_area": pd.to_numeric(df["covered_area"], errors="coerce"),
+            "price": pd.to_numeric(df["price"], errors="coerce"),
+            "location": df["location"],
+            "beds": pd.to_numeric(df["beds"], errors="coerce"),
+            "baths": pd.to_numeric(df["baths"], errors="coerce"),
+            "amenities": df["amenities"].astype("string"),
+            "purpose": purpose_key(df["purpose"]),
+            "city": city_of(df["location"]),
+        }
+    )
+    for col in CATEGORICAL_COLUMNS:
+        out[col] = out[col].astype("category")
+    return out.reset_index(drop=True)
+
+
+def clear(root):
+    if os.path.isdir(root):
+        shutil.rmtree(root)
+
+
+def write(df, root, part=0):
+    """Write ``df`` (cleaned) under ``root``. Files are named after ``part``,
+    so rewriting the same part (a resumed chunk) replaces its files."""
+    table = pa.Table.from_pandas(to_frame(df), schema=SCHEMA, preserve_index=False)
+    pq.write_to_dataset(
+        table,
+        root,
+        partition_cols=list(PARTITION_COLUMNS),
+        basename_template=f"part-{part:05d}-{{i}}.parquet",
+        existing_data_behavior="overwrite_or_ignore",
+    )
+    return len(table)
+
+
+def dataset(root):
+    return ds.dataset(
+        root,
+        format="parquet",
+        partitioning=ds.HivePartitioning.discover(infer_dictionary=True),
+        filesystem=pyarrow.fs.LocalFileSystem(use_mmap=True),
+    )
+
+
+def read(root, columns=None, purpose=None, city=None):
+    """Read ``columns`` (all when None) from the matching partitions only."""
+    filters = []
+    if purpose is not None:
+        filters.append(ds.field("purpose") == purpose)
+    if city is not None:
+        filters.append(ds.field("city") == city)
+    expression = None
+    for f in filters:
+        expression = f if expression is None else expression & f
+    table = dataset(root).to_table(
+        columns=list(columns) if columns is not None else None, filter=expression
+    )
+    return table.to_pandas()
@@ -0,0 +1,127 @@
+"""Concurrent, rate-limited enrichment of items through a slow remote API.
+
+``enrich()`` runs ``fetch(item)`` on a bounded thread pool. Every attempt
+first takes a token from a shared ``TokenBucket``, so the API sees at most
+``rate`` requests/second (plus a ``burst``) however many threads run. Failed
+calls are retried with jittered exponential backoff. The backoff only delays
+that one item, the others keep going. Results are handed to
+``write_batch(results)`` from the calling thread, ``batch_size`` at a time,
+so the DB connection never crosses threads.
+"""
+
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+
+class TokenBucket:
+    def __init__(self, rate, burst=1, clock=time.monotonic, sleep=time.sleep):
+        if rate <= 0 or burst < 1:
+            raise ValueError("Need rate > 0 and burst >= 1")
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(burst)
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available, then take it."""
+        while True:
+            with self._lock:
+                now = self._clock()
+                elapsed = now - self._updated
+                self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+
+
+def backoff_delay(attempt, base=1.0, cap=60.0, rng=random.random):
+    """Full-jitter exponential backoff before retry number ``attempt`` (1-based)."""
+    return rng() * min(cap, base * 2 ** (attempt - 1))
+
+
+def call_with_backoff(
+    fn, *args, retries=3, base=1.0, cap=60.0, limiter=None, sleep=time.sleep
+):
+    for attempt in range(retries + 1):
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            return fn(*args)
+        except Exception:
+            if attempt == retries:
+                raise
+            sleep(backoff_delay(attempt + 1, base, cap))
+
+
+def enrich(
+    items,
+    fetch,
+    write_batch,
+    concurrency=4,
+    rate=1.0,
+    burst=None,
+    batch_size=20,
+    retries=3,
+    backoff_base=1.0,
+    backoff_cap=60.0,
+    sleep=time.sleep,
+):
+    """Returns ``{"ok", "failed", "errors", "seconds"}``; ``errors`` maps an
+    item to the exception of its last attempt.
+
+    ``write_batch(results)`` returns how many results it actually saved; the
+    rest count as ``failed``.
+    """
+    limiter = TokenBucket(rate, burst or concurrency, sleep=sleep)
+    start = time.perf_counter()
+    stats = {"ok": 0, "failed": 0, "errors": {}}
+    batch = []
+
+    def flush():
+        if batch:
+            written = write_batch(list(batch))
+            stats["ok"] += written
+            stats["failed"] += len(batch) - written
+            batch.clear()
+
+    with ThreadPoolExecutor(concurrency, thread_name_prefix="enrich") as pool:
+        futures = {
+            pool.submit(
+                call_with_backoff,
+                fetch,
+                item,
+                retries=retries,
+                base=backoff_base,
+                cap=backoff_cap,
+                limiter=limiter,
+                sleep=sleep,
+            ): item
+            for item in items
+        }
+        try:
+            for future in as_completed(futures):
+                item = futures[future]
+                try:
+                    batch.append((item, future.result()))
+                except Exception as e:
+                    stats["failed"] += 1
+                    stats["errors"][item] = e
+                    continue
+                if len(batch) >= batch_size:
+                    flush()
+            flush()
+        except BaseException:
+            # e.g. the DB write failed: don't start the remaining API calls.
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+
+    stats["seconds"] = time.perf_counter() - start
+    return stats
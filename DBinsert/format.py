@@ -1,42 +1,22 @@
+import argparse
+import json
+from contextlib import nullcontext
 import pandas as pd
 import re
 import numpy as np
 import mysql.connector
+import sys
 import time
 import os
 from dotenv import load_dotenv
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from DBinsert import bulkload, dataset, incremental, location_stats  # noqa: E402
 
-# ---------- STEP 1: Load CSV ----------
+DEFAULT_INPUT = "properties.csv"
+DEFAULT_OUTPUT = "zameen_cleaned.csv"
 
-load_dotenv()
-# ---------- STEP 1: Load CSV ----------
-# (adjust path as needed)pi
-df = pd.read_csv("C:/Users/anshd/.vscode/mlops/working_code/properties.csv")
-
-# ---------- STEP 2: Normalize Column Names ----------
-df.columns = (
-    df.columns.str.strip()
-    .str.lower()
-    .str.replace(" ", "_")
-    .str.replace("\ufeff", "", regex=True)  # remove BOM if present
-)
-
-print("🧾 Columns found:", list(df.columns))
-
-# ---------- STEP 3: Auto-fix Column Names ----------
-rename_map = {}
-for c in df.columns:
-    if "price" in c and "text" in c:
-        rename_map[c] = "price"
-    if "prop" in c and "type" in c:
-        rename_map[c] = "prop_type"
-    if "covered" in c and "area" in c:
-        rename_map[c] = "covered_area"
-df.rename(columns=rename_map, inplace=True)
-
-# Ensure all required columns exist
-required_cols = [
+REQUIRED_COLS = [
     "prop_type",
     "purpose",
     "covered_area",
@@ -46,9 +26,40 @@ required_cols = [
     "baths",
     "amenities",
 ]
-missing = [c for c in required_cols if c not in df.columns]
-if missing:
-    raise ValueError(f"❌ Missing required columns in CSV: {missing}")
+
+# Numeric mentions in the amenities text, e.g. "2 beds", "3 bedrooms", "2 ba"
+BEDS_IN_TEXT = r"(\d+)\s*(?:beds?|br|bedrooms?)"
+BATHS_IN_TEXT = r"(\d+)\s*(?:baths?|ba|bathrooms?)"
+
+
+# ---------- STEP 2: Normalize Column Names ----------
+def normalize_columns(df, report=True):
+    df.columns = (
+        df.columns.str.strip()
+        .str.lower()
+        .str.replace(" ", "_")
+        .str.replace("\ufeff", "", regex=True)  # remove BOM if present
+    )
+
+    if report:
+        print("🧾 Columns found:", list(df.columns))
+
+    # ---------- STEP 3: Auto-fix Column Names ----------
+    rename_map = {}
+    for c in df.columns:
+        if "price" in c and "text" in c:
+            rename_map[c] = "price"
+        if "prop" in c and "type" in c:
+            rename_map[c] = "prop_type"
+        if "covered" in c and "area" in c:
+            rename_map[c] = "covered_area"
+    df.rename(columns=rename_map, inplace=True)
+
+    # Ensure all required columns exist
+    missing = [c for c in REQUIRED_COLS if c not in df.columns]
+    if missing:
+        raise ValueError(f"❌ Missing required columns in CSV: {missing}")
+    return df
 
 
 # ---------- STEP 4: Clean Price ----------
@@ -73,78 +84,88 @@ def clean_price(price):
 # Optionally apply cleaning if your price column needs parsing
 # df["price"] = df["price"].apply(clean_price)
 
-# ---------- STEP 5: Clean Covered Area ----------
-# Coerce to numeric safely
-df["covered_area"] = pd.to_numeric(
-    df["covered_area"].astype(str).str.extract(r"([\d\.]+)")[0], errors="coerce"
-)
-
-# ---------- STEP 6: Clean Beds & Baths ----------
-# Extract numbers and coerce
-df["beds"] = pd.to_numeric(
-    df["beds"].astype(str).str.extract(r"(\d+)")[0], errors="coerce"
-)
-df["baths"] = pd.to_numeric(
-    df["baths"].astype(str).str.extract(r"(\d+)")[0], errors="coerce"
-)
-# Replace common dash variants with NaN
-num_cols = [c for c in ("covered_area", "price", "beds", "baths") if c in df.columns]
-dash_variants = {"-", "–", "—"}
-for col in num_cols:
-    df[col] = df[col].replace(list(dash_variants), np.nan)
-
-# ---------- STEP 7: Clean Text Fields and Handle NaNs ----------
-# Ensure string columns are safe to operate on (convert NaN -> empty string)
-for col in ["prop_type", "purpose", "location", "amenities"]:
-    if col in df.columns:
+
+def clean(df):
+    """STEPS 5-8 on whole columns; returns the frame written to the cleaned CSV."""
+    # ---------- STEP 5: Clean Covered Area ----------
+    # Coerce to numeric safely
+    df["covered_area"] = pd.to_numeric(
+        df["covered_area"].astype(str).str.extract(r"([\d\.]+)")[0], errors="coerce"
+    )
+
+    # ---------- STEP 6: Clean Beds & Baths ----------
+    # Extract numbers and coerce
+    df["beds"] = pd.to_numeric(
+        df["beds"].astype(str).str.extract(r"(\d+)")[0], errors="coerce"
+    )
+    df["baths"] = pd.to_numeric(
+        df["baths"].astype(str).str.extract(r"(\d+)")[0], errors="coerce"
+    )
+    # Replace common dash variants with NaN
+    num_cols = [c for c in ("covered_area", "price", "beds", "baths") if c in df]
+    dash_variants = ["-", "–", "—"]
+    for col in num_cols:
+        df[col] = df[col].replace(dash_variants, np.nan)
+
+    # ---------- STEP 7: Clean Text Fields and Handle NaNs ----------
+    # Ensure string columns are safe to operate on (convert NaN -> empty string)
+    for col in ["prop_type", "purpose", "location", "amenities"]:
         df[col] = df[col].fillna("").astype(str).str.strip()
 
-# ---------- STEP 8: Impute Missing Values ----------
-# Inspect amenities for numeric mentions like "2 beds", "3 bath" and use that
-# If a number is mentioned, fill with that number. Otherwise leave as 0.
-for index, row in df.iterrows():
-    amenities_text = (row.get("amenities") or "").lower()
-    # Beds: look for patterns like '2 bed', '2 beds', '2 br', '2 bedroom'
-    if "beds" in df.columns:
-        beds_val = row.get("beds")
-        if pd.isna(beds_val) or beds_val == 0:
-            bed_match = re.search(r"(\d+)\s*(?:beds?|br|bedrooms?)", amenities_text)
-            if bed_match:
-                try:
-                    df.at[index, "beds"] = int(bed_match.group(1))
-                except Exception:
-                    # on parse error, leave as 0
-                    df.at[index, "beds"] = 0
-            else:
-                # leave as 0 per requirement
-                df.at[index, "beds"] = 0
-    # Baths: look for patterns like '2 bath', '2 baths', '2 ba', '2 bathroom'
-    if "baths" in df.columns:
-        baths_val = row.get("baths")
-        if pd.isna(baths_val) or baths_val == 0:
-            bath_match = re.search(r"(\d+)\s*(?:baths?|ba|bathrooms?)", amenities_text)
-            if bath_match:
-                try:
-                    df.at[index, "baths"] = int(bath_match.group(1))
-                except Exception:
-                    df.at[index, "baths"] = 0
-            else:
-                # leave as 0 per requirement
-                df.at[index, "baths"] = 0
-
-# After imputation ensure beds/baths are integers and no NaN remain
-if "beds" in df.columns:
-    df["beds"] = pd.to_numeric(df["beds"], errors="coerce").fillna(0).astype(int)
-if "baths" in df.columns:
-    df["baths"] = pd.to_numeric(df["baths"], errors="coerce").fillna(0).astype(int)
-
-# ---------- STEP 9: Save Cleaned CSV ----------
-df.to_csv("zameen_cleaned.csv", index=False)
-print("Cleaned data saved to zameen_cleaned.csv")
+    # ---------- STEP 8: Impute Missing Values ----------
+    # Missing or zero beds/baths take the first number the amenities text
+    # mentions ("2 beds", "3 bath", ...), otherwise 0.
+    amenities_text = df["amenities"].str.lower()
+    for col, pattern in (("beds", BEDS_IN_TEXT), ("baths", BATHS_IN_TEXT)):
+        values = pd.to_numeric(df[col], errors="coerce")
+        missing = values.isna() | (values == 0)
+        if missing.any():
+            mentioned = pd.to_numeric(
+                amenities_text[missing].str.extract(pattern)[0], errors="coerce"
+            )
+            values = values.mask(missing, mentioned.fillna(0))
+        df[col] = values.fillna(0).astype(int)
+    return df
+
+
+# ---------- STEP 12 (prep): Rows for INSERT ----------
+def _nullable(values):
+    """Python objects for the DB driver, with NaN -> None."""
+    return values.astype(object).where(values.notna(), None).tolist()
+
+
+def to_insert_tuples(df):
+    """``(prop_type, purpose, covered_area, price, location, beds, baths,
+    amenities)`` per row, with numbers coerced and blanks as NULL."""
+    covered_area = pd.to_numeric(df["covered_area"], errors="coerce").astype(float)
+    price = pd.to_numeric(df["price"], errors="coerce").astype(float)
+    beds = np.trunc(pd.to_numeric(df["beds"], errors="coerce")).astype("Int64")
+    baths = np.trunc(pd.to_numeric(df["baths"], errors="coerce")).astype("Int64")
+
+    def text(col):
+        values = df[col].astype(str)
+        return values.where(values != "", None)
+
+    # Amenities: prefer empty string instead of NULL / "nan"
+    amenities = df["amenities"].astype(str)
+    amenities = amenities.where(amenities != "nan", "")
+
+    return list(
+        zip(
+            _nullable(text("prop_type")),
+            _nullable(text("purpose")),
+            _nullable(covered_area),
+            _nullable(price),
+            _nullable(text("location")),
+            _nullable(beds),
+            _nullable(baths),
+            amenities.tolist(),
+        )
+    )
 
 
 # ---------- STEP 10: Connect to MySQL ----------
-def connect_mysql(retries=3, delay=2):
+def connect_mysql(retries=3, delay=2, allow_local_infile=False):
     for i in range(retries):
         try:
             connection = mysql.connector.connect(
@@ -153,6 +174,7 @@ def connect_mysql(retries=3, delay=2):
                 user=os.getenv("user"),
                 password=os.getenv("password"),
                 database="zameen",
+                allow_local_infile=allow_local_infile,
             )
             if connection.is_connected():
                 print("✅ Connected to MySQL successfully.")
@@ -163,81 +185,259 @@ def connect_mysql(retries=3, delay=2):
     raise ConnectionError("❌ Could not connect to MySQL after retries.")
 
 
-connection = connect_mysql()
-cursor = connection.cursor()
+def insert_rows(connection, df, strategy="multirow", batch_size=1000):
+    """INSERT ``df`` in one transaction; rolled back and re-raised on error.
+    ``strategy="upsert"`` writes only new or changed listings. Returns a
+    ``bulkload.LoadReport``."""
+    rows = to_insert_tuples(df)
+    if strategy == "upsert":
+        return incremental.upsert(connection, rows, batch_size)
+    return bulkload.load(connection, rows, strategy, batch_size)
 
-try:
-    # ---------- STEP 12: Insert Data ----------
-    insert_query = """
-        INSERT INTO property_data
-        (prop_type, purpose, covered_area, price, location, beds, baths, amenities)
-        VALUES (%s, %s, %s, %s, %s, %s, %s, %s);
-    """
 
-    data_tuples = []
+def insert(df, strategy="multirow", batch_size=1000, defer_indexes=False):
+    connection = connect_mysql(allow_local_infile=strategy == "load-data")
 
-    def to_float_safe(v):
+    try:
+        # ---------- STEP 12: Insert Data ----------
+        with maybe_deferred_indexes(connection, defer_indexes):
+            report = insert_rows(connection, df, strategy, batch_size)
+        print(f"✅ Successfully inserted {report.rows} rows into MySQL.")
+        print(report)
+        refresh_location_stats(connection)
+        return report
+    except mysql.connector.Error as e:
+        print(f"⚠️ MySQL error during insert: {e}")
+    except Exception as e:
+        print(f"❌ Unexpected error: {e}")
+    finally:
         try:
-            if v in (None, "", "nan"):
-                return None
-            return float(v)
+            if connection and connection.is_connected():
+                connection.close()
         except Exception:
-            return None
+            pass
+        print("🔒 MySQL connection closed.")
 
-    def to_int_safe(v):
-        try:
-            if v in (None, "", "nan"):
-                return None
-            return int(float(v))
-        except Exception:
-            return None
-
-    for _, row in df.iterrows():
-        covered_area_val = to_float_safe(row.get("covered_area"))
-        price_val = to_float_safe(row.get("price"))
-        beds_val = to_int_safe(row.get("beds"))
-        baths_val = to_int_safe(row.get("baths"))
-
-        # Amenities: prefer empty string instead of numpy.nan
-        amenities_val = (
-            row.get("amenities")
-            if row.get("amenities") not in (None, "", "nan")
-            else ""
-        )
 
-        data_tuples.append(
-            (
-                row.get("prop_type") or None,
-                row.get("purpose") or None,
-                covered_area_val,
-                price_val,
-                row.get("location") or None,
-                beds_val,
-                baths_val,
-                amenities_val,
-            )
-        )
+def maybe_deferred_indexes(connection, enabled):
+    return bulkload.deferred_indexes(connection) if enabled else nullcontext()
+
 
-    cursor.executemany(insert_query, data_tuples)
-    connection.commit()
-    print(f"✅ Successfully inserted {cursor.rowcount} rows into MySQL.")
-except mysql.connector.Error as e:
-    print(f"⚠️ MySQL error during insert: {e}")
+def refresh_location_stats(connection):
+    # The API's location profiles read this summary; a failure here must not
+    # fail the load itself.
     try:
-        connection.rollback()
-    except Exception:
-        pass
-except Exception as e:
-    print(f"❌ Unexpected error: {e}")
-finally:
+        location_stats.refresh(connection)
+    except Exception as e:
+        print(f"⚠️ Could not refresh location_stats: {e}")
+
+
+# ---------- Incremental mode ----------
+def with_connection(fn, *args):
+    connection = connect_mysql()
     try:
-        if cursor:
-            cursor.close()
-    except Exception:
-        pass
+        return fn(connection, *args)
+    finally:
+        connection.close()
+
+
+# ---------- Streaming mode ----------
+# Read -> clean -> append to the CSV -> INSERT + COMMIT, one chunk at a time,
+# so memory stays flat. After each commit the checkpoint records how many
+# chunks are done and how long the CSV was, and a rerun resumes from there.
+def dataset_path_for(output_path):
+    return f"{os.path.splitext(output_path)[0]}.parquet"
+
+
+def checkpoint_path_for(output_path):
+    return f"{output_path}.checkpoint.json"
+
+
+def read_checkpoint(path, source):
     try:
-        if connection and connection.is_connected():
+        with open(path, "r") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return state if state.get("source") == source else None
+
+
+def write_checkpoint(path, state):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def stream(
+    input_path,
+    output_path,
+    connection,
+    chunk_size,
+    restart=False,
+    strategy="multirow",
+    batch_size=1000,
+    dataset_root=None,
+):
+    """Returns a ``bulkload.LoadReport`` for the rows inserted by this run.
+    With ``dataset_root`` each chunk is also written to the Parquet dataset."""
+    stat = os.stat(input_path)
+    # A checkpoint only applies to the same input file and chunking.
+    source = {
+        "input": os.path.abspath(input_path),
+        "size": stat.st_size,
+        "mtime": stat.st_mtime,
+        "chunk_size": chunk_size,
+    }
+    checkpoint_path = checkpoint_path_for(output_path)
+    state = None if restart else read_checkpoint(checkpoint_path, source)
+    if state is None:
+        state = {"source": source, "chunks": 0, "rows": 0, "output_bytes": 0}
+    elif state.get("complete"):
+        print(f"✅ {input_path} already loaded ({state['rows']} rows), nothing to do.")
+        return bulkload.LoadReport(strategy)
+    else:
+        print(f"↩️ Resuming after chunk {state['chunks']} ({state['rows']} rows).")
+    if dataset_root and not state["chunks"]:
+        dataset.clear(dataset_root)
+
+    report = bulkload.LoadReport(strategy)
+    with open(output_path, "r+b" if state["chunks"] else "wb") as out:
+        # Drop CSV rows written after the last commit.
+        out.truncate(state["output_bytes"])
+        out.seek(state["output_bytes"])
+        reader = pd.read_csv(input_path, chunksize=chunk_size)
+        for i, chunk in enumerate(reader):
+            if i < state["chunks"]:
+                continue
+            df = clean(normalize_columns(chunk, report=i == 0))
+            out.write(df.to_csv(index=False, header=i == 0).encode("utf-8"))
+            out.flush()
+            if dataset_root:
+                dataset.write(df, dataset_root, part=i)
+            chunk_report = insert_rows(connection, df, report.strategy, batch_size)
+            # Keep a fallback strategy (LOAD DATA refused) for later chunks.
+            report.strategy = chunk_report.strategy
+            report.add(chunk_report)
+            state.update(
+                chunks=i + 1, rows=state["rows"] + len(df), output_bytes=out.tell()
+            )
+            write_checkpoint(checkpoint_path, state)
+            print(f"📦 chunk {i + 1}: {state['rows']} rows committed")
+    state["complete"] = True
+    write_checkpoint(checkpoint_path, state)
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Clean the scraped listings CSV and load it into MySQL."
+    )
+    parser.add_argument("input", nargs="?", default=DEFAULT_INPUT)
+    parser.add_argument("output", nargs="?", default=DEFAULT_OUTPUT)
+    parser.add_argument(
+        "--parquet",
+        metavar="DIR",
+        help="partitioned Parquet copy of the output, read by training "
+        "(default: the output path with a .parquet extension)",
+    )
+    parser.add_argument(
+        "--no-parquet",
+        action="store_true",
+        help="only write the cleaned CSV",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=0,
+        help="stream the input in chunks of this many rows, each committed "
+        "and checkpointed on its own (default: load the whole file at once)",
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="ignore the streaming checkpoint and start from the first chunk",
+    )
+    parser.add_argument(
+        "--strategy",
+        choices=bulkload.STRATEGIES,
+        default="multirow",
+        help="how rows are loaded into MySQL (default: multirow)",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=1000,
+        help="rows per multi-row INSERT statement (default: 1000)",
+    )
+    parser.add_argument(
+        "--defer-indexes",
+        action="store_true",
+        help="drop the secondary property_data indexes during the load and "
+        "rebuild them once at the end",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="upsert only new or changed listings (keyed on a content hash) and "
+        "skip files already loaded; overrides --strategy",
+    )
+    args = parser.parse_args(argv)
+    load_dotenv()
+    dataset_root = None
+    if not args.no_parquet:
+        dataset_root = args.parquet or dataset_path_for(args.output)
+
+    if args.incremental:
+        args.strategy = "upsert"
+        source = incremental.source_name(args.input)
+        digest = incremental.file_sha256(args.input)
+        if with_connection(incremental.already_loaded, source, digest):
+            print(f"✅ {args.input} is unchanged since the last load, nothing to do.")
+            return
+
+    if args.chunk_size > 0:
+        connection = connect_mysql(allow_local_infile=args.strategy == "load-data")
+        try:
+            with maybe_deferred_indexes(connection, args.defer_indexes):
+                report = stream(
+                    args.input,
+                    args.output,
+                    connection,
+                    args.chunk_size,
+                    args.restart,
+                    args.strategy,
+                    args.batch_size,
+                    dataset_root,
+                )
+            print(f"✅ Successfully inserted {report.rows} rows into MySQL.")
+            print(report)
+            refresh_location_stats(connection)
+            if args.incremental:
+                incremental.record_watermark(connection, source, digest, report)
+        except Exception as e:
+            print(f"❌ Stopped, rerun to resume from the last committed chunk: {e}")
+            sys.exit(1)
+        finally:
             connection.close()
-    except Exception:
-        pass
-    print("🔒 MySQL connection closed.")
+        return
+
+    # ---------- STEP 1: Load CSV ----------
+    df = normalize_columns(pd.read_csv(args.input))
+    df = clean(df)
+
+    # ---------- STEP 9: Save Cleaned CSV ----------
+    df.to_csv(args.output, index=False)
+    print(f"Cleaned data saved to {args.output}")
+    if dataset_root:
+        dataset.clear(dataset_root)
+        dataset.write(df, dataset_root)
+        print(f"Parquet dataset saved to {dataset_root}")
+
+    report = insert(df, args.strategy, args.batch_size, args.defer_indexes)
+    if args.incremental and report is not None:
+        with_connection(incremental.record_watermark, source, digest, report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Incremental, idempotent loads into ``property_data``.
+
+Each cleaned row gets two hashes:
+
+- ``listing_key``: every column except ``price``. It identifies the listing
+  and carries the ``UNIQUE`` key, so loading a row twice never duplicates it.
+- ``content_hash``: every column. It tells whether a known listing changed.
+
+``upsert()`` looks up the stored ``content_hash`` of the incoming keys and
+only writes new or changed rows (``INSERT ... ON DUPLICATE KEY UPDATE``).
+The ``ingestion_watermarks`` table records the SHA-256 of the last file
+loaded per source, so rerunning on the same scrape is a no-op.
+"""
+
+import hashlib
+import os
+import time
+
+from DBinsert.bulkload import COLUMNS, LoadReport, insert_multirow
+
+HASH_COLUMNS = ("listing_key", "content_hash")
+IDENTITY_COLUMNS = tuple(c for c in COLUMNS if c != "price")
+_IDENTITY_IDX = [COLUMNS.index(c) for c in IDENTITY_COLUMNS]
+
+UPSERT_SUFFIX = " ON DUPLICATE KEY UPDATE " + ", ".join(
+    f"{c} = VALUES({c})" for c in COLUMNS + ("content_hash",)
+)
+
+
+def _digest(values):
+    text = "\x1f".join("" if v is None else repr(v) for v in values)
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def with_hashes(rows):
+    """``rows`` (tuples in ``COLUMNS`` order) + ``(listing_key, content_hash)``,
+    de-duplicated on ``listing_key`` (the last occurrence wins)."""
+    keyed = {}
+    for row in rows:
+        key = _digest([row[i] for i in _IDENTITY_IDX])
+        keyed[key] = row + (key, _digest(row))
+    return list(keyed.values())
+
+
+def stored_hashes(cursor, keys, batch_size=1000):
+    stored = {}
+    for start in range(0, len(keys), batch_size):
+        batch = keys[start : start + batch_size]
+        cursor.execute(
+            "SELECT listing_key, content_hash FROM property_data "
+            f"WHERE listing_key IN ({', '.join(['%s'] * len(batch))})",
+            batch,
+        )
+        stored.update(cursor.fetchall())
+    return stored
+
+
+def upsert(connection, rows, batch_size=1000):
+    """Write the new or changed ``rows`` in one transaction."""
+    start = time.perf_counter()
+    hashed = with_hashes(rows)
+    cursor = connection.cursor()
+    try:
+        stored = stored_hashes(cursor, [row[-2] for row in hashed], batch_size)
+        delta = [row for row in hashed if stored.get(row[-2]) != row[-1]]
+        insert_multirow(
+            cursor, delta, batch_size, COLUMNS + HASH_COLUMNS, UPSERT_SUFFIX
+        )
+        connection.commit()
+    except BaseException:
+        try:
+            connection.rollback()
+        except Exception:
+            pass
+        raise
+    finally:
+        cursor.close()
+    return LoadReport(
+        "upsert",
+        rows=len(delta),
+        seconds=time.perf_counter() - start,
+        unchanged=len(rows) - len(delta),
+    )
+
+
+# ---------- Watermarks ----------
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def source_name(path):
+    return os.path.basename(path)
+
+
+def already_loaded(connection, source, file_digest):
+    cursor = connection.cursor()
+    try:
+        cursor.execute(
+            "SELECT file_sha256 FROM ingestion_watermarks WHERE source = %s",
+            (source,),
+        )
+        row = cursor.fetchone()
+    finally:
+        cursor.close()
+    return row is not None and row[0] == file_digest
+
+
+def record_watermark(connection, source, file_digest, report):
+    cursor = connection.cursor()
+    try:
+        cursor.execute(
+            "INSERT INTO ingestion_watermarks "
+            "(source, file_sha256, rows_written, rows_unchanged) "
+            "VALUES (%s, %s, %s, %s) ON DUPLICATE KEY UPDATE "
+            "file_sha256 = VALUES(file_sha256), "
+            "rows_written = VALUES(rows_written), "
+            "rows_unchanged = VALUES(rows_unchanged)",
+            (source, file_digest, report.rows, report.unchanged),
+        )
+        connection.commit()
+    finally:
+        cursor.close()
@@ -1,30 +1,39 @@
 # insertsentiments_corrected.py
 from dotenv import load_dotenv
+import argparse
 import os
-import time
-import mysql.connector
-from google import genai      # Google Gen AI SDK (Gemini)
 import sys
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backend.db import pool_from_env  # noqa: E402
+from DBinsert.enrichment import enrich  # noqa: E402
+from DBinsert.response_cache import ResponseCache  # noqa: E402
+
 load_dotenv()
 
-def get_connection():
-    return mysql.connector.connect(
-        host=os.getenv("HOST"),
-        port=int(os.getenv("PORT", 3306)),
-        user=os.getenv("USER"),
-        password=os.getenv("PASSWORD"),
-        database=os.getenv("DB_NAME"),
-    )
+MODEL = "gemini-2.0-flash"  # choose an available model; change if needed
+
+# Throughput knobs: parallel Gemini calls, request rate (per second, shared by
+# all threads; 0.25/s = 15 RPM), retries with jittered backoff, rows per write.
+CONCURRENCY = int(os.getenv("SENTIMENT_CONCURRENCY", 4))
+RATE = float(os.getenv("SENTIMENT_RATE", 0.25))
+MAX_RETRIES = int(os.getenv("SENTIMENT_MAX_RETRIES", 4))
+BATCH_SIZE = int(os.getenv("SENTIMENT_BATCH_SIZE", 20))
+# Locations enriched more recently than this are skipped; raw responses are
+# cached on disk and reused within the same window.
+MAX_AGE_DAYS = float(os.getenv("SENTIMENT_MAX_AGE_DAYS", 30))
+CACHE_DIR = os.getenv("SENTIMENT_CACHE_DIR", "sentiment_cache")
 
 
-client = genai.Client()  # picks API key from env by default
+def make_client():
+    from google import genai  # Google Gen AI SDK (Gemini)
+
+    return genai.Client()  # picks API key from env by default
 
-MODEL = "gemini-2.0-flash"   # choose an available model; change if needed
 
 # ---------- Helpers ----------
-def get_sentiment_from_gemini(location: str, max_retries=3) -> str:
-    prompt = f"""
+def build_prompt(location: str) -> str:
+    return f"""
 You are a concise assistant that returns only lines of the form:
 water: Good/Fair/Poor
 electricity: Good/Fair/Poor
@@ -36,34 +45,37 @@ explain: <full reasoning>
 For the location: "{location}"
 Return those lines only.
 """
-    for attempt in range(1, max_retries + 1):
-        try:
-            response = client.models.generate_content(
-                model=MODEL,
-                contents=prompt
-            )
-            # official SDK provides .text for simple text-only responses
-            text = getattr(response, "text", None)
-            if text is None:
-                # fallback: try to extract from response.output if present
-                out = getattr(response, "output", None)
-                if out and len(out) > 0:
-                    # navigate typical structure: output -> [ { 'content': [ { 'text': '...' } ] } ]
-                    try:
-                        text = out[0].get("content", [])[0].get("text")
-                    except Exception:
-                        text = str(response)
-            return text or ""
-        except Exception as e:
-            print(f"[Gemini] attempt {attempt} failed: {e}", file=sys.stderr)
-            if attempt < max_retries:
-                time.sleep(60 + attempt)  # backoff
-            else:
-                raise
+
+
+def get_sentiment_from_gemini(client, location: str) -> str:
+    # One attempt; enrich() owns retries, backoff and rate limiting.
+    response = client.models.generate_content(
+        model=MODEL, contents=build_prompt(location)
+    )
+    # official SDK provides .text for simple text-only responses
+    text = getattr(response, "text", None)
+    if text is None:
+        # fallback: try to extract from response.output if present
+        out = getattr(response, "output", None)
+        if out and len(out) > 0:
+            # navigate typical structure: output -> [ { 'content': [ { 'text': '...' } ] } ]
+            try:
+                text = out[0].get("content", [])[0].get("text")
+            except Exception:
+                text = str(response)
+    return text or ""
+
 
 def parse_gemini_text(text: str) -> dict:
     # simple line parser: key: value
-    out = {"water": None, "electricity": None, "gas": None, "traffic": None, "safety": None, "gemini_raw_response": text}
+    out = {
+        "water": None,
+        "electricity": None,
+        "gas": None,
+        "traffic": None,
+        "safety": None,
+        "gemini_raw_response": text,
+    }
     for line in text.splitlines():
         if ":" in line:
             k, v = line.split(":", 1)
@@ -74,68 +86,202 @@ def parse_gemini_text(text: str) -> dict:
                 out[k] = v
     return out
 
-# ---------- Main ----------
-def main():
-    conn = get_connection()
-    cursor = conn.cursor()
 
-    # replace 'properties' with your actual source table if different
-    cursor.execute("SELECT DISTINCT location FROM property_data WHERE location IS NOT NULL")
-    locations = cursor.fetchall()
-    print(f"Found {len(locations)} distinct locations")
+SENTIMENT_COLUMNS = (
+    "location",
+    "water_sentiment",
+    "electricity_sentiment",
+    "gas_sentiment",
+    "traffic_sentiment",
+    "safety_sentiment",
+    "gemini_raw_response",
+)
+
+UPSERT_SUFFIX = """
+ON DUPLICATE KEY UPDATE
+    water_sentiment = VALUES(water_sentiment),
+    electricity_sentiment = VALUES(electricity_sentiment),
+    gas_sentiment = VALUES(gas_sentiment),
+    traffic_sentiment = VALUES(traffic_sentiment),
+    safety_sentiment = VALUES(safety_sentiment),
+    gemini_raw_response = VALUES(gemini_raw_response),
+    updated_at = CURRENT_TIMESTAMP
+"""
+
 
-    insert_query = """
-    INSERT INTO location_sentiments (
+def sentiment_row(location, parsed):
+    return (
         location,
-        water_sentiment,
-        electricity_sentiment,
-        gas_sentiment,
-        traffic_sentiment,
-        safety_sentiment,
-        gemini_raw_response
-    ) VALUES (%s,%s,%s,%s,%s,%s,%s)
-    ON DUPLICATE KEY UPDATE
-        water_sentiment = VALUES(water_sentiment),
-        electricity_sentiment = VALUES(electricity_sentiment),
-        gas_sentiment = VALUES(gas_sentiment),
-        traffic_sentiment = VALUES(traffic_sentiment),
-        safety_sentiment = VALUES(safety_sentiment),
-        gemini_raw_response = VALUES(gemini_raw_response),
-        updated_at = CURRENT_TIMESTAMP;
-    """
-
-    for (location,) in locations:
-        print(f"Processing location: {location}")
-        try:
-            raw = get_sentiment_from_gemini(location)
-        except Exception as e:
-            print(f"Skipping {location} due to Gemini error: {e}", file=sys.stderr)
-            continue
-
-        parsed = parse_gemini_text(raw)
-
-        data = (
-            location,
-            parsed.get("water"),
-            parsed.get("electricity"),
-            parsed.get("gas"),
-            parsed.get("traffic"),
-            parsed.get("safety"),
-            parsed.get("gemini_raw_response"),
-        )
-        try:
-            cursor.execute(insert_query, data)
-            conn.commit()
-            print(f"Inserted/Updated -> {location}")
-        except Exception as e:
-            conn.rollback()
-            print(f"DB error for {location}: {e}", file=sys.stderr)
+        parsed.get("water"),
+        parsed.get("electricity"),
+        parsed.get("gas"),
+        parsed.get("traffic"),
+        parsed.get("safety"),
+        parsed.get("gemini_raw_response"),
+    )
 
-        time.sleep(0.5)  # small pause to avoid aggressive rate-limits
 
-    cursor.close()
-    conn.close()
+def write_sentiments(conn, results):
+    """Upsert ``[(location, parsed), ...]`` with one statement and one commit.
+    If the batch is rejected, rows are retried one by one so a single bad row
+    (e.g. a value the CHECK constraints refuse) only skips that location."""
+    try:
+        _upsert(conn, results)
+    except Exception as e:
+        if len(results) == 1:
+            print(f"DB error for {results[0][0]}: {e}", file=sys.stderr)
+            return 0
+        return sum(write_sentiments(conn, [result]) for result in results)
+    print(f"Inserted/Updated -> {len(results)} locations")
+    return len(results)
+
+
+def _upsert(conn, results):
+    placeholders = f"({', '.join(['%s'] * len(SENTIMENT_COLUMNS))})"
+    query = (
+        f"INSERT INTO location_sentiments ({', '.join(SENTIMENT_COLUMNS)}) VALUES "
+        + ", ".join([placeholders] * len(results))
+        + UPSERT_SUFFIX
+    )
+    params = [
+        v for location, parsed in results for v in sentiment_row(location, parsed)
+    ]
+    cursor = conn.cursor()
+    try:
+        cursor.execute(query, params)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def write_in_batches(conn, results, batch_size=BATCH_SIZE):
+    for start in range(0, len(results), batch_size):
+        write_sentiments(conn, results[start : start + batch_size])
+
+
+# ---------- Main ----------
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Enrich locations with Gemini sentiments."
+    )
+    parser.add_argument(
+        "--max-age-days",
+        type=float,
+        default=MAX_AGE_DAYS,
+        help="re-query locations whose sentiments are older than this (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--replay",
+        action="store_true",
+        help="re-parse the cached raw responses and rewrite them, without API calls",
+    )
+    args = parser.parse_args(argv)
+
+    db_pool = pool_from_env("insertsentiments", size=1)
+    cache = ResponseCache(CACHE_DIR)
+    with db_pool.connection() as conn:
+        if args.replay:
+            replay(conn, cache)
+        else:
+            run(conn, make_client(), cache=cache, max_age_days=args.max_age_days)
+    db_pool.close()
     print("Done.")
 
+
+def fetch_locations(conn, max_age_days=None):
+    """Locations with no sentiments yet or sentiments older than
+    ``max_age_days``; every location when it is None."""
+    cursor = conn.cursor()
+    # replace 'properties' with your actual source table if different
+    if max_age_days is None:
+        cursor.execute(
+            "SELECT DISTINCT location FROM property_data WHERE location IS NOT NULL"
+        )
+    else:
+        cursor.execute(
+            """
+            SELECT DISTINCT p.location
+            FROM property_data p
+            LEFT JOIN location_sentiments s ON s.location = p.location
+            WHERE p.location IS NOT NULL
+              AND (s.location IS NULL OR s.updated_at < NOW() - INTERVAL %s SECOND)
+            """,
+            (int(max_age_days * 86400),),
+        )
+    locations = [location for (location,) in cursor.fetchall()]
+    cursor.close()
+    return locations
+
+
+def run(
+    conn,
+    client,
+    cache=None,
+    max_age_days=MAX_AGE_DAYS,
+    concurrency=CONCURRENCY,
+    rate=RATE,
+    retries=MAX_RETRIES,
+    batch_size=BATCH_SIZE,
+    **options,
+):
+    locations = fetch_locations(conn, max_age_days)
+    print(
+        f"Found {len(locations)} locations missing or older than {max_age_days:g} days"
+    )
+
+    # Responses cached within the staleness window cost no API call.
+    max_age = max_age_days * 86400
+    cached, pending = [], []
+    for location in locations:
+        text = cache.get(MODEL, build_prompt(location), max_age) if cache else None
+        if text is None:
+            pending.append(location)
+        else:
+            cached.append((location, parse_gemini_text(text)))
+    if cached:
+        print(f"Reusing {len(cached)} cached responses")
+        write_in_batches(conn, cached, batch_size)
+
+    def fetch(location):
+        text = get_sentiment_from_gemini(client, location)
+        if cache is not None:
+            cache.put(MODEL, build_prompt(location), text)
+        return parse_gemini_text(text)
+
+    stats = enrich(
+        pending,
+        fetch,
+        lambda results: write_sentiments(conn, results),
+        concurrency=concurrency,
+        rate=rate,
+        retries=retries,
+        batch_size=batch_size,
+        **options,
+    )
+    for location, error in stats["errors"].items():
+        print(f"Skipping {location} due to Gemini error: {error}", file=sys.stderr)
+    print(
+        f"Enriched {stats['ok']} locations ({stats['failed']} failed, "
+        f"{len(cached)} from cache) in {stats['seconds']:.1f}s"
+    )
+    stats["cached"] = len(cached)
+    return stats
+
+
+def replay(conn, cache, batch_size=BATCH_SIZE):
+    """Re-parse every cached response (any age) for the current prompt."""
+    results = []
+    for location in fetch_locations(conn):
+        text = cache.get(MODEL, build_prompt(location))
+        if text is not None:
+            results.append((location, parse_gemini_text(text)))
+    print(f"Replaying {len(results)} cached responses")
+    write_in_batches(conn, results, batch_size)
+    return len(results)
+
+
 if __name__ == "__main__":
     main()
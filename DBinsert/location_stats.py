@@ -0,0 +1,90 @@
+"""Materialize per-location listing stats into ``location_stats``.
+
+Run after every ingestion (``format.py`` does it automatically). The API
+serves location profiles from this table joined with
+``location_sentiments``, so no request ever aggregates ``property_data``.
+
+    python DBinsert/location_stats.py
+"""
+
+import os
+import sys
+
+from dotenv import load_dotenv
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backend.db import pool_from_env  # noqa: E402
+
+STATS_COLUMNS = (
+    "location",
+    "purpose",
+    "listings",
+    "median_price",
+    "median_price_per_unit_area",
+)
+
+# Listings with a location, keyed by (location, purpose); area units are
+# whatever the scrape used.
+_LISTINGS = (
+    "SELECT location, COALESCE(purpose, '') AS purpose, price, covered_area "
+    "FROM property_data WHERE location IS NOT NULL AND location <> ''"
+)
+
+
+def _median(expression, condition):
+    """Per-(location, purpose) median of ``expression`` over the rows
+    matching ``condition``: the mean of the one or two middle ranks."""
+    return (
+        "SELECT location, purpose, AVG(v) AS median FROM ("
+        f"SELECT location, purpose, {expression} AS v, "
+        f"ROW_NUMBER() OVER (PARTITION BY location, purpose ORDER BY {expression}) "
+        "AS rn, COUNT(*) OVER (PARTITION BY location, purpose) AS n "
+        f"FROM ({_LISTINGS}) listings WHERE {condition}"
+        ") ranked WHERE 2 * rn IN (n, n + 1, n + 2) GROUP BY location, purpose"
+    )
+
+
+# Everything is aggregated by the database: no listing rows reach Python, so
+# the refresh costs the same client memory for any table size.
+REFRESH_QUERY = (
+    f"INSERT INTO location_stats ({', '.join(STATS_COLUMNS)}) "
+    "SELECT c.location, c.purpose, c.listings, p.median, a.median FROM ("
+    f"SELECT location, purpose, COUNT(*) AS listings FROM ({_LISTINGS}) listings "
+    "GROUP BY location, purpose"
+    f") c LEFT JOIN ({_median('price', 'price IS NOT NULL')}) p "
+    "ON p.location = c.location AND p.purpose = c.purpose "
+    f"LEFT JOIN ({_median('price / covered_area', 'price IS NOT NULL AND covered_area > 0')}) a "
+    "ON a.location = c.location AND a.purpose = c.purpose"
+)
+
+
+def refresh(connection):
+    """Recompute the whole table in one transaction; returns the row count."""
+    cursor = connection.cursor()
+    try:
+        cursor.execute("DELETE FROM location_stats")
+        cursor.execute(REFRESH_QUERY)
+        rows = cursor.rowcount
+        connection.commit()
+    except BaseException:
+        try:
+            connection.rollback()
+        except Exception:
+            pass
+        raise
+    finally:
+        cursor.close()
+    print(f"📈 Refreshed location_stats ({rows} location/purpose rows)")
+    return rows
+
+
+def main():
+    load_dotenv()
+    db_pool = pool_from_env("location_stats", size=1)
+    with db_pool.connection() as conn:
+        refresh(conn)
+    db_pool.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""On-disk cache of raw LLM responses, keyed by a hash of model + prompt.
+
+Lets a run that died halfway skip the calls it already paid for, and lets a
+changed response parser be replayed over past responses without any API
+calls. One JSON file per prompt, written atomically.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+
+class ResponseCache:
+    def __init__(self, directory, clock=time.time):
+        self.directory = directory
+        self._clock = clock
+
+    @staticmethod
+    def key(model, prompt):
+        return hashlib.sha256(f"{model}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, model, prompt, max_age=None):
+        """The cached response text, or None if missing or older than
+        ``max_age`` seconds."""
+        try:
+            with open(self.path(self.key(model, prompt)), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if max_age is not None and self._clock() - entry["created_at"] > max_age:
+            return None
+        return entry["response"]
+
+    def put(self, model, prompt, response):
+        path = self.path(self.key(model, prompt))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        entry = {
+            "model": model,
+            "prompt": prompt,
+            "response": response,
+            "created_at": self._clock(),
+        }
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
@@ -1,21 +1,15 @@
 import os
-import mysql.connector
+import sys
 from dotenv import load_dotenv
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backend.db import pool_from_env  # noqa: E402
+
 load_dotenv()
 
-def get_connection():
-    return mysql.connector.connect(
-        host=os.getenv("HOST"),
-        port=int(os.getenv("PORT", 3306)),
-        user=os.getenv("USER"),
-        password=os.getenv("PASSWORD"),
-        database=os.getenv("DB_NAME"),
-    )
+db_pool = pool_from_env("createsenitmenttable", size=1)
 
-conn=get_connection()
-cursor=conn.cursor()
-create_table_query="""
+create_table_query = """
 CREATE TABLE IF not EXISTS location_sentiments (
     location VARCHAR(255) PRIMARY KEY,
     water_sentiment VARCHAR(10) CHECK (water_sentiment IN ('Good', 'Fair', 'Poor')),
@@ -29,9 +23,11 @@ CREATE TABLE IF not EXISTS location_sentiments (
 );
 """
 
-print("Sentiment table created successfully.")
-select_query="""SELECT * FROM location_sentiments LIMIT ;"""
-conn._execute_query(select_query)
-conn.commit()
-cursor.close()
+with db_pool.connection() as conn:
+    cursor = conn.cursor()
+    cursor.execute(create_table_query)
+    conn.commit()
+    cursor.close()
+db_pool.close()
 
+print("Sentiment table created successfully.")
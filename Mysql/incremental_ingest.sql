@@ -0,0 +1,20 @@
+-- Columns and tables for `format.py --incremental`, for databases created
+-- before they were added to init.sql. Run once:
+--   mysql zameen < Mysql/incremental_ingest.sql
+-- Rows loaded earlier keep a NULL listing_key (NULLs never collide in a
+-- UNIQUE key), so they are not matched by later incremental loads; truncate
+-- property_data and reload once to deduplicate them.
+USE zameen;
+
+ALTER TABLE property_data
+    ADD COLUMN listing_key CHAR(40) NULL,
+    ADD COLUMN content_hash CHAR(40) NULL,
+    ADD UNIQUE KEY uq_listing_key (listing_key);
+
+CREATE TABLE IF NOT EXISTS ingestion_watermarks (
+    source VARCHAR(255) PRIMARY KEY,
+    file_sha256 CHAR(64) NOT NULL,
+    rows_written INT NOT NULL DEFAULT 0,
+    rows_unchanged INT NOT NULL DEFAULT 0,
+    loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
@@ -12,6 +12,51 @@ CREATE TABLE IF NOT EXISTS property_data (
     beds INT,
     baths INT,
     amenities TEXT,
-    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    -- incremental ingestion (DBinsert/incremental.py): listing identity and
+    -- a hash of all columns to detect changes
+    listing_key CHAR(40) NULL,
+    content_hash CHAR(40) NULL,
+    UNIQUE KEY uq_listing_key (listing_key),
+    -- /listings filters; InnoDB appends the primary key, so equality filters
+    -- can walk these in id (cursor) order
+    INDEX idx_location (location),
+    INDEX idx_purpose_prop_type (purpose, prop_type),
+    INDEX idx_price (price),
+    INDEX idx_covered_area (covered_area)
 );
 
+-- Last file loaded per source by `format.py --incremental`
+CREATE TABLE IF NOT EXISTS ingestion_watermarks (
+    source VARCHAR(255) PRIMARY KEY,
+    file_sha256 CHAR(64) NOT NULL,
+    rows_written INT NOT NULL DEFAULT 0,
+    rows_unchanged INT NOT NULL DEFAULT 0,
+    loaded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP
+);
+
+-- Per-location listing stats served by /locations/{name}/profile; rebuilt by
+-- DBinsert/location_stats.py after every ingestion
+CREATE TABLE IF NOT EXISTS location_stats (
+    location VARCHAR(255) NOT NULL,
+    purpose VARCHAR(50) NOT NULL,
+    listings INT NOT NULL,
+    median_price DOUBLE NULL,
+    median_price_per_unit_area DOUBLE NULL,
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (location, purpose)
+);
+
+-- Also created by Mysql/createsenitmenttable.py; filled by
+-- DBinsert/insertsentiments.py
+CREATE TABLE IF NOT EXISTS location_sentiments (
+    location VARCHAR(255) PRIMARY KEY,
+    water_sentiment VARCHAR(10) CHECK (water_sentiment IN ('Good', 'Fair', 'Poor')),
+    electricity_sentiment VARCHAR(10) CHECK (electricity_sentiment IN ('Good', 'Fair', 'Poor')),
+    gas_sentiment VARCHAR(10) CHECK (gas_sentiment IN ('Good', 'Fair', 'Poor')),
+    traffic_sentiment VARCHAR(10) CHECK (traffic_sentiment IN ('Good', 'Fair', 'Poor')),
+    safety_sentiment VARCHAR(10) CHECK (safety_sentiment IN ('Good', 'Fair', 'Poor')),
+    gemini_raw_response TEXT NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
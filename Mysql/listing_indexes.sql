@@ -0,0 +1,9 @@
+-- Indexes behind the /listings filters, for databases created before they
+-- were added to init.sql. Run once: mysql zameen < Mysql/listing_indexes.sql
+USE zameen;
+
+ALTER TABLE property_data
+    ADD INDEX idx_location (location),
+    ADD INDEX idx_purpose_prop_type (purpose, prop_type),
+    ADD INDEX idx_price (price),
+    ADD INDEX idx_covered_area (covered_area);
@@ -0,0 +1,13 @@
+-- location_stats for databases created before it was added to init.sql.
+-- Run once, then fill it with: python DBinsert/location_stats.py
+USE zameen;
+
+CREATE TABLE IF NOT EXISTS location_stats (
+    location VARCHAR(255) NOT NULL,
+    purpose VARCHAR(50) NOT NULL,
+    listings INT NOT NULL,
+    median_price DOUBLE NULL,
+    median_price_per_unit_area DOUBLE NULL,
+    refreshed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    PRIMARY KEY (location, purpose)
+);
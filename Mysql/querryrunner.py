@@ -1,27 +1,23 @@
 import os
-import mysql.connector
+import sys
 from dotenv import load_dotenv
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from backend.db import pool_from_env  # noqa: E402
+
 load_dotenv()
 
-def get_connection():
-    return mysql.connector.connect(
-        host=os.getenv("HOST"),
-        port=int(os.getenv("PORT", 3306)),
-        user=os.getenv("USER"),
-        password=os.getenv("PASSWORD"),
-        database=os.getenv("DB_NAME"),
-    )
+db_pool = pool_from_env("querryrunner", size=1)
 
-conn = get_connection()
-cursor = conn.cursor()
+with db_pool.connection() as conn:
+    cursor = conn.cursor()
 
-select_query = "SELECT * FROM location_sentiments"
-cursor.execute(select_query)
+    select_query = "SELECT * FROM location_sentiments"
+    cursor.execute(select_query)
 
-rows = cursor.fetchall()
-for row in rows:
-    print(row)
+    rows = cursor.fetchall()
+    for row in rows:
+        print(row)
 
-cursor.close()
-conn.close()
+    cursor.close()
+db_pool.close()
@@ -1,20 +1,60 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import Body, Depends, FastAPI, Header, HTTPException, Query, Request
+from fastapi import Response
 from fastapi.middleware.cors import CORSMiddleware
-import mysql.connector
-import pandas as pd
-import mlflow
-import mlflow.pyfunc
+from fastapi.responses import (
+    FileResponse,
+    JSONResponse,
+    PlainTextResponse,
+    StreamingResponse,
+)
+import hashlib
+import hmac
 import json
+import math
 import os
-import boto3
+import tempfile
+import threading
+import time
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, ValidationError
+from typing import Any, List, Optional
+
+from backend import artifact, listings, metrics
+from backend.batcher import MicroBatcher
+from backend.db import pool_from_env
+from backend.executors import Overloaded, executor_from_env
+from backend.instrumentation import RequestTimer, timed
+from backend.loader import BackgroundLoader, ModelBundle, PeriodicTask
+from backend.model_store import S3ModelCache
+from backend.profiling import ProfilingMiddleware, RequestProfiler
+from backend.profiles import LocationProfiles
+from backend.result_cache import ResultCache
+from backend.snapshot_cache import SnapshotCache
 
 # ---- Load environment variables ----
 load_dotenv()
 
+
 # ---- Setup ----
-app = FastAPI(title="Zameen MLOps API")
+@asynccontextmanager
+async def lifespan(app):
+    # Background workers; routes still work lazily without them (e.g. tests).
+    model_loader.start()
+    model_watcher.start()
+    vocabulary.start()
+    location_profiles.start()
+    yield
+    model_loader.stop()
+    model_watcher.stop()
+    vocabulary.stop()
+    location_profiles.stop()
+    db_executor.shutdown(wait=False)
+    inference_executor.shutdown(wait=False)
+    db_pool.close()
+
+
+app = FastAPI(title="Zameen MLOps API", lifespan=lifespan)
 
 # Allow CORS
 app.add_middleware(
@@ -23,7 +63,10 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
+# Per-route latency histograms on /metrics.
+app.add_middleware(RequestTimer)
 
 # ---- AWS + MLflow Config ----
 AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
@@ -32,149 +75,519 @@ AWS_DEFAULT_REGION = os.getenv("AWS_DEFAULT_REGION", "eu-north-1")
 S3_BUCKET = os.getenv("S3_BUCKET", "zameen-project")
 S3_MODELS_PREFIX = os.getenv("S3_MODELS_PREFIX", "zameen_models")
 
-# Initialize S3 client (will use env creds)
-s3 = boto3.client(
-    "s3",
-    aws_access_key_id=AWS_ACCESS_KEY_ID,
-    aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-    region_name=AWS_DEFAULT_REGION,
-)
 
-# MLflow setup
-mlflow.set_tracking_uri("http://127.0.0.1:5000")
-model_name = "ZameenPriceModelV2"
-stage = "Production"
+def make_s3_client():
+    # boto3 is imported on first use, not at startup.
+    import boto3
+
+    # Initialize S3 client (will use env creds)
+    return boto3.client(
+        "s3",
+        aws_access_key_id=AWS_ACCESS_KEY_ID,
+        aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
+        region_name=AWS_DEFAULT_REGION,
+    )
+
+
+model_store = S3ModelCache(
+    None,
+    S3_BUCKET,
+    cache_dir="model_cache",
+    max_workers=int(os.getenv("S3_DOWNLOAD_WORKERS", 8)),
+    client_factory=make_s3_client,
+)
 
 
 # ---- DB Connection ----
-def get_connection():
-    return mysql.connector.connect(
-        host=os.getenv("HOST"),
-        port=int(os.getenv("PORT", 3306)),
-        user=os.getenv("USER"),
-        password=os.getenv("PASSWORD"),
-        database=os.getenv("DB_NAME"),
+db_pool = pool_from_env("backend")
+
+# ---- Executors ----
+# Blocking mysql.connector calls and sklearn inference run on these pools so
+# the event loop (and /health) stays responsive. DB workers match the pool
+# size so threads never queue twice; inference rejects work past the queue
+# depth with a 503 instead of piling up latency.
+db_executor = executor_from_env("db", workers=db_pool.size, max_pending=64)
+inference_executor = executor_from_env(
+    "inference", workers=min(4, os.cpu_count() or 1), max_pending=64
+)
+
+
+@app.exception_handler(Overloaded)
+async def overloaded_handler(request, exc):
+    return JSONResponse(
+        status_code=503,
+        content={"detail": f"Server busy: {exc}"},
+        headers={"Retry-After": "1"},
     )
 
 
 # ---- Load model ----
-def load_model(model_name="ZameenPriceModelSale"):
-    model = None
-    sale_feature_columns = None
-    valid_metadata = None
+MODEL_NAME = "ZameenPriceModelSale"
+MODEL_LOAD_RETRY_SECONDS = float(os.getenv("MODEL_LOAD_RETRY_SECONDS", 30))
+MODEL_WATCH_INTERVAL = float(os.getenv("MODEL_WATCH_INTERVAL", 60))
+# Evaluate linear models directly instead of through model.predict.
+LINEAR_KERNEL = os.getenv("LINEAR_KERNEL", "1") != "0"
+# Prefer the model folder's serving.npz over the MLflow model when present.
+SLIM_ARTIFACT = os.getenv("SLIM_ARTIFACT", "1") != "0"
+
+MODEL_RELOADS = metrics.counter(
+    "model_reloads_total", "Hot model reload attempts", ["result"]
+)
+MODEL_LOAD_SECONDS = metrics.histogram(
+    "model_load_step_seconds",
+    "Duration of each step of a successful model load",
+    ["step"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0),
+)
+MODEL_INFO = metrics.gauge(
+    "model_info", "1 for the model version being served, 0 for older ones", ["version"]
+)
+MODEL_LOADED_AT = metrics.gauge(
+    "model_loaded_timestamp_seconds", "Unix time the served model was loaded"
+)
 
-    try:
-        os.makedirs("model_cache", exist_ok=True)
-
-        # Download entire model folder
-        paginator = s3.get_paginator("list_objects_v2")
-        for page in paginator.paginate(
-            Bucket=S3_BUCKET, Prefix=f"{S3_MODELS_PREFIX}/{model_name}"
-        ):
-            for obj in page.get("Contents", []):
-                key = obj["Key"]
-                rel_path = os.path.relpath(key, f"{S3_MODELS_PREFIX}/{model_name}")
-                local_path = os.path.join("model_cache", model_name, rel_path)
-                os.makedirs(os.path.dirname(local_path), exist_ok=True)
-                s3.download_file(S3_BUCKET, key, local_path)
-
-        # Download metadata
-        s3.download_file(
-            S3_BUCKET,
-            f"{S3_MODELS_PREFIX}/feature_columns.json",
-            "model_cache/feature_columns.json",
-        )
-        s3.download_file(
-            S3_BUCKET,
-            f"{S3_MODELS_PREFIX}/valid_metadata.json",
-            "model_cache/valid_metadata.json",
-        )
+# Serializes S3 sync + load so the watcher, the admin endpoint and the
+# startup loader never write model_cache/ at the same time.
+model_reload_lock = threading.Lock()
+
+
+def list_model_objects(model_name=MODEL_NAME):
+    """Remote artifacts of ``model_name`` (LIST + HEADs only, no downloads)."""
+    remote = model_store.list_prefix(f"{S3_MODELS_PREFIX}/{model_name}", model_name)
+    remote += [
+        model_store.head(f"{S3_MODELS_PREFIX}/{name}", name)
+        for name in ("feature_columns.json", "valid_metadata.json")
+    ]
+    return remote
+
+
+def model_version(objects):
+    """Short fingerprint of the remote artifact set; changes with any upload."""
+    digest = hashlib.sha256()
+    for obj in sorted(objects, key=lambda o: o.local_path):
+        digest.update(f"{obj.local_path}:{obj.etag}:{obj.size}\n".encode())
+    return digest.hexdigest()[:12]
+
+
+def read_model_artifacts(model_name=MODEL_NAME, timings=None):
+    timings = {} if timings is None else timings
+    start = time.perf_counter()
+    # Linear models: a few numpy arrays, no mlflow/sklearn import. The npz
+    # is only used when it belongs to the MLflow model synced next to it.
+    model = (
+        artifact.load_if_current(f"model_cache/{model_name}") if SLIM_ARTIFACT else None
+    )
+    if model is not None:
+        sale_feature_columns = model.columns
+    else:
+        import mlflow.sklearn
 
-        # Load with MLflow
         model = mlflow.sklearn.load_model(f"model_cache/{model_name}")
 
-        with open("model_cache/feature_columns.json", "r") as f:
-            feat = json.load(f)
-        with open("model_cache/valid_metadata.json", "r") as f:
-            valid_metadata = json.load(f)
+        # Newer models carry the encoder they were trained with in their folder.
+        features_path = f"model_cache/{model_name}/feature_columns.json"
+        if not os.path.exists(features_path):
+            features_path = "model_cache/feature_columns.json"
+        with open(features_path, "r") as f:
+            sale_feature_columns = json.load(f).get("sale", [])
+    with open("model_cache/valid_metadata.json", "r") as f:
+        valid_metadata = json.load(f)
+    timings["model_load_seconds"] = time.perf_counter() - start
+
+    return model, sale_feature_columns, valid_metadata
+
+
+def load_model_artifacts(model_name=MODEL_NAME, timings=None, objects=None):
+    """Sync the model folder + metadata from S3 into model_cache/ and load
+    them; raises on failure. Per-step durations are recorded into ``timings``."""
+    timings = {} if timings is None else timings
+    with model_reload_lock:
+        # Only download objects whose ETag/size changed since the last sync
+        if objects is None:
+            start = time.perf_counter()
+            objects = list_model_objects(model_name)
+            timings["s3_list_seconds"] = time.perf_counter() - start
+        sync = model_store.sync(objects, prune_dirs=(model_name,))
+        timings["s3_download_seconds"] = sync["download_seconds"]
+        timings["s3_objects_downloaded"] = sync["downloaded"]
+        timings["s3_objects_skipped"] = sync["skipped"]
+
+        model, sale_feature_columns, valid_metadata = read_model_artifacts(
+            model_name, timings
+        )
+    print("✅ Model and artifacts loaded from S3 successfully!")
+    return model, sale_feature_columns, valid_metadata
 
-        sale_feature_columns = feat.get("sale", [])
-        print("✅ Model and artifacts loaded from S3 successfully!")
 
+def load_model(model_name=MODEL_NAME):
+    try:
+        return load_model_artifacts(model_name)
     except Exception as e:
         print(f"❌ Model load failed: {e}")
+        return None, None, None
+
+
+def warm_up(candidate, samples=8):
+    """Run a few synthetic predictions through a freshly loaded bundle so the
+    first real request doesn't pay for lazy initialisation, and so a broken
+    model is rejected before it is swapped in."""
+    encoder = candidate.encoder
+    locations = list(encoder.location_idx) or [""]
+    prop_types = list(encoder.prop_type_idx) or [""]
+    synthetic = [
+        (
+            500.0 * (i + 1),
+            i % 5 + 1,
+            i % 4 + 1,
+            locations[i % len(locations)],
+            prop_types[i % len(prop_types)],
+        )
+        for i in range(samples)
+    ]
+    predictions = candidate.predict_batch(synthetic)
+    if len(predictions) != samples or not all(map(math.isfinite, predictions)):
+        raise ValueError("Warm-up predictions were not finite")
+
+
+# The serving model is published as one immutable ModelBundle. Startup does
+# not wait for it: model_loader fetches it on a background thread (retrying on
+# failure) while /health already answers; /ready reports when it is usable.
+# Requests read ``bundle`` once, so a hot reload swapping it never affects a
+# request that is already running.
+bundle = None
+
+
+def load_bundle(timings=None, objects=None):
+    timings = {} if timings is None else timings
+    if objects is None:
+        start = time.perf_counter()
+        objects = list_model_objects()
+        timings["s3_list_seconds"] = time.perf_counter() - start
+    model, sale_feature_columns, valid_metadata = load_model_artifacts(
+        timings=timings, objects=objects
+    )
+    if not sale_feature_columns:
+        raise ValueError("feature_columns.json has no 'sale' columns")
+    candidate = ModelBundle.build(
+        model,
+        sale_feature_columns,
+        valid_metadata,
+        version=model_version(objects),
+        kernel=LINEAR_KERNEL,
+    )
+    start = time.perf_counter()
+    warm_up(candidate)
+    timings["warm_up_seconds"] = time.perf_counter() - start
+    for name, seconds in timings.items():
+        if name.endswith("_seconds"):
+            MODEL_LOAD_SECONDS.observe(seconds, step=name[: -len("_seconds")])
+    return candidate
+
+
+def publish_model(candidate):
+    global bundle
+    previous, bundle = bundle, candidate
+    if previous is not None:
+        MODEL_INFO.set(0, version=previous.version)
+    MODEL_INFO.set(1, version=candidate.version)
+    MODEL_LOADED_AT.set(candidate.loaded_at)
+    # Keys carry the model version, so this only frees the old entries early.
+    prediction_cache.clear()
+    print(f"✅ Serving model version {candidate.version}")
+
+
+def reload_model(force=False):
+    """Load the S3 model if its version differs from the one being served,
+    warm it up and swap it in. Returns ``(bundle, reloaded, timings)``."""
+    current = bundle
+    objects = list_model_objects()
+    if not force and current is not None and current.version == model_version(objects):
+        return current, False, {}
+    timings = {}
+    try:
+        candidate = load_bundle(timings, objects)
+    except Exception:
+        MODEL_RELOADS.inc(result="failed")
+        raise
+    publish_model(candidate)
+    MODEL_RELOADS.inc(result="swapped")
+    return candidate, True, timings
 
-    return model, sale_feature_columns, valid_metadata
 
+def watch_model():
+    # Until the startup load succeeded, model_loader owns (re)trying.
+    if bundle is not None:
+        reload_model()
 
-model, sale_feature_columns, valid_metadata = load_model()
+
+model_loader = BackgroundLoader(
+    "model", load_bundle, publish_model, retry_after=MODEL_LOAD_RETRY_SECONDS
+)
+model_watcher = PeriodicTask("model-watcher", MODEL_WATCH_INTERVAL, watch_model)
 
 # ---- Load location/property types ----
-locations = []
-propertyTypes = []
+VOCAB_TTL_SECONDS = float(os.getenv("VOCAB_TTL_SECONDS", 300))
 
 
-def load_location_and_property_types():
-    global locations, propertyTypes
-    try:
-        conn = get_connection()
+def fetch_location_and_property_types():
+    with db_pool.connection(query="vocabulary") as conn:
         cursor = conn.cursor(dictionary=True)
         cursor.execute("SELECT DISTINCT prop_type, location FROM property_data")
         rows = cursor.fetchall()
         cursor.close()
-        conn.close()
+        return rows
 
-        locations = sorted({r["location"] for r in rows if r.get("location")})
-        propertyTypes = sorted({r["prop_type"] for r in rows if r.get("prop_type")})
 
-        return {"locations": locations, "prop_type": propertyTypes}
-    except Exception as e:
-        print(f" Failed to load locations/property types from DB: {e}")
-        return {"locations": [], "prop_type": []}
+vocabulary = SnapshotCache(fetch_location_and_property_types, ttl=VOCAB_TTL_SECONDS)
+
+
+async def get_vocabulary():
+    # Only the very first load (or one after invalidation) touches the DB.
+    snapshot = vocabulary.get_cached()
+    if snapshot is None:
+        snapshot = await db_executor.run(vocabulary.get)
+    return snapshot
+
+
+# ---- Location profiles ----
+PROFILE_TTL_SECONDS = float(os.getenv("PROFILE_TTL_SECONDS", 300))
+
+
+def fetch_location_profiles():
+    # Both tables are small and precomputed; nothing here aggregates listings.
+    with db_pool.connection(query="location_profiles") as conn:
+        cursor = conn.cursor(dictionary=True)
+        cursor.execute(
+            "SELECT location, purpose, listings, median_price, "
+            "median_price_per_unit_area FROM location_stats"
+        )
+        stats = cursor.fetchall()
+        cursor.execute(
+            "SELECT location, water_sentiment, electricity_sentiment, gas_sentiment, "
+            "traffic_sentiment, safety_sentiment, updated_at FROM location_sentiments"
+        )
+        sentiments = cursor.fetchall()
+        cursor.close()
+        return {"stats": stats, "sentiments": sentiments}
+
+
+location_profiles = SnapshotCache(
+    fetch_location_profiles,
+    ttl=PROFILE_TTL_SECONDS,
+    snapshot_type=LocationProfiles,
+    name="location-profiles",
+)
+
+
+async def get_location_profiles():
+    snapshot = location_profiles.get_cached()
+    if snapshot is None:
+        snapshot = await db_executor.run(location_profiles.get)
+    return snapshot
+
+
+# ---- Admin auth ----
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+# Without a token admin routes are refused; local development can opt out.
+ADMIN_ALLOW_ANONYMOUS = os.getenv("ADMIN_ALLOW_ANONYMOUS", "0") == "1"
+
+
+def admin_authorized(x_admin_token):
+    if not ADMIN_TOKEN:
+        return ADMIN_ALLOW_ANONYMOUS
+    return x_admin_token is not None and hmac.compare_digest(
+        x_admin_token.encode(), ADMIN_TOKEN.encode()
+    )
+
+
+def require_admin(x_admin_token: str = Header(default=None)):
+    if not ADMIN_TOKEN and not ADMIN_ALLOW_ANONYMOUS:
+        raise HTTPException(
+            status_code=403,
+            detail="Admin endpoints are disabled: ADMIN_TOKEN is not set",
+        )
+    if not admin_authorized(x_admin_token):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+# ---- Request profiling ----
+# Off unless PROFILE_REQUESTS=1 or switched on via /admin/profiling (shared with
+# the other workers through PROFILE_DIR/settings.json); then
+# /predict and /listings requests sent with X-Profile: 1 and a valid admin
+# token (same rule as the admin routes), or picked by the sample rate, are saved as pstats files.
+request_profiler = RequestProfiler(
+    directory=os.getenv("PROFILE_DIR", "profiles"),
+    enabled=os.getenv("PROFILE_REQUESTS", "0") == "1",
+    sample_rate=float(os.getenv("PROFILE_SAMPLE_RATE", 0)),
+    max_files=int(os.getenv("PROFILE_MAX_FILES", 50)),
+    authorize=admin_authorized,
+)
+app.add_middleware(ProfilingMiddleware, profiler=request_profiler)
 
 
-load_location_and_property_types()
+@app.get("/admin/profiling", dependencies=[Depends(require_admin)])
+async def get_profiling():
+    return request_profiler.status()
+
+
+@app.post("/admin/profiling", dependencies=[Depends(require_admin)])
+async def configure_profiling(
+    enabled: Optional[bool] = None,
+    sample_rate: Optional[float] = Query(None, ge=0, le=1),
+):
+    return request_profiler.configure(enabled=enabled, sample_rate=sample_rate)
+
+
+@app.get("/admin/profiles", dependencies=[Depends(require_admin)])
+async def list_profiles():
+    return request_profiler.list()
+
+
+@app.get("/admin/profiles/{name}", dependencies=[Depends(require_admin)])
+async def get_profile_file(name: str):
+    path = request_profiler.path(name)
+    if path is None:
+        raise HTTPException(status_code=404, detail=f"Unknown profile: {name}")
+    return FileResponse(path, media_type="application/octet-stream", filename=name)
 
 
 # ---- Routes ----
 @app.get("/")
-def home():
+async def home():
     return {"message": "Zameen API is running"}
 
 
+# ---- Listings ----
+LISTINGS_MAX_LIMIT = int(os.getenv("LISTINGS_MAX_LIMIT", 500))
+LISTINGS_EXPORT_CHUNK = int(os.getenv("LISTINGS_EXPORT_CHUNK", 1000))
+
+
+def listing_filters(
+    location: Optional[str] = None,
+    prop_type: Optional[str] = None,
+    purpose: Optional[str] = None,
+    min_price: Optional[int] = Query(None, ge=0),
+    max_price: Optional[int] = Query(None, ge=0),
+    min_area: Optional[float] = Query(None, ge=0),
+    max_area: Optional[float] = Query(None, ge=0),
+):
+    return {
+        "location": location,
+        "prop_type": prop_type,
+        "purpose": purpose,
+        "min_price": min_price,
+        "max_price": max_price,
+        "min_area": min_area,
+        "max_area": max_area,
+    }
+
+
+def listing_columns(fields: Optional[str] = None):
+    try:
+        return listings.parse_fields(fields)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+def fetch_listings(columns, filters, after, limit):
+    with db_pool.connection(query="listings") as conn:
+        return listings.fetch_page(conn, columns, filters, after, limit)
+
+
 @app.get("/listings")
-def get_listings(limit: int = 20):
-    conn = get_connection()
-    cursor = conn.cursor(dictionary=True)
-    cursor.execute(
-        """
-        SELECT prop_type, purpose, covered_area, price, location, beds, baths
-        FROM property_data
-        LIMIT %s
-        """,
-        (limit,),
-    )
-    data = cursor.fetchall()
-    cursor.close()
-    conn.close()
-    return data
+async def get_listings(
+    response: Response,
+    limit: int = Query(20, ge=1, le=LISTINGS_MAX_LIMIT),
+    cursor: Optional[int] = Query(None, ge=0),
+    columns: tuple = Depends(listing_columns),
+    filters: dict = Depends(listing_filters),
+):
+    # One extra row tells us whether there is a next page.
+    rows = await db_executor.run(fetch_listings, columns, filters, cursor, limit + 1)
+    if len(rows) > limit:
+        rows = rows[:limit]
+        response.headers["X-Next-Cursor"] = str(rows[-1]["id"])
+    return rows
+
+
+@app.get("/listings/export")
+async def export_listings(
+    columns: tuple = Depends(listing_columns),
+    filters: dict = Depends(listing_filters),
+):
+    """All matching listings as NDJSON, read page by page so neither the API
+    nor the DB driver holds the full result (or a connection) at once."""
+
+    def ndjson_rows():
+        after = None
+        while True:
+            page = fetch_listings(columns, filters, after, LISTINGS_EXPORT_CHUNK)
+            for row in page:
+                yield json.dumps(row, default=str) + "\n"
+            if len(page) < LISTINGS_EXPORT_CHUNK:
+                return
+            after = page[-1]["id"]
+
+    return StreamingResponse(ndjson_rows(), media_type="application/x-ndjson")
 
 
 @app.get("/locations")
-def get_locations(purpose: str = "sale"):
-    data = load_location_and_property_types()
-    return {"locations": data["locations"]}
+async def get_locations(purpose: str = "sale"):
+    return {"locations": list((await get_vocabulary()).locations)}
+
+
+@app.get("/locations/profiles")
+async def get_profiles():
+    return list((await get_location_profiles()).profiles.values())
+
+
+@app.get("/locations/{name}/profile")
+async def get_profile(name: str):
+    profile = (await get_location_profiles()).get(name)
+    if profile is None:
+        raise HTTPException(status_code=404, detail=f"Unknown location: {name}")
+    return profile
 
 
 @app.get("/prop_type")
-def get_prop_type(purpose: str = "sale"):
-    data = load_location_and_property_types()
-    return {"prop_type": data["prop_type"]}
+async def get_prop_type(purpose: str = "sale"):
+    return {"prop_type": list((await get_vocabulary()).prop_types)}
+
+
+@app.post("/admin/vocabulary/invalidate", dependencies=[Depends(require_admin)])
+async def invalidate_vocabulary():
+    # refresh() swaps in the new snapshot only once it loaded; on a DB error
+    # the current one keeps serving.
+    snapshot = await db_executor.run(vocabulary.refresh)
+    if vocabulary.last_error:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Refresh failed, still serving the previous snapshot: "
+            f"{vocabulary.last_error}",
+        )
+    return {
+        "locations": len(snapshot.locations),
+        "prop_type": len(snapshot.prop_types),
+        "loaded_at": snapshot.loaded_at,
+    }
+
+
+@app.post("/admin/locations/profiles/refresh", dependencies=[Depends(require_admin)])
+async def refresh_location_profiles():
+    snapshot = await db_executor.run(location_profiles.refresh)
+    if location_profiles.last_error:
+        raise HTTPException(
+            status_code=503,
+            detail=f"Refresh failed, still serving the previous snapshot: "
+            f"{location_profiles.last_error}",
+        )
+    return {**snapshot.counts(), "loaded_at": snapshot.loaded_at}
 
 
 # ---- Prediction Schema ----
 class PredictionInput(BaseModel):
-    coveredArea: float
+    # The linear kernel skips sklearn's input checks, so NaN/inf stop here.
+    coveredArea: float = Field(allow_inf_nan=False)
     beds: int
     bathrooms: int
     location: str
@@ -182,56 +595,310 @@ class PredictionInput(BaseModel):
     purpose: str = "sale"
 
 
-@app.post("/predict")
-async def predict_price(input_data: PredictionInput):
-    if model is None:
+def require_model():
+    current = bundle
+    if current is None:
+        if model_loader.state == "failed":
+            raise HTTPException(
+                status_code=500,
+                detail="Model not loaded. Check MLflow server and registry.",
+            )
         raise HTTPException(
-            status_code=500,
-            detail="Model not loaded. Check MLflow server and registry.",
+            status_code=503,
+            detail="Model is still loading, retry shortly.",
+            headers={"Retry-After": "5"},
         )
+    return current
+
+
+# ---- Prediction cache ----
+prediction_cache = ResultCache(
+    max_entries=int(os.getenv("PREDICTION_CACHE_SIZE", 10000)),
+    ttl=float(os.getenv("PREDICTION_CACHE_TTL", 3600)),
+)
 
-    valid_data = load_location_and_property_types()
 
-    if input_data.location not in valid_data["locations"]:
+# ---- Request coalescing ----
+# Opt-in: concurrent /predict calls that miss the cache and need
+# model.predict are gathered for up to PREDICT_BATCH_WAIT_MS (or
+# PREDICT_BATCH_MAX_SIZE samples) and scored with one predict_batch call.
+PREDICT_BATCHING = os.getenv("PREDICT_BATCHING", "0") == "1"
+predict_batcher = MicroBatcher(
+    "predict",
+    inference_executor.run,
+    max_batch_size=int(os.getenv("PREDICT_BATCH_MAX_SIZE", 32)),
+    max_wait=float(os.getenv("PREDICT_BATCH_WAIT_MS", 2)) / 1000,
+)
+
+
+def prediction_cache_key(version, input_data):
+    # purpose is not a model feature, so it is left out of the key.
+    return (
+        version,
+        float(input_data.coveredArea),
+        int(input_data.beds),
+        int(input_data.bathrooms),
+        input_data.location,
+        input_data.propType,
+    )
+
+
+@app.post("/predict")
+async def predict_price(input_data: PredictionInput):
+    current = require_model()
+
+    with timed("vocabulary"):
+        valid_data = await get_vocabulary()
+
+    if input_data.location not in valid_data.location_set:
         raise HTTPException(
             status_code=400,
-            detail=f"Invalid location. Must be one of: {', '.join(valid_data['locations'])}",
+            detail=f"Invalid location. Must be one of: {', '.join(valid_data.locations)}",
         )
 
-    if input_data.propType not in valid_data["prop_type"]:
+    if input_data.propType not in valid_data.prop_type_set:
         raise HTTPException(
             status_code=400,
-            detail=f"Invalid property type. Must be one of: {', '.join(valid_data['prop_type'])}",
+            detail=f"Invalid property type. Must be one of: {', '.join(valid_data.prop_types)}",
         )
 
+    with timed("cache_lookup"):
+        key = prediction_cache_key(current.version, input_data)
+        cached = prediction_cache.get(key)
+    if cached is not None:
+        return {**cached, "model_version": current.version}
+
+    start = time.perf_counter()
+    sample = (
+        input_data.coveredArea,
+        input_data.beds,
+        input_data.bathrooms,
+        input_data.location,
+        input_data.propType,
+    )
     try:
-        base_df = pd.DataFrame(
-            [[input_data.coveredArea, input_data.beds, input_data.bathrooms]],
-            columns=["covered_area", "beds", "baths"],
-        )
+        with timed("inference"):
+            if current.kernel is not None:
+                # A handful of float ops: cheaper inline than a thread hand-off.
+                prediction = current.kernel.predict_one(*sample)
+            elif PREDICT_BATCHING:
+                prediction = await predict_batcher.predict(current, sample)
+            else:
+                prediction = await inference_executor.run(current.predict_one, *sample)
+        result = format_prediction(float(prediction))
+        prediction_cache.put(key, result, time.perf_counter() - start)
+        return {**result, "model_version": current.version}
+    except Overloaded:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
 
-        loc_df = pd.get_dummies(pd.Series([input_data.location]), prefix="location")
-        prop_df = pd.get_dummies(pd.Series([input_data.propType]), prefix="prop_type")
-        input_df = pd.concat([base_df, loc_df, prop_df], axis=1)
 
-        # Align columns
-        if sale_feature_columns:
-            for col in sale_feature_columns:
-                if col not in input_df.columns:
-                    input_df[col] = 0
-            input_df = input_df[sale_feature_columns]
-        else:
-            input_df = input_df.fillna(0)
+def format_prediction(predicted_price):
+    # NaN/inf aren't valid JSON; raise before anything is cached or rendered.
+    if not math.isfinite(predicted_price):
+        raise ValueError(f"model returned a non-finite value ({predicted_price})")
+    return {
+        "prediction": predicted_price,
+        "formatted_price": f"PKR {predicted_price:,.2f}",
+    }
+
 
-        predicted_price = float(model.predict(input_df)[0])
-        return {
-            "prediction": predicted_price,
-            "formatted_price": f"PKR {predicted_price:,.2f}",
-        }
+# ---- Batch prediction ----
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", 10000))
+STREAM_CHUNK_SIZE = int(os.getenv("STREAM_CHUNK_SIZE", 1000))
+STREAM_SPOOL_BYTES = int(os.getenv("STREAM_SPOOL_BYTES", 8 * 1024 * 1024))
+
+
+def validate_batch_item(raw, valid_data, ndjson=False):
+    """Return ``(PredictionInput, None)`` or ``(None, error message)``.
+
+    ``raw`` is a decoded JSON value from /predict/batch, where anything but an
+    object (strings included) is an error for that item, or with ``ndjson``
+    one raw line of /predict/stream.
+    """
+    try:
+        if ndjson:
+            item = PredictionInput.model_validate_json(raw)
+        else:
+            item = PredictionInput.model_validate(raw)
+    except ValidationError as e:
+        errors = "; ".join(
+            f"{'.'.join(str(p) for p in err['loc']) or 'item'}: {err['msg']}"
+            for err in e.errors()
+        )
+        return None, f"Invalid input: {errors}"
+    if item.location not in valid_data.location_set:
+        return None, f"Invalid location: {item.location}"
+    if item.propType not in valid_data.prop_type_set:
+        return None, f"Invalid property type: {item.propType}"
+    return item, None
+
+
+def score_batch(current, raw_items, start_index=0, ndjson=False):
+    """Validate each item, then score all valid ones with one model.predict."""
+    valid_data = vocabulary.get()
+    results = [None] * len(raw_items)
+    samples = []
+    positions = []
+    for i, raw in enumerate(raw_items):
+        item, error = validate_batch_item(raw, valid_data, ndjson)
+        if error:
+            results[i] = {"index": start_index + i, "error": error}
+            continue
+        samples.append(
+            (
+                item.coveredArea,
+                item.beds,
+                item.bathrooms,
+                item.location,
+                item.propType,
+            )
+        )
+        positions.append(i)
+
+    if samples:
+        predictions = current.predict_batch(samples)
+        for i, predicted_price in zip(positions, predictions):
+            try:
+                results[i] = {
+                    "index": start_index + i,
+                    **format_prediction(float(predicted_price)),
+                }
+            except ValueError as e:
+                results[i] = {
+                    "index": start_index + i,
+                    "error": f"Prediction failed: {e}",
+                }
+    return results
+
+
+@app.post("/predict/batch")
+async def predict_batch(items: List[Any] = Body(...)):
+    current = require_model()
+    if len(items) > BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {len(items)} items (max {BATCH_MAX_ITEMS}). "
+            "Use /predict/stream for larger inputs.",
+        )
+    await get_vocabulary()
+    try:
+        results = await inference_executor.run(score_batch, current, items)
+    except Overloaded:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
+    errors = sum(1 for r in results if "error" in r)
+    return {
+        "count": len(results),
+        "errors": errors,
+        "model_version": current.version,
+        "results": results,
+    }
+
+
+@app.post("/predict/stream")
+async def predict_stream(request: Request):
+    """NDJSON in, NDJSON out: one PredictionInput per line.
+
+    The request body is spooled to a temp file (disk past STREAM_SPOOL_BYTES)
+    and scored in chunks of STREAM_CHUNK_SIZE while the response streams, so
+    neither side is held fully in memory.
+    """
+    current = require_model()
+    spool = tempfile.SpooledTemporaryFile(max_size=STREAM_SPOOL_BYTES)
+    async for body_chunk in request.stream():
+        spool.write(body_chunk)
+    spool.seek(0)
+
+    def score_next(start_index):
+        """Read and score the next STREAM_CHUNK_SIZE non-blank lines."""
+        chunk = []
+        for line in spool:
+            if line.strip():
+                chunk.append(line)
+                if len(chunk) >= STREAM_CHUNK_SIZE:
+                    break
+        results = score_batch(current, chunk, start_index, ndjson=True)
+        return "".join(json.dumps(r) + "\n" for r in results), len(chunk)
+
+    # Each chunk runs on the bounded inference executor, so streams count
+    # against its queue depth. A full queue before the first chunk is a 503;
+    # later on, the stream ends with an error line.
+    try:
+        first = await inference_executor.run(score_next, 0)
+    except BaseException:
+        spool.close()
+        raise
+
+    async def generate():
+        try:
+            text, count = first
+            index = 0
+            while count:
+                yield text
+                index += count
+                try:
+                    text, count = await inference_executor.run(score_next, index)
+                except Overloaded as e:
+                    error = {"index": index, "error": f"Server busy: {e}"}
+                    yield json.dumps(error) + "\n"
+                    return
+        finally:
+            spool.close()
+
+    return StreamingResponse(
+        generate(),
+        media_type="application/x-ndjson",
+        headers={"X-Model-Version": current.version},
+    )
 
 
 @app.get("/health")
-def health_check():
+async def health_check():
     return {"status": "ok"}
+
+
+@app.post("/admin/model/reload", dependencies=[Depends(require_admin)])
+def reload_model_endpoint(force: bool = False):
+    previous = bundle
+    try:
+        current, reloaded, timings = reload_model(force=force)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Model reload failed: {e}")
+    return {
+        "reloaded": reloaded,
+        "version": current.version,
+        "previous_version": previous.version if previous else None,
+        "timings": timings,
+    }
+
+
+@app.get("/ready")
+async def readiness_check():
+    current = bundle
+    model_status = {
+        **model_loader.status(),
+        "version": current.version if current else None,
+        "loaded_at": current.loaded_at if current else None,
+    }
+    vocabulary_status = vocabulary.status()
+    ready = bundle is not None and vocabulary_status["state"] == "ready"
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={
+            "ready": ready,
+            "model": model_status,
+            "vocabulary": vocabulary_status,
+            # Informational: profiles are optional and never gate readiness.
+            "location_profiles": location_profiles.status(),
+        },
+    )
+
+
+@app.get("/metrics")
+async def get_metrics():
+    return PlainTextResponse(
+        metrics.REGISTRY.render(), media_type="text/plain; version=0.0.4"
+    )
@@ -0,0 +1,136 @@
+"""Slim serving artifact for linear models.
+
+``mlflowserv.py`` writes ``serving.npz`` into the model folder next to the
+MLflow model. It holds the coefficients, the intercept, the feature columns
+(the encoder vocabulary), the ``model_uuid`` of the MLflow model it was
+exported from, a format version and a checksum over all of them. Loading it
+needs only numpy, so the API never imports mlflow or sklearn for a linear
+model. Non-linear models have no slim artifact and load through mlflow;
+``load_if_current`` ignores an npz left behind by an earlier model.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+
+import numpy as np
+
+ARTIFACT_NAME = "serving.npz"
+FORMAT_VERSION = 2
+
+
+def checksum(columns, coef, intercept, model_uuid=""):
+    digest = hashlib.sha256()
+    digest.update(json.dumps(list(columns)).encode("utf-8"))
+    digest.update(np.ascontiguousarray(coef, dtype="<f8").tobytes())
+    digest.update(np.float64(intercept).astype("<f8").tobytes())
+    digest.update(model_uuid.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def mlmodel_uuid(model_dir):
+    """``model_uuid`` from the folder's MLmodel file, or None."""
+    try:
+        with open(os.path.join(model_dir, "MLmodel"), encoding="utf-8") as f:
+            for line in f:
+                if line.startswith("model_uuid:"):
+                    return line.split(":", 1)[1].strip().strip("'\"") or None
+    except OSError:
+        pass
+    return None
+
+
+class LinearModel:
+    """The fitted terms of a linear regressor, with the sklearn attributes
+    ``ModelBundle`` and ``LinearKernel`` look for."""
+
+    _estimator_type = "regressor"
+
+    def __init__(self, coef, intercept, columns, model_uuid="", digest=None):
+        self.coef_ = np.asarray(coef, dtype=float)
+        self.intercept_ = float(intercept)
+        self.columns = list(columns)
+        self.n_features_in_ = len(self.columns)
+        self.model_uuid = model_uuid or ""
+        self.checksum = digest or checksum(
+            self.columns, self.coef_, self.intercept_, self.model_uuid
+        )
+
+    @classmethod
+    def from_model(cls, model, columns, model_uuid=""):
+        """Raises ValueError for anything but a single-output linear model
+        fitted on ``columns``."""
+        coef = np.asarray(getattr(model, "coef_", None), dtype=float)
+        intercept = np.ravel(getattr(model, "intercept_", np.nan))
+        if coef.shape != (len(columns),) or intercept.size != 1:
+            raise ValueError(f"{type(model).__name__} is not a linear model")
+        return cls(coef, intercept[0], columns, model_uuid)
+
+    def predict(self, X):
+        return X @ self.coef_ + self.intercept_
+
+
+def export(path, model, columns, model_uuid=""):
+    """Write ``model`` (fitted on ``columns``) to ``path`` atomically.
+    ``model_uuid`` names the MLflow model saved next to it."""
+    slim = LinearModel.from_model(model, columns, model_uuid)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            np.savez(
+                f,
+                format_version=np.int64(FORMAT_VERSION),
+                columns=np.array(slim.columns, dtype=str),
+                coef=slim.coef_,
+                intercept=np.float64(slim.intercept_),
+                model_uuid=np.array(slim.model_uuid),
+                checksum=np.array(slim.checksum),
+            )
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    return slim
+
+
+def load(path):
+    """A ``LinearModel``; raises ValueError on an unknown format version or
+    a checksum mismatch."""
+    with np.load(path, allow_pickle=False) as data:
+        version = int(data["format_version"])
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported serving artifact version {version}")
+        columns = data["columns"].tolist()
+        coef = data["coef"]
+        intercept = float(data["intercept"])
+        model_uuid = str(data["model_uuid"])
+        stored = str(data["checksum"])
+    if checksum(columns, coef, intercept, model_uuid) != stored:
+        raise ValueError(f"Checksum mismatch in {path}")
+    return LinearModel(coef, intercept, columns, model_uuid, stored)
+
+
+def load_if_current(model_dir):
+    """The slim model in ``model_dir`` if it was exported from the MLflow
+    model in that folder, else None (no npz, an unreadable one, or one left
+    over from an earlier model)."""
+    path = os.path.join(model_dir, ARTIFACT_NAME)
+    if not os.path.exists(path):
+        return None
+    try:
+        slim = load(path)
+    except ValueError as e:
+        print(f"⚠️ Ignoring {path}: {e}")
+        return None
+    expected = mlmodel_uuid(model_dir)
+    if expected is None or slim.model_uuid != expected:
+        print(
+            f"⚠️ Ignoring stale {path}: exported from MLflow model "
+            f"{slim.model_uuid or 'unknown'}, folder holds {expected or 'unknown'}"
+        )
+        return None
+    return slim
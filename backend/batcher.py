@@ -0,0 +1,90 @@
+"""Coalesce concurrent single predictions into one batched inference.
+
+``MicroBatcher.predict`` parks each sample on a shared queue. The first
+sample arms a timer for ``max_wait`` seconds; when it fires, or as soon as
+``max_batch_size`` samples are waiting, the queue is flushed into one
+``bundle.predict_batch`` call (through ``run``, normally an executor) and
+each caller gets its own row back. A failure in the batch is raised to every
+caller in it. Samples are grouped by bundle, so a hot model swap mid-window
+never mixes two models in one call.
+"""
+
+import asyncio
+import time
+
+from backend import metrics
+
+BATCH_SIZE = metrics.histogram(
+    "predict_batch_size",
+    "Samples per coalesced inference call",
+    ["batcher"],
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256),
+)
+BATCH_QUEUE_WAIT = metrics.histogram(
+    "predict_batch_queue_seconds",
+    "Time a sample waited for its batch to be flushed",
+    ["batcher"],
+)
+
+
+class MicroBatcher:
+    def __init__(self, name, run, max_batch_size=32, max_wait=0.002):
+        if max_batch_size < 1 or max_wait < 0:
+            raise ValueError("Need max_batch_size >= 1 and max_wait >= 0")
+        self.name = name
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self._run = run
+        self._pending = []
+        self._timer = None
+        self._tasks = set()
+
+    @property
+    def pending(self):
+        return len(self._pending)
+
+    async def predict(self, bundle, sample):
+        """The prediction for one ``(covered_area, beds, baths, location,
+        prop_type)`` sample, as a float."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((bundle, sample, future, time.perf_counter()))
+        if len(self._pending) >= self.max_batch_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self.flush)
+        return await future
+
+    def flush(self):
+        """Start inference for everything queued so far."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        groups = {}
+        for item in batch:
+            groups.setdefault(id(item[0]), []).append(item)
+        for items in groups.values():
+            task = asyncio.ensure_future(self._score(items))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _score(self, items):
+        now = time.perf_counter()
+        for _, _, _, enqueued in items:
+            BATCH_QUEUE_WAIT.observe(now - enqueued, batcher=self.name)
+        BATCH_SIZE.observe(len(items), batcher=self.name)
+        bundle = items[0][0]
+        try:
+            predictions = await self._run(
+                bundle.predict_batch, [sample for _, sample, _, _ in items]
+            )
+        except Exception as e:
+            for _, _, future, _ in items:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, _, future, _), prediction in zip(items, predictions):
+            # A caller that disconnected has a cancelled future; skip it.
+            if not future.done():
+                future.set_result(float(prediction))
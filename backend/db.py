@@ -0,0 +1,245 @@
+"""Bounded MySQL connection pool shared by the API and the ingestion scripts.
+
+Usage::
+
+    pool = pool_from_env("backend")
+    with pool.connection(query="listings") as conn:
+        cursor = conn.cursor(dictionary=True)
+        ...
+
+Connections are opened lazily up to ``size``; callers beyond that wait up to
+``timeout`` seconds. Idle connections older than ``recycle`` seconds are
+replaced, and connections that sat idle longer than ``ping_after`` seconds
+are pinged before being handed out (pre-ping). With ``query=`` the time the
+connection was held is recorded as that query's duration.
+"""
+
+import collections
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from backend import metrics
+
+POOL_CHECKOUTS = metrics.counter(
+    "db_pool_checkouts_total", "Connections handed out by the pool", ["pool"]
+)
+POOL_TIMEOUTS = metrics.counter(
+    "db_pool_checkout_timeouts_total", "Checkouts that gave up waiting", ["pool"]
+)
+POOL_WAIT = metrics.histogram(
+    "db_pool_wait_seconds", "Time spent waiting for a free connection", ["pool"]
+)
+POOL_OPENED = metrics.counter(
+    "db_pool_connections_opened_total", "New MySQL connections opened", ["pool"]
+)
+POOL_DISCARDED = metrics.counter(
+    "db_pool_connections_discarded_total",
+    "Connections closed by the pool",
+    ["pool", "reason"],
+)
+POOL_CONNECT = metrics.histogram(
+    "db_connect_seconds", "Time to open a new MySQL connection", ["pool"]
+)
+DB_QUERY = metrics.histogram(
+    "db_query_seconds",
+    "Time a labelled query held its connection, fetch included",
+    ["pool", "query"],
+)
+POOL_IN_USE = metrics.gauge(
+    "db_pool_connections_in_use", "Connections currently checked out", ["pool"]
+)
+POOL_IDLE = metrics.gauge(
+    "db_pool_connections_idle", "Open connections waiting in the pool", ["pool"]
+)
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+def mysql_connect_from_env(**overrides):
+    import mysql.connector
+
+    params = dict(
+        host=os.getenv("HOST"),
+        port=int(os.getenv("PORT", 3306)),
+        user=os.getenv("USER"),
+        password=os.getenv("PASSWORD"),
+        database=os.getenv("DB_NAME"),
+    )
+    params.update(overrides)
+    return mysql.connector.connect(**params)
+
+
+def _ping(conn):
+    conn.ping(reconnect=False)
+
+
+class ConnectionPool:
+    def __init__(
+        self,
+        connect,
+        size=5,
+        timeout=30.0,
+        recycle=3600.0,
+        pre_ping=True,
+        ping_after=5.0,
+        name="default",
+        ping=_ping,
+        clock=time.monotonic,
+    ):
+        if size < 1:
+            raise ValueError("Pool size must be at least 1")
+        self._connect = connect
+        self.size = size
+        self.timeout = timeout
+        self.recycle = recycle
+        self.pre_ping = pre_ping
+        self.ping_after = ping_after
+        self.name = name
+        self._ping = ping
+        self._clock = clock
+
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        # (conn, opened_at, released_at); LIFO so warm connections get reused
+        self._idle = collections.deque()
+        self._opened_at = {}
+        self._closed = False
+
+    # ---- Checkout / return ----
+    def acquire(self):
+        if self._closed:
+            raise PoolTimeout(f"Pool '{self.name}' is closed")
+        start = self._clock()
+        if not self._slots.acquire(timeout=self.timeout):
+            POOL_TIMEOUTS.inc(pool=self.name)
+            raise PoolTimeout(
+                f"No connection available in pool '{self.name}' "
+                f"after {self.timeout}s (size={self.size})"
+            )
+        POOL_WAIT.observe(self._clock() - start, pool=self.name)
+        try:
+            conn = self._checkout()
+        except BaseException:
+            self._slots.release()
+            raise
+        POOL_CHECKOUTS.inc(pool=self.name)
+        POOL_IN_USE.inc(pool=self.name)
+        return conn
+
+    def release(self, conn):
+        """Return ``conn``; any open transaction is rolled back first so the
+        next borrower never inherits a stale REPEATABLE READ snapshot."""
+        try:
+            if getattr(conn, "in_transaction", False):
+                conn.rollback()
+        except Exception:
+            self._discard(conn, "error")
+        else:
+            with self._lock:
+                if self._closed:
+                    closed = True
+                else:
+                    closed = False
+                    opened_at = self._opened_at.get(id(conn), self._clock())
+                    self._idle.append((conn, opened_at, self._clock()))
+                    POOL_IDLE.set(len(self._idle), pool=self.name)
+            if closed:
+                self._discard(conn, "closed")
+        finally:
+            POOL_IN_USE.dec(pool=self.name)
+            self._slots.release()
+
+    @contextmanager
+    def connection(self, query=None):
+        conn = self.acquire()
+        start = time.perf_counter()
+        try:
+            yield conn
+        finally:
+            if query is not None:
+                DB_QUERY.observe(
+                    time.perf_counter() - start, pool=self.name, query=query
+                )
+            self.release(conn)
+
+    def _checkout(self):
+        while True:
+            with self._lock:
+                entry = self._idle.pop() if self._idle else None
+                POOL_IDLE.set(len(self._idle), pool=self.name)
+            if entry is None:
+                return self._open()
+            conn, opened_at, released_at = entry
+            now = self._clock()
+            if self.recycle and now - opened_at > self.recycle:
+                self._discard(conn, "recycled")
+                continue
+            if self.pre_ping and now - released_at > self.ping_after:
+                try:
+                    self._ping(conn)
+                except Exception:
+                    self._discard(conn, "ping_failed")
+                    continue
+            return conn
+
+    def _open(self):
+        start = time.perf_counter()
+        conn = self._connect()
+        POOL_CONNECT.observe(time.perf_counter() - start, pool=self.name)
+        with self._lock:
+            self._opened_at[id(conn)] = self._clock()
+        POOL_OPENED.inc(pool=self.name)
+        return conn
+
+    def _discard(self, conn, reason):
+        with self._lock:
+            self._opened_at.pop(id(conn), None)
+        POOL_DISCARDED.inc(pool=self.name, reason=reason)
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    # ---- Lifecycle ----
+    def close(self):
+        """Close idle connections; checked-out ones are closed on release."""
+        with self._lock:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            POOL_IDLE.set(0, pool=self.name)
+        for conn, _, _ in idle:
+            self._discard(conn, "closed")
+
+    def stats(self):
+        with self._lock:
+            idle = len(self._idle)
+            open_connections = len(self._opened_at)
+        return {
+            "name": self.name,
+            "size": self.size,
+            "open": open_connections,
+            "idle": idle,
+            "in_use": open_connections - idle,
+        }
+
+
+def pool_from_env(name="default", connect=None, **overrides):
+    """Build a pool configured by ``DB_POOL_*`` env vars.
+
+    ``connect`` defaults to a MySQL connection from HOST/PORT/USER/PASSWORD/
+    DB_NAME; keyword ``overrides`` win over the environment.
+    """
+    options = dict(
+        size=int(os.getenv("DB_POOL_SIZE", 5)),
+        timeout=float(os.getenv("DB_POOL_TIMEOUT", 30)),
+        recycle=float(os.getenv("DB_POOL_RECYCLE", 3600)),
+        pre_ping=os.getenv("DB_POOL_PRE_PING", "1").lower() not in ("0", "false"),
+        ping_after=float(os.getenv("DB_POOL_PING_AFTER", 5)),
+    )
+    options.update(overrides)
+    return ConnectionPool(connect or mysql_connect_from_env, name=name, **options)
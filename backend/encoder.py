@@ -0,0 +1,147 @@
+import json
+from functools import cached_property
+
+import numpy as np
+
+NUMERIC_COLUMNS = ("covered_area", "beds", "baths")
+LOCATION_PREFIX = "location_"
+PROP_TYPE_PREFIX = "prop_type_"
+
+
+def _indices(lookup, values):
+    """Column index of every value, -1 when unknown. Categoricals are looked
+    up once per category rather than once per row."""
+    if getattr(values.dtype, "name", None) == "category":
+        per_code = [lookup.get(c, -1) for c in values.cat.categories] + [-1]
+        # code -1 (missing) picks the trailing -1
+        return np.array(per_code, dtype=np.intp)[values.cat.codes.to_numpy()]
+    return values.map(lookup).fillna(-1).to_numpy(dtype=np.intp)
+
+
+class FeatureEncoder:
+    """One-hot encoder compiled from the training ``feature_columns.json`` list.
+
+    Produces exactly what the old per-request ``pd.get_dummies`` + column
+    alignment did: numeric features copied in place, a 1 in the column of the
+    known location / property type, and an all-zero block for unseen values.
+    """
+
+    def __init__(self, columns):
+        if not columns:
+            raise ValueError("FeatureEncoder needs a non-empty feature column list")
+        self.columns = list(columns)
+        self.width = len(self.columns)
+
+        index = {name: i for i, name in enumerate(self.columns)}
+        missing = [c for c in NUMERIC_COLUMNS if c not in index]
+        if missing:
+            raise ValueError(f"Feature columns missing numeric inputs: {missing}")
+        self.numeric_idx = np.array([index[c] for c in NUMERIC_COLUMNS])
+
+        self.location_idx = {
+            name[len(LOCATION_PREFIX) :]: i
+            for name, i in index.items()
+            if name.startswith(LOCATION_PREFIX)
+        }
+        self.prop_type_idx = {
+            name[len(PROP_TYPE_PREFIX) :]: i
+            for name, i in index.items()
+            if name.startswith(PROP_TYPE_PREFIX)
+        }
+
+    @classmethod
+    def fit(cls, frame):
+        """Columns for a training frame, in the order ``pd.get_dummies`` used:
+        numeric inputs, then sorted locations, then sorted property types."""
+        columns = list(NUMERIC_COLUMNS)
+        for prefix, column in (
+            (LOCATION_PREFIX, "location"),
+            (PROP_TYPE_PREFIX, "prop_type"),
+        ):
+            columns += [prefix + v for v in sorted(frame[column].dropna().unique())]
+        return cls(columns)
+
+    @classmethod
+    def from_json(cls, path, purpose="sale"):
+        with open(path, "r") as f:
+            return cls(json.load(f).get(purpose, []))
+
+    def to_json(self, path, purpose="sale"):
+        with open(path, "w") as f:
+            json.dump({purpose: self.columns}, f, indent=4)
+
+    def encode_into(self, row, covered_area, beds, baths, location, prop_type):
+        """Write one sample into ``row`` (a zeroed 1-D array of ``width``)."""
+        row[self.numeric_idx] = (covered_area, beds, baths)
+        loc = self.location_idx.get(location)
+        if loc is not None:
+            row[loc] = 1.0
+        prop = self.prop_type_idx.get(prop_type)
+        if prop is not None:
+            row[prop] = 1.0
+        return row
+
+    def encode(self, covered_area, beds, baths, location, prop_type):
+        """Return a ``(1, width)`` matrix for a single sample."""
+        X = np.zeros((1, self.width))
+        self.encode_into(X[0], covered_area, beds, baths, location, prop_type)
+        return X
+
+    def encode_batch(self, samples):
+        """Return an ``(n, width)`` matrix for a sequence of
+        ``(covered_area, beds, baths, location, prop_type)`` tuples."""
+        n = len(samples)
+        X = np.zeros((n, self.width))
+        if n == 0:
+            return X
+        covered_area, beds, baths, locations, prop_types = zip(*samples)
+        X[:, self.numeric_idx] = np.column_stack((covered_area, beds, baths))
+        for lookup, values in (
+            (self.location_idx, locations),
+            (self.prop_type_idx, prop_types),
+        ):
+            cols = np.fromiter((lookup.get(v, -1) for v in values), np.intp, count=n)
+            rows = np.flatnonzero(cols >= 0)
+            X[rows, cols[rows]] = 1.0
+        return X
+
+    def encode_sparse(self, frame):
+        """Return an ``(n, width)`` CSR matrix for a frame with the training
+        columns (covered_area, beds, baths, location, prop_type). At most five
+        values per row are stored, however many locations there are."""
+        n = len(frame)
+        rows = [np.repeat(np.arange(n), len(NUMERIC_COLUMNS))]
+        cols = [np.tile(self.numeric_idx, n)]
+        data = [frame[list(NUMERIC_COLUMNS)].to_numpy(dtype=float).ravel()]
+        for lookup, column in (
+            (self.location_idx, "location"),
+            (self.prop_type_idx, "prop_type"),
+        ):
+            idx = _indices(lookup, frame[column])
+            hit = np.flatnonzero(idx >= 0)
+            rows.append(hit)
+            cols.append(idx[hit])
+            data.append(np.ones(len(hit)))
+        import scipy.sparse as sp
+
+        X = sp.csr_matrix(
+            (np.concatenate(data), (np.concatenate(rows), np.concatenate(cols))),
+            shape=(n, self.width),
+        )
+        X.eliminate_zeros()
+        return X
+
+    # pandas is only needed for models fitted on a DataFrame, so it is not
+    # imported when serving from the slim artifact.
+    @cached_property
+    def column_index(self):
+        import pandas as pd
+
+        return pd.Index(self.columns)
+
+    def to_frame(self, X):
+        """Wrap an encoded matrix with column names so sklearn's
+        feature-name check passes without re-aligning anything."""
+        import pandas as pd
+
+        return pd.DataFrame(X, columns=self.column_index, copy=False)
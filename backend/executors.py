@@ -0,0 +1,83 @@
+"""Dedicated thread pools that keep blocking work off the event loop.
+
+Each ``BoundedExecutor`` caps queued + running work at ``max_pending``;
+past that, ``run()`` raises ``Overloaded`` right away (the API turns it into
+a 503) instead of letting latency grow without bound.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from backend import metrics
+
+EXECUTOR_PENDING = metrics.gauge(
+    "executor_pending", "Tasks queued or running in an executor", ["executor"]
+)
+EXECUTOR_REJECTED = metrics.counter(
+    "executor_rejected_total", "Tasks rejected because the queue was full", ["executor"]
+)
+EXECUTOR_QUEUE_WAIT = metrics.histogram(
+    "executor_queue_seconds", "Time a task waited for a worker thread", ["executor"]
+)
+
+
+class Overloaded(Exception):
+    def __init__(self, name, max_pending):
+        super().__init__(f"{name} executor is at capacity ({max_pending} pending)")
+        self.name = name
+
+
+class BoundedExecutor:
+    def __init__(self, name, workers, max_pending):
+        if workers < 1 or max_pending < workers:
+            raise ValueError("Need workers >= 1 and max_pending >= workers")
+        self.name = name
+        self.workers = workers
+        self.max_pending = max_pending
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix=f"{name}-worker"
+        )
+
+    @property
+    def pending(self):
+        return self._pending
+
+    async def run(self, fn, *args, **kwargs):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                EXECUTOR_REJECTED.inc(executor=self.name)
+                raise Overloaded(self.name, self.max_pending)
+            self._pending += 1
+            EXECUTOR_PENDING.set(self._pending, executor=self.name)
+
+        submitted = time.perf_counter()
+
+        def task():
+            EXECUTOR_QUEUE_WAIT.observe(
+                time.perf_counter() - submitted, executor=self.name
+            )
+            return fn(*args, **kwargs)
+
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, task)
+        finally:
+            with self._lock:
+                self._pending -= 1
+                EXECUTOR_PENDING.set(self._pending, executor=self.name)
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+def executor_from_env(name, workers, max_pending):
+    """Build an executor sized by ``<NAME>_WORKERS`` / ``<NAME>_QUEUE_DEPTH``."""
+    prefix = name.upper()
+    workers = int(os.getenv(f"{prefix}_WORKERS", workers))
+    max_pending = int(os.getenv(f"{prefix}_QUEUE_DEPTH", max_pending))
+    return BoundedExecutor(name, workers, max(max_pending, workers))
@@ -0,0 +1,62 @@
+"""Request and stage latency histograms for ``/metrics``.
+
+``RequestTimer`` is a plain ASGI middleware: one ``perf_counter`` pair and
+one histogram update per request, labelled with the route template (e.g.
+``/locations/{name}/profile``) rather than the raw path so the label set
+stays bounded. ``timed(stage)`` times one step inside a request::
+
+    with timed("vocabulary"):
+        ...
+"""
+
+import time
+
+from backend import metrics
+
+REQUEST_SECONDS = metrics.histogram(
+    "http_request_duration_seconds",
+    "Time to handle an HTTP request, response body included",
+    ["method", "route", "status"],
+)
+STAGE_SECONDS = metrics.histogram(
+    "request_stage_seconds", "Time spent in one step of a request", ["stage"]
+)
+
+
+_stages = {}
+
+
+def timed(stage):
+    bound = _stages.get(stage)
+    if bound is None:
+        bound = _stages[stage] = STAGE_SECONDS.labels(stage=stage)
+    return bound.time()
+
+
+class RequestTimer:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        start = time.perf_counter()
+        status = [500]
+
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router stores the matched route in the (shared) scope.
+            route = getattr(scope.get("route"), "path", "unmatched")
+            REQUEST_SECONDS.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=route,
+                status=status[0],
+            )
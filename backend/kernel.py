@@ -0,0 +1,74 @@
+"""Direct evaluation of linear serving models.
+
+A linear model over the encoder's columns is ``intercept + area * w_area +
+beds * w_beds + baths * w_baths + w[location] + w[prop_type]``. ``LinearKernel``
+pulls those terms out of the fitted model once, at load time, so a prediction
+is a few float operations and two dict lookups, with no sklearn input
+validation or feature-name check. Models that aren't linear regressors get no
+kernel, and ``ModelBundle`` falls back to ``model.predict``.
+"""
+
+import numpy as np
+
+
+class LinearKernel:
+    def __init__(self, intercept, numeric_coef, location_coef, prop_type_coef):
+        self.intercept = float(intercept)
+        self.w_area, self.w_beds, self.w_baths = (float(w) for w in numeric_coef)
+        self.location_coef = location_coef
+        self.prop_type_coef = prop_type_coef
+        # Index-aligned copies for batches; slot -1 (unknown) is 0.0.
+        self._location_names = {name: i for i, name in enumerate(location_coef)}
+        self._location_array = np.array(list(location_coef.values()) + [0.0])
+        self._prop_type_names = {name: i for i, name in enumerate(prop_type_coef)}
+        self._prop_type_array = np.array(list(prop_type_coef.values()) + [0.0])
+
+    @classmethod
+    def from_model(cls, model, encoder):
+        """A kernel for sklearn-style linear regressors fitted on ``encoder``'s
+        columns, otherwise None."""
+        if getattr(model, "_estimator_type", None) != "regressor":
+            return None
+        coef = getattr(model, "coef_", None)
+        intercept = getattr(model, "intercept_", None)
+        if coef is None or intercept is None:
+            return None
+        coef = np.asarray(coef, dtype=float)
+        intercept = np.asarray(intercept, dtype=float)
+        if coef.shape != (encoder.width,) or intercept.size != 1:
+            return None
+        return cls(
+            intercept.item(),
+            coef[encoder.numeric_idx],
+            {name: float(coef[i]) for name, i in encoder.location_idx.items()},
+            {name: float(coef[i]) for name, i in encoder.prop_type_idx.items()},
+        )
+
+    def predict_one(self, covered_area, beds, baths, location, prop_type):
+        # Same operation order as predict_batch, so both give identical floats.
+        return (
+            self.intercept
+            + covered_area * self.w_area
+            + beds * self.w_beds
+            + baths * self.w_baths
+            + self.location_coef.get(location, 0.0)
+            + self.prop_type_coef.get(prop_type, 0.0)
+        )
+
+    def predict_batch(self, samples):
+        """Predictions for ``(covered_area, beds, baths, location, prop_type)``
+        tuples, as a float array."""
+        n = len(samples)
+        if n == 0:
+            return np.zeros(0)
+        covered_area, beds, baths, locations, prop_types = zip(*samples)
+        out = self.intercept + np.asarray(covered_area, dtype=float) * self.w_area
+        out += np.asarray(beds, dtype=float) * self.w_beds
+        out += np.asarray(baths, dtype=float) * self.w_baths
+        for names, weights, values in (
+            (self._location_names, self._location_array, locations),
+            (self._prop_type_names, self._prop_type_array, prop_types),
+        ):
+            idx = np.fromiter((names.get(v, -1) for v in values), np.intp, count=n)
+            out += weights[idx]
+        return out
@@ -0,0 +1,69 @@
+"""Keyset-paginated reads of ``property_data`` for ``/listings``.
+
+Pages are ordered by ``id`` and continue with ``id > cursor`` rather than
+``OFFSET``, so page N costs the same as page 1 and rows inserted meanwhile
+never shift a page. See ``Mysql/init.sql`` for the indexes behind the filters.
+"""
+
+LISTING_COLUMNS = (
+    "id",
+    "prop_type",
+    "purpose",
+    "covered_area",
+    "price",
+    "location",
+    "beds",
+    "baths",
+)
+
+# filter name -> SQL predicate; values are always bound as parameters
+FILTERS = {
+    "location": "location = %s",
+    "prop_type": "prop_type = %s",
+    "purpose": "purpose = %s",
+    "min_price": "price >= %s",
+    "max_price": "price <= %s",
+    "min_area": "covered_area >= %s",
+    "max_area": "covered_area <= %s",
+}
+
+
+def parse_fields(fields):
+    """``"price,location"`` -> the columns to select. ``id`` is always
+    included because it is the pagination cursor."""
+    if not fields:
+        return LISTING_COLUMNS
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in requested if f not in LISTING_COLUMNS]
+    if unknown:
+        raise ValueError(
+            f"Unknown fields: {', '.join(unknown)}. "
+            f"Must be some of: {', '.join(LISTING_COLUMNS)}"
+        )
+    return ("id",) + tuple(dict.fromkeys(f for f in requested if f != "id"))
+
+
+def build_query(columns, filters, after=None, limit=20):
+    clauses, params = [], []
+    for name, predicate in FILTERS.items():
+        value = filters.get(name)
+        if value is not None:
+            clauses.append(predicate)
+            params.append(value)
+    if after is not None:
+        clauses.append("id > %s")
+        params.append(after)
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    sql = f"SELECT {', '.join(columns)} FROM property_data{where} ORDER BY id LIMIT %s"
+    params.append(limit)
+    return sql, tuple(params)
+
+
+def fetch_page(conn, columns, filters, after=None, limit=20):
+    sql, params = build_query(columns, filters, after, limit)
+    cursor = conn.cursor(dictionary=True)
+    try:
+        cursor.execute(sql, params)
+        return cursor.fetchall()
+    finally:
+        cursor.close()
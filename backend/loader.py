@@ -0,0 +1,177 @@
+"""Background loading of the serving model, with state/timings for ``/ready``."""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Optional
+
+from backend.encoder import FeatureEncoder
+from backend.instrumentation import timed
+from backend.kernel import LinearKernel
+
+
+@dataclass(frozen=True)
+class ModelBundle:
+    """Everything one prediction needs, swapped in as a single reference so a
+    request never mixes a model with another model's feature columns."""
+
+    model: object
+    feature_columns: list
+    valid_metadata: dict
+    encoder: FeatureEncoder
+    version: str = "unversioned"
+    loaded_at: float = field(default_factory=time.time)
+    kernel: Optional[LinearKernel] = None
+
+    @classmethod
+    def build(
+        cls, model, feature_columns, valid_metadata=None, version=None, kernel=True
+    ):
+        encoder = FeatureEncoder(feature_columns)
+        return cls(
+            model=model,
+            feature_columns=list(feature_columns),
+            valid_metadata=valid_metadata or {},
+            encoder=encoder,
+            version=version or "unversioned",
+            kernel=LinearKernel.from_model(model, encoder) if kernel else None,
+        )
+
+    def predict_one(self, covered_area, beds, baths, location, prop_type):
+        if self.kernel is not None:
+            return self.kernel.predict_one(
+                covered_area, beds, baths, location, prop_type
+            )
+        with timed("encode"):
+            X = self.model_input(
+                self.encoder.encode(covered_area, beds, baths, location, prop_type)
+            )
+        with timed("model_predict"):
+            return float(self.model.predict(X)[0])
+
+    def predict_batch(self, samples):
+        if self.kernel is not None:
+            return self.kernel.predict_batch(samples)
+        with timed("encode"):
+            X = self.model_input(self.encoder.encode_batch(samples))
+        with timed("model_predict"):
+            return self.model.predict(X)
+
+    def model_input(self, X):
+        """``X`` as the model expects it: a named frame for models fitted on
+        a DataFrame (the old dense training), the bare matrix for sklearn
+        models fitted on sparse input, which carry no feature names."""
+        model = self.model
+        if hasattr(model, "n_features_in_") and not hasattr(model, "feature_names_in_"):
+            return X
+        return self.encoder.to_frame(X)
+
+
+class BackgroundLoader:
+    """Run ``load()`` on a daemon thread, retrying every ``retry_after``
+    seconds until it succeeds; ``on_loaded(result)`` publishes the result."""
+
+    def __init__(self, name, load, on_loaded, retry_after=30.0):
+        self.name = name
+        self._load = load
+        self._on_loaded = on_loaded
+        self.retry_after = retry_after
+        self.state = "pending"
+        self.error = None
+        self.attempts = 0
+        self.started_at = None
+        self.finished_at = None
+        self.duration = None
+        self.timings = {}
+        self._attempted = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(
+                target=self._run, name=f"{self.name}-loader", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def wait(self, timeout=None):
+        """Start loading if needed and block until the first attempt finished;
+        True if the result is loaded."""
+        self.start()
+        self._attempted.wait(timeout)
+        return self.state == "ready"
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.attempts += 1
+            self.state = "loading"
+            self.timings = {}
+            self.started_at = time.time()
+            start = time.perf_counter()
+            try:
+                result = self._load(self.timings)
+                self._on_loaded(result)
+            except Exception as e:
+                self.duration = time.perf_counter() - start
+                self.finished_at = time.time()
+                self.state = "failed"
+                self.error = f"{type(e).__name__}: {e}"
+                print(f"❌ {self.name} load failed (attempt {self.attempts}): {e}")
+                self._attempted.set()
+                self._stop.wait(self.retry_after)
+                continue
+            self.duration = time.perf_counter() - start
+            self.finished_at = time.time()
+            self.state = "ready"
+            self.error = None
+            self._attempted.set()
+            return
+
+    def status(self):
+        return {
+            "state": self.state,
+            "attempts": self.attempts,
+            "error": self.error,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration_seconds": self.duration,
+            "timings": dict(self.timings),
+        }
+
+
+class PeriodicTask:
+    """Call ``fn()`` every ``interval`` seconds on a daemon thread; errors are
+    logged and the next tick still runs."""
+
+    def __init__(self, name, interval, fn):
+        self.name = name
+        self.interval = interval
+        self._fn = fn
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self.interval <= 0 or self._thread is not None:
+            return
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(self._stop,), name=self.name, daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread = None
+
+    def _run(self, stop):
+        while not stop.wait(self.interval):
+            try:
+                self._fn()
+            except Exception as e:
+                print(f"❌ {self.name} failed: {e}")
@@ -0,0 +1,195 @@
+"""Local mirror of the S3 model artifacts, keyed on S3 ETag + size.
+
+``S3ModelCache.sync()`` lists the remote objects, compares them with the
+manifest written by the previous sync and only downloads what changed, in
+parallel. Every file is downloaded to a temp name next to its target and
+moved into place with ``os.replace``, so a crash never leaves a half-written
+artifact behind; an unchanged model costs one LIST (+ HEADs), zero GETs.
+"""
+
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from backend import metrics
+
+S3_DOWNLOAD_SECONDS = metrics.histogram(
+    "s3_download_seconds",
+    "Time to download one model artifact from S3",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+S3_DOWNLOADED_BYTES = metrics.counter(
+    "s3_downloaded_bytes_total", "Bytes of model artifacts downloaded from S3"
+)
+
+MANIFEST_NAME = ".manifest.json"
+
+
+@dataclass(frozen=True)
+class RemoteObject:
+    key: str
+    local_path: str  # relative to the cache dir, "/"-separated
+    etag: str
+    size: int
+
+
+class S3ModelCache:
+    def __init__(
+        self, s3, bucket, cache_dir="model_cache", max_workers=8, client_factory=None
+    ):
+        # Pass ``s3=None`` and a ``client_factory`` to defer creating the
+        # client (and importing boto3) until the first S3 call.
+        self._s3 = s3
+        self._client_factory = client_factory
+        self._client_lock = threading.Lock()
+        self.bucket = bucket
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
+        self.manifest_path = os.path.join(cache_dir, MANIFEST_NAME)
+        self._lock = threading.Lock()
+
+    @property
+    def s3(self):
+        if self._s3 is None:
+            with self._client_lock:
+                if self._s3 is None:
+                    self._s3 = self._client_factory()
+        return self._s3
+
+    # ---- Remote listing ----
+    def list_prefix(self, prefix, local_dir):
+        """All objects under ``prefix``, mapped below ``local_dir``."""
+        objects = []
+        paginator = self.s3.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix):
+            for obj in page.get("Contents", []):
+                key = obj["Key"]
+                if key.endswith("/"):
+                    continue
+                rel_path = os.path.relpath(key, prefix).replace(os.sep, "/")
+                objects.append(
+                    RemoteObject(
+                        key=key,
+                        local_path=f"{local_dir}/{rel_path}",
+                        etag=obj["ETag"].strip('"'),
+                        size=obj["Size"],
+                    )
+                )
+        return objects
+
+    def head(self, key, local_path):
+        meta = self.s3.head_object(Bucket=self.bucket, Key=key)
+        return RemoteObject(
+            key=key,
+            local_path=local_path,
+            etag=meta["ETag"].strip('"'),
+            size=meta["ContentLength"],
+        )
+
+    # ---- Manifest ----
+    def read_manifest(self):
+        try:
+            with open(self.manifest_path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_manifest(self, manifest):
+        _atomic_write_json(self.manifest_path, manifest)
+
+    def is_current(self, obj, manifest):
+        entry = manifest.get(obj.local_path)
+        if not entry or entry.get("etag") != obj.etag or entry.get("size") != obj.size:
+            return False
+        try:
+            return os.path.getsize(self._abs(obj.local_path)) == obj.size
+        except OSError:
+            return False
+
+    # ---- Sync ----
+    def sync(self, objects, prune_dirs=()):
+        """Download the ``objects`` that changed since the last sync.
+
+        Local files under ``prune_dirs`` that the manifest knows about but
+        that no longer exist remotely are deleted. Returns counts and timings.
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        manifest = self.read_manifest()
+        stale = [obj for obj in objects if not self.is_current(obj, manifest)]
+
+        start = time.perf_counter()
+        downloaded_bytes = 0
+        try:
+            if stale:
+                workers = max(1, min(self.max_workers, len(stale)))
+                with ThreadPoolExecutor(workers, thread_name_prefix="s3-get") as pool:
+                    for obj in pool.map(self._download, stale):
+                        with self._lock:
+                            manifest[obj.local_path] = {
+                                "key": obj.key,
+                                "etag": obj.etag,
+                                "size": obj.size,
+                            }
+                        downloaded_bytes += obj.size
+        finally:
+            remote_paths = {obj.local_path for obj in objects}
+            for local_path in list(manifest):
+                in_pruned = any(local_path.startswith(f"{d}/") for d in prune_dirs)
+                if in_pruned and local_path not in remote_paths:
+                    manifest.pop(local_path)
+                    try:
+                        os.remove(self._abs(local_path))
+                    except OSError:
+                        pass
+            self._write_manifest(manifest)
+
+        return {
+            "objects": len(objects),
+            "downloaded": len(stale),
+            "skipped": len(objects) - len(stale),
+            "downloaded_bytes": downloaded_bytes,
+            "download_seconds": time.perf_counter() - start,
+        }
+
+    def _download(self, obj):
+        target = self._abs(obj.local_path)
+        directory = os.path.dirname(target)
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(
+            dir=directory, prefix=f".{os.path.basename(target)}.", suffix=".part"
+        )
+        os.close(fd)
+        try:
+            with S3_DOWNLOAD_SECONDS.time():
+                self.s3.download_file(self.bucket, obj.key, tmp_path)
+            os.replace(tmp_path, target)
+            S3_DOWNLOADED_BYTES.inc(obj.size)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        return obj
+
+    def _abs(self, local_path):
+        return os.path.join(self.cache_dir, *local_path.split("/"))
+
+
+def _atomic_write_json(path, data):
+    directory = os.path.dirname(path) or "."
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
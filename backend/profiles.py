@@ -0,0 +1,60 @@
+"""Location profiles: sentiments joined with precomputed listing stats.
+
+Built from ``location_stats`` (materialized at ingestion by
+``DBinsert/location_stats.py``) and ``location_sentiments``. The snapshot is
+cached with ``SnapshotCache(snapshot_type=LocationProfiles)``, so requests
+are dict lookups.
+"""
+
+import time
+from dataclasses import dataclass
+
+SENTIMENT_FIELDS = ("water", "electricity", "gas", "traffic", "safety")
+
+
+def _sentiments(row):
+    if row is None:
+        return None
+    updated_at = row.get("updated_at")
+    return {
+        **{field: row.get(f"{field}_sentiment") for field in SENTIMENT_FIELDS},
+        "updated_at": updated_at.isoformat() if updated_at else None,
+    }
+
+
+@dataclass(frozen=True)
+class LocationProfiles:
+    profiles: dict  # location -> profile dict, sorted by location
+    loaded_at: float
+
+    @classmethod
+    def from_rows(cls, rows, loaded_at=None):
+        """``rows`` is ``{"stats": [...], "sentiments": [...]}`` as dict rows."""
+        stats = {}
+        for row in rows["stats"]:
+            stats.setdefault(row["location"], {})[row["purpose"] or "unknown"] = {
+                "count": int(row["listings"]),
+                "median_price": row["median_price"],
+                "median_price_per_unit_area": row["median_price_per_unit_area"],
+            }
+        sentiments = {row["location"]: row for row in rows["sentiments"]}
+        profiles = {}
+        for location in sorted(stats.keys() | sentiments.keys()):
+            listings = stats.get(location, {})
+            profiles[location] = {
+                "location": location,
+                "listings": listings,
+                "total_listings": sum(p["count"] for p in listings.values()),
+                "sentiments": _sentiments(sentiments.get(location)),
+            }
+        return cls(profiles, time.time() if loaded_at is None else loaded_at)
+
+    @classmethod
+    def empty(cls):
+        return cls({}, 0.0)
+
+    def get(self, location):
+        return self.profiles.get(location)
+
+    def counts(self):
+        return {"locations": len(self.profiles)}
@@ -0,0 +1,204 @@
+"""On-demand cProfile captures of single API requests.
+
+``RequestProfiler`` holds the settings and the saved captures,
+``ProfilingMiddleware`` applies them. While ``enabled`` is off the middleware
+costs a clock read and an attribute check per request. When on, a request to one of
+``paths`` is profiled if it carries ``X-Profile: 1`` and ``authorize`` accepts
+its ``X-Admin-Token``, or if it is picked by ``sample_rate``. Each capture is written to
+``directory`` as a pstats file (``python -m pstats``, snakeviz, ...); the
+response carries its name in ``X-Profile-Id``. Only the newest
+``max_files`` captures are kept.
+
+``configure()`` also writes the settings to ``settings.json`` in
+``directory``; every profiler using that directory (one per uvicorn worker)
+re-reads the file at most every ``check_every`` seconds, so a toggle reaches
+all workers. The file outlives restarts and overrides the constructor
+arguments until it is changed or deleted.
+
+cProfile follows the event-loop thread, so a capture also contains whatever
+other requests ran on the loop meanwhile, but not work handed to executor
+threads. One capture runs at a time; requests arriving meanwhile are served
+unprofiled.
+"""
+
+import asyncio
+import cProfile
+import json
+import os
+import random
+import threading
+import time
+import uuid
+
+SUFFIX = ".prof"
+SETTINGS = "settings.json"
+
+
+class RequestProfiler:
+    def __init__(
+        self,
+        directory="profiles",
+        paths=("/predict", "/listings"),
+        enabled=False,
+        sample_rate=0.0,
+        max_files=50,
+        authorize=None,
+        check_every=1.0,
+        clock=time.monotonic,
+    ):
+        self.directory = directory
+        self.paths = frozenset(paths)
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.max_files = max_files
+        # authorize(x_admin_token) -> bool; without it the header is ignored.
+        self.authorize = authorize
+        # Held while a capture runs; cProfile can't nest on one thread.
+        self.busy = threading.Lock()
+        self.check_every = check_every
+        self._clock = clock
+        self._next_check = 0.0
+        self._settings_mtime = None
+
+    def wanted(self, scope):
+        headers = dict(scope["headers"])
+        if headers.get(b"x-profile") == b"1":
+            token = headers.get(b"x-admin-token")
+            return self.authorize is not None and self.authorize(
+                None if token is None else token.decode("latin-1")
+            )
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def save(self, profile, name):
+        os.makedirs(self.directory, exist_ok=True)
+        profile.dump_stats(os.path.join(self.directory, name))
+        for old in self.list()[self.max_files :]:
+            try:
+                os.remove(os.path.join(self.directory, old["name"]))
+            except OSError:
+                pass
+
+    # ---- Shared settings ----
+    def sync(self):
+        """Pick up settings another worker saved with ``configure()``."""
+        now = self._clock()
+        if now < self._next_check:
+            return
+        self._next_check = now + self.check_every
+        try:
+            path = os.path.join(self.directory, SETTINGS)
+            mtime = os.stat(path).st_mtime_ns
+            if mtime == self._settings_mtime:
+                return
+            with open(path) as f:
+                settings = json.load(f)
+            enabled = bool(settings["enabled"])
+            sample_rate = float(settings["sample_rate"])
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            print(f"❌ Ignoring unreadable profiling settings: {e}")
+            return
+        self._settings_mtime = mtime
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+
+    def _share(self):
+        path = os.path.join(self.directory, SETTINGS)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp, "w") as f:
+                json.dump({"enabled": self.enabled, "sample_rate": self.sample_rate}, f)
+            os.replace(tmp, path)
+            self._settings_mtime = os.stat(path).st_mtime_ns
+        except OSError as e:
+            print(f"❌ Could not share profiling settings with other workers: {e}")
+
+    # ---- Admin ----
+    def configure(self, enabled=None, sample_rate=None):
+        if sample_rate is not None and not 0 <= sample_rate <= 1:
+            raise ValueError("sample_rate must be between 0 and 1")
+        # Start from what the other workers use, not this worker's last look.
+        self._next_check = 0.0
+        self.sync()
+        if sample_rate is not None:
+            self.sample_rate = sample_rate
+        if enabled is not None:
+            self.enabled = enabled
+        self._share()
+        return self.status()
+
+    def status(self):
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "paths": sorted(self.paths),
+            "directory": self.directory,
+            "max_files": self.max_files,
+        }
+
+    def list(self):
+        """Saved captures, newest first."""
+        try:
+            entries = [e for e in os.scandir(self.directory) if e.name.endswith(SUFFIX)]
+        except FileNotFoundError:
+            return []
+        profiles = [
+            {"name": e.name, "bytes": e.stat().st_size, "created": e.stat().st_mtime}
+            for e in entries
+        ]
+        return sorted(profiles, key=lambda p: (p["created"], p["name"]), reverse=True)
+
+    def path(self, name):
+        """Path of a saved capture, or None for unknown names."""
+        if os.path.basename(name) != name or not name.endswith(SUFFIX):
+            return None
+        path = os.path.join(self.directory, name)
+        return path if os.path.isfile(path) else None
+
+
+class ProfilingMiddleware:
+    def __init__(self, app, profiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        profiler = self.profiler
+        profiler.sync()
+        if not profiler.enabled or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if scope["path"] not in profiler.paths or not profiler.wanted(scope):
+            await self.app(scope, receive, send)
+            return
+        if not profiler.busy.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+        name = "{}-{}-{}{}".format(
+            time.strftime("%Y%m%dT%H%M%S"),
+            scope["path"].strip("/").replace("/", "_"),
+            uuid.uuid4().hex[:8],
+            SUFFIX,
+        )
+
+        async def send_with_id(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((b"x-profile-id", name.encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+            try:
+                await self.app(scope, receive, send_with_id)
+            finally:
+                profile.disable()
+            try:
+                await asyncio.to_thread(profiler.save, profile, name)
+            except OSError as e:
+                print(f"❌ Could not save profile {name}: {e}")
+        finally:
+            profiler.busy.release()
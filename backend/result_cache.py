@@ -0,0 +1,96 @@
+"""Bounded LRU + TTL cache for prediction results."""
+
+import threading
+import time
+from collections import OrderedDict
+
+from backend import metrics
+
+CACHE_REQUESTS = metrics.counter(
+    "prediction_cache_requests_total", "Prediction cache lookups", ["result"]
+)
+CACHE_EVICTIONS = metrics.counter(
+    "prediction_cache_evictions_total", "Prediction cache evictions", ["reason"]
+)
+CACHE_SAVED = metrics.counter(
+    "prediction_cache_saved_seconds_total",
+    "Inference time avoided by serving cached predictions",
+)
+CACHE_ENTRIES = metrics.gauge("prediction_cache_entries", "Cached predictions")
+CACHE_HIT_RATIO = metrics.gauge(
+    "prediction_cache_hit_ratio", "Hits / lookups since the process started"
+)
+
+
+class ResultCache:
+    """``max_entries`` bounds memory (least recently used entries go first);
+    entries older than ``ttl`` seconds are treated as misses. ``max_entries=0``
+    disables the cache."""
+
+    def __init__(self, max_entries=10000, ttl=3600.0, clock=time.monotonic):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()  # key -> (value, stored_at, cost_seconds)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        if self.max_entries <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._clock() - entry[1] > self.ttl:
+                del self._entries[key]
+                CACHE_EVICTIONS.inc(reason="expired")
+                entry = None
+            if entry is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+            ratio = self.hits / (self.hits + self.misses)
+            size = len(self._entries)
+        CACHE_HIT_RATIO.set(ratio)
+        CACHE_ENTRIES.set(size)
+        if entry is None:
+            CACHE_REQUESTS.inc(result="miss")
+            return None
+        CACHE_REQUESTS.inc(result="hit")
+        CACHE_SAVED.inc(entry[2])
+        return entry[0]
+
+    def put(self, key, value, cost_seconds=0.0):
+        if self.max_entries <= 0:
+            return
+        evicted = 0
+        with self._lock:
+            self._entries[key] = (value, self._clock(), cost_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+            size = len(self._entries)
+        if evicted:
+            CACHE_EVICTIONS.inc(evicted, reason="capacity")
+        CACHE_ENTRIES.set(size)
+
+    def clear(self):
+        with self._lock:
+            dropped = len(self._entries)
+            self._entries.clear()
+        if dropped:
+            CACHE_EVICTIONS.inc(dropped, reason="invalidated")
+        CACHE_ENTRIES.set(0)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,159 @@
+import threading
+import time
+
+from backend import metrics
+from backend.vocabulary import VocabularySnapshot
+
+CACHE_REFRESHES = metrics.counter(
+    "db_cache_refreshes_total", "Reloads of a DB-backed cache", ["cache", "result"]
+)
+CACHE_LOADED_AT = metrics.gauge(
+    "db_cache_loaded_timestamp_seconds",
+    "Unix time the cached snapshot was loaded",
+    ["cache"],
+)
+CACHE_ENTRIES = metrics.gauge(
+    "db_cache_entries", "Entries in the cached snapshot", ["cache", "kind"]
+)
+
+
+class SnapshotCache:
+    """TTL cache of an immutable snapshot built from a DB ``loader()``.
+
+    ``snapshot_type`` turns the loader's result into the snapshot
+    (``from_rows``/``empty``/``counts``). It defaults to
+    ``VocabularySnapshot`` over ``property_data`` rows; location profiles use
+    ``LocationProfiles``.
+
+    ``get()`` only blocks on the database when nothing has been loaded yet;
+    once a snapshot exists, an expired entry is served as-is while a single
+    background refresh replaces it. ``start()`` additionally runs a refresher
+    thread so the hot path normally never sees an expired entry.
+    """
+
+    def __init__(
+        self,
+        loader,
+        ttl=300.0,
+        retry_after=5.0,
+        clock=time.monotonic,
+        snapshot_type=VocabularySnapshot,
+        name="vocabulary",
+    ):
+        self._loader = loader
+        self._snapshot_type = snapshot_type
+        self.name = name
+        self.ttl = ttl
+        self.retry_after = retry_after
+        self._clock = clock
+        self._snapshot = None
+        self._expires_at = 0.0
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._refreshing = False
+        self._stop = threading.Event()
+        self._thread = None
+        self.last_error = None
+        self.last_refresh_seconds = None
+
+    def get(self):
+        snapshot = self._snapshot
+        if snapshot is None:
+            return self.refresh(force=False)
+        if self._clock() >= self._expires_at:
+            self._refresh_in_background()
+        return snapshot
+
+    def get_cached(self):
+        """Like ``get()`` but never blocks: ``None`` until a first load."""
+        snapshot = self._snapshot
+        if snapshot is not None and self._clock() >= self._expires_at:
+            self._refresh_in_background()
+        return snapshot
+
+    def refresh(self, force=True):
+        """Reload from the database; keeps the old snapshot on failure.
+
+        With ``force=False`` concurrent callers that were waiting on the lock
+        reuse the snapshot the first caller just loaded.
+        """
+        with self._lock:
+            if not force and self._snapshot is not None:
+                return self._snapshot
+            start = time.perf_counter()
+            try:
+                rows = self._loader()
+            except Exception as e:
+                print(f" Failed to load {self.name} from DB: {e}")
+                CACHE_REFRESHES.inc(cache=self.name, result="failed")
+                self.last_error = f"{type(e).__name__}: {e}"
+                # Serve what we have (or nothing) and retry soon, instead of
+                # hitting a down database on every request.
+                if self._snapshot is None:
+                    self._snapshot = self._snapshot_type.empty()
+                self._expires_at = self._clock() + min(self.retry_after, self.ttl)
+                return self._snapshot
+            self._snapshot = self._snapshot_type.from_rows(rows)
+            self._expires_at = self._clock() + self.ttl
+            self.last_error = None
+            self.last_refresh_seconds = time.perf_counter() - start
+            CACHE_REFRESHES.inc(cache=self.name, result="ok")
+            CACHE_LOADED_AT.set(self._snapshot.loaded_at, cache=self.name)
+            for kind, n in self._snapshot.counts().items():
+                CACHE_ENTRIES.set(n, cache=self.name, kind=kind)
+            return self._snapshot
+
+    def invalidate(self):
+        """Drop the cached snapshot so the next ``get()`` reloads it."""
+        with self._lock:
+            self._snapshot = None
+            self._expires_at = 0.0
+
+    def status(self):
+        snapshot = self._snapshot
+        loaded = snapshot is not None and snapshot.loaded_at > 0
+        return {
+            "state": (
+                "ready" if loaded else ("failed" if self.last_error else "pending")
+            ),
+            "error": self.last_error,
+            "loaded_at": snapshot.loaded_at if loaded else None,
+            "refresh_seconds": self.last_refresh_seconds,
+            **(snapshot or self._snapshot_type.empty()).counts(),
+        }
+
+    def _refresh_in_background(self):
+        with self._refresh_lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                self.refresh()
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=run, name=f"{self.name}-refresh", daemon=True).start()
+
+    # ---- Background refresher ----
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name=f"{self.name}-refresher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.refresh()
+            # Wake up before expiry so readers never see a stale entry.
+            self._stop.wait(max((self._expires_at - self._clock()) * 0.8, 0.1))
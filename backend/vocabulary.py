@@ -0,0 +1,40 @@
+import time
+from dataclasses import dataclass
+
+
+# ---- Snapshot ----
+@dataclass(frozen=True)
+class VocabularySnapshot:
+    """Immutable view of the valid locations / property types.
+
+    The sorted tuples are what the API returns, the frozensets are what
+    request validation checks against (O(1) membership instead of a list scan).
+    """
+
+    locations: tuple
+    prop_types: tuple
+    location_set: frozenset
+    prop_type_set: frozenset
+    loaded_at: float
+
+    @classmethod
+    def from_rows(cls, rows, loaded_at=None):
+        location_set = frozenset(r["location"] for r in rows if r.get("location"))
+        prop_type_set = frozenset(r["prop_type"] for r in rows if r.get("prop_type"))
+        return cls(
+            locations=tuple(sorted(location_set)),
+            prop_types=tuple(sorted(prop_type_set)),
+            location_set=location_set,
+            prop_type_set=prop_type_set,
+            loaded_at=time.time() if loaded_at is None else loaded_at,
+        )
+
+    @classmethod
+    def empty(cls):
+        return cls((), (), frozenset(), frozenset(), 0.0)
+
+    def as_dict(self):
+        return {"locations": list(self.locations), "prop_type": list(self.prop_types)}
+
+    def counts(self):
+        return {"locations": len(self.locations), "prop_types": len(self.prop_types)}
@@ -0,0 +1,83 @@
+"""Benchmark: concurrent /predict-style calls, one model.predict each vs
+coalesced by MicroBatcher.
+
+Uses the checked-in serving model without the linear kernel, i.e. the path
+non-linear models take. Run from the repo root:
+
+    python benchmarks/batch_bench.py --concurrency 64 --rounds 20
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+import mlflow.sklearn
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.batcher import MicroBatcher  # noqa: E402
+from backend.executors import BoundedExecutor  # noqa: E402
+from backend.loader import ModelBundle  # noqa: E402
+
+CACHE_DIR = os.path.join("backend", "model_cache")
+SAMPLE = (1000.0, 3, 2, "Cantt, Karachi, Sindh", "House")
+
+
+async def burst(predict, concurrency, rounds):
+    latencies = []
+
+    async def one(i):
+        start = time.perf_counter()
+        await predict((SAMPLE[0] + i,) + SAMPLE[1:])
+        latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await asyncio.gather(*(one(i) for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return (
+        concurrency * rounds / elapsed,
+        latencies[len(latencies) // 2],
+        latencies[int(len(latencies) * 0.99)],
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--wait-ms", type=float, default=2.0)
+    parser.add_argument("--max-size", type=int, default=32)
+    args = parser.parse_args(argv)
+
+    model = mlflow.sklearn.load_model(os.path.join(CACHE_DIR, "ZameenPriceModelSale"))
+    with open(os.path.join(CACHE_DIR, "feature_columns.json")) as f:
+        bundle = ModelBundle.build(model, json.load(f)["sale"], kernel=False)
+    executor = BoundedExecutor(
+        "bench", workers=min(4, os.cpu_count() or 1), max_pending=4096
+    )
+    batcher = MicroBatcher(
+        "bench",
+        executor.run,
+        max_batch_size=args.max_size,
+        max_wait=args.wait_ms / 1000,
+    )
+
+    modes = {
+        "per-request": lambda s: executor.run(bundle.predict_one, *s),
+        "coalesced": lambda s: batcher.predict(bundle, s),
+    }
+    print(f"{'mode':<12} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9}")
+    for mode, predict in modes.items():
+        asyncio.run(burst(predict, args.concurrency, 1))  # warm-up
+        rps, p50, p99 = asyncio.run(burst(predict, args.concurrency, args.rounds))
+        print(f"{mode:<12} {rps:>9.0f} {p50 * 1e3:>9.2f} {p99 * 1e3:>9.2f}")
+    executor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
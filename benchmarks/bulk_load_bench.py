@@ -0,0 +1,86 @@
+"""Benchmark: rows/second of each property_data load strategy.
+
+Against the MySQL configured in .env (host/port/user/password, database
+zameen). The rows are inserted, so use a scratch database:
+
+    python benchmarks/bulk_load_bench.py --mysql --rows 200000
+
+Without --mysql an in-memory SQLite table stands in (no LOAD DATA there). That
+only compares the client-side cost of the INSERT strategies.
+"""
+
+import argparse
+import os
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from DBinsert import bulkload  # noqa: E402
+from DBinsert.format import clean, connect_mysql, to_insert_tuples  # noqa: E402
+from format_bench import synthetic  # noqa: E402
+
+
+class SqliteConnection:
+    def __init__(self):
+        self.db = sqlite3.connect(":memory:")
+        self.db.execute(
+            "CREATE TABLE property_data (id INTEGER PRIMARY KEY, prop_type TEXT, "
+            "purpose TEXT, covered_area REAL, price REAL, location TEXT, "
+            "beds INTEGER, baths INTEGER, amenities TEXT)"
+        )
+
+    def cursor(self):
+        db = self.db
+
+        class Cursor:
+            def execute(self, sql, params=()):
+                db.execute(sql.replace("%s", "?"), params)
+
+            def executemany(self, sql, rows):
+                db.executemany(sql.replace("%s", "?"), rows)
+
+            def close(self):
+                pass
+
+        return Cursor()
+
+    def commit(self):
+        self.db.commit()
+
+    def rollback(self):
+        self.db.rollback()
+
+    def close(self):
+        self.db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--mysql", action="store_true")
+    parser.add_argument("--defer-indexes", action="store_true")
+    args = parser.parse_args()
+
+    rows = to_insert_tuples(clean(synthetic(args.rows)))
+    strategies = bulkload.STRATEGIES if args.mysql else ("multirow", "executemany")
+    for strategy in strategies:
+        if args.mysql:
+            conn = connect_mysql(allow_local_infile=strategy == "load-data")
+        else:
+            conn = SqliteConnection()
+        try:
+            if args.defer_indexes and args.mysql:
+                with bulkload.deferred_indexes(conn):
+                    report = bulkload.load(conn, rows, strategy, args.batch_size)
+            else:
+                report = bulkload.load(conn, rows, strategy, args.batch_size)
+        finally:
+            conn.close()
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Benchmark: loading the training data from the cleaned CSV vs the Parquet dataset.
+
+Cleans synthetic scrape rows once, writes both formats to a temp directory,
+then times ``mlflowserv.load_sale_data`` on each and reports the in-memory
+size of the resulting frame. Run from the repo root:
+
+    python benchmarks/dataset_bench.py                 # 100k and 1M rows
+    python benchmarks/dataset_bench.py --rows 50000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from DBinsert import dataset  # noqa: E402
+from DBinsert.format import clean  # noqa: E402
+from format_bench import synthetic  # noqa: E402
+from mlflowserv import load_sale_data  # noqa: E402
+
+
+def best_of(fn, repeat=3):
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", default="100000,1000000")
+    args = parser.parse_args(argv)
+
+    print(f"{'rows':>9} {'format':<8} {'load s':>8} {'frame MB':>9} {'on disk MB':>10}")
+    for rows in (int(r) for r in args.rows.split(",")):
+        df = clean(synthetic(rows))
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, "cleaned.csv")
+            parquet_path = os.path.join(tmp, "cleaned.parquet")
+            df.to_csv(csv_path, index=False)
+            dataset.write(df, parquet_path)
+            for label, path in (("csv", csv_path), ("parquet", parquet_path)):
+                seconds, frame = best_of(lambda: load_sale_data(path))
+                size = (
+                    os.path.getsize(path)
+                    if os.path.isfile(path)
+                    else sum(
+                        os.path.getsize(os.path.join(root, f))
+                        for root, _, files in os.walk(path)
+                        for f in files
+                    )
+                )
+                memory = frame.memory_usage(deep=True).sum()
+                print(
+                    f"{rows:>9} {label:<8} {seconds:>8.3f} {memory / 1e6:>9.1f} "
+                    f"{size / 1e6:>10.1f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
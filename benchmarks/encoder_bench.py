@@ -0,0 +1,62 @@
+"""Micro-benchmark: FeatureEncoder vs the old per-request pandas encoding.
+
+Run from the repo root:  python benchmarks/encoder_bench.py
+"""
+
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.encoder import FeatureEncoder  # noqa: E402
+
+FEATURES = os.path.join("backend", "model_cache", "feature_columns.json")
+SAMPLE = (1000.0, 3, 2, "Cantt, Karachi, Sindh", "House")
+
+
+def pandas_encode(columns, covered_area, beds, baths, location, prop_type):
+    """The encoding predict_price used before FeatureEncoder."""
+    base_df = pd.DataFrame(
+        [[covered_area, beds, baths]], columns=["covered_area", "beds", "baths"]
+    )
+    loc_df = pd.get_dummies(pd.Series([location]), prefix="location")
+    prop_df = pd.get_dummies(pd.Series([prop_type]), prefix="prop_type")
+    input_df = pd.concat([base_df, loc_df, prop_df], axis=1)
+    for col in columns:
+        if col not in input_df.columns:
+            input_df[col] = 0
+    return input_df[columns]
+
+
+def bench(label, fn, number):
+    per_call = min(timeit.repeat(fn, number=number, repeat=5)) / number
+    print(f"{label:<32} {per_call * 1e6:10.1f} µs/call")
+    return per_call
+
+
+def main():
+    encoder = FeatureEncoder.from_json(FEATURES)
+    columns = encoder.columns
+
+    expected = pandas_encode(columns, *SAMPLE).to_numpy(dtype=float)
+    assert np.array_equal(expected, encoder.encode(*SAMPLE))
+
+    old = bench(
+        "pandas get_dummies + align", lambda: pandas_encode(columns, *SAMPLE), 200
+    )
+    new = bench("FeatureEncoder.encode", lambda: encoder.encode(*SAMPLE), 20000)
+    framed = bench(
+        "FeatureEncoder.encode + to_frame",
+        lambda: encoder.to_frame(encoder.encode(*SAMPLE)),
+        5000,
+    )
+    print(f"speedup (encode only):   {old / new:8.1f}x")
+    print(f"speedup (with to_frame): {old / framed:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
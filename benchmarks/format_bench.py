@@ -0,0 +1,172 @@
+"""Benchmark: DBinsert/format.py cleaning + INSERT tuple building, rows/second.
+
+Compares the vectorized pipeline with the old ``iterrows`` loops (STEP 8 and
+STEP 12) on synthetic scrape-like rows. Run from the repo root:
+
+    python benchmarks/format_bench.py                  # 10k, 100k, 1M rows
+    python benchmarks/format_bench.py --rows 50000 --legacy-max 0
+"""
+
+import argparse
+import math
+import os
+import re
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from DBinsert.format import clean, to_insert_tuples  # noqa: E402
+
+AREAS = np.array(["1,000 Sq. Yd.", "5 Marla", "240 Sq. Ft.", "1 Kanal", "-", ""])
+COUNTS = np.array(["3", "2", "-", "", "0", "5", "1"])
+AMENITIES = np.array(
+    [
+        "Built in year: 2025\nParking Spaces",
+        "3 Bedrooms, 2 Bathrooms",
+        "Servant quarters: 1\n4 beds 3 baths",
+        "",
+        "2 br, 1 ba",
+        "Flooring\nElectricity Backup",
+    ]
+)
+LOCATIONS = np.array(
+    ["Cantt, Karachi, Sindh", "Clifton, Karachi, Sindh", "DHA Defence, Lahore"]
+)
+
+
+def synthetic(rows, seed=0):
+    rng = np.random.default_rng(seed)
+
+    def pick(values):
+        return values[rng.integers(0, len(values), rows)]
+
+    return pd.DataFrame(
+        {
+            "prop_type": pick(np.array(["House", "Flat", "Plot", " Shop "])),
+            "purpose": pick(np.array(["For Sale", "For Rent"])),
+            "covered_area": pick(AREAS),
+            "price": rng.integers(1_000_000, 500_000_000, rows),
+            "location": pick(LOCATIONS),
+            "beds": pick(COUNTS),
+            "baths": pick(COUNTS),
+            "amenities": pick(AMENITIES),
+        }
+    )
+
+
+def legacy_clean(df):
+    """STEPS 5-8 as they were, with the per-row imputation loop."""
+    df["covered_area"] = pd.to_numeric(
+        df["covered_area"].astype(str).str.extract(r"([\d\.]+)")[0], errors="coerce"
+    )
+    for col in ("beds", "baths"):
+        df[col] = pd.to_numeric(
+            df[col].astype(str).str.extract(r"(\d+)")[0], errors="coerce"
+        )
+    for col in ("covered_area", "price", "beds", "baths"):
+        df[col] = df[col].replace(["-", "–", "—"], np.nan)
+    for col in ["prop_type", "purpose", "location", "amenities"]:
+        df[col] = df[col].fillna("").astype(str).str.strip()
+    for index, row in df.iterrows():
+        text = (row.get("amenities") or "").lower()
+        for col, pattern in (
+            ("beds", r"(\d+)\s*(?:beds?|br|bedrooms?)"),
+            ("baths", r"(\d+)\s*(?:baths?|ba|bathrooms?)"),
+        ):
+            value = row.get(col)
+            if pd.isna(value) or value == 0:
+                match = re.search(pattern, text)
+                df.at[index, col] = int(match.group(1)) if match else 0
+    for col in ("beds", "baths"):
+        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0).astype(int)
+    return df
+
+
+def legacy_tuples(df):
+    def to_float_safe(v):
+        try:
+            if v in (None, "", "nan"):
+                return None
+            return float(v)
+        except Exception:
+            return None
+
+    def to_int_safe(v):
+        try:
+            if v in (None, "", "nan"):
+                return None
+            return int(float(v))
+        except Exception:
+            return None
+
+    data_tuples = []
+    for _, row in df.iterrows():
+        amenities = row.get("amenities")
+        data_tuples.append(
+            (
+                row.get("prop_type") or None,
+                row.get("purpose") or None,
+                to_float_safe(row.get("covered_area")),
+                to_float_safe(row.get("price")),
+                row.get("location") or None,
+                to_int_safe(row.get("beds")),
+                to_int_safe(row.get("baths")),
+                amenities if amenities not in (None, "", "nan") else "",
+            )
+        )
+    return data_tuples
+
+
+def nan_to_none(row):
+    # The old loop passed NaN floats through; the new one sends NULL.
+    return tuple(None if isinstance(v, float) and math.isnan(v) else v for v in row)
+
+
+def check_equivalence(rows=10_000):
+    old = legacy_clean(synthetic(rows))
+    new = clean(synthetic(rows))
+    assert old.to_csv(index=False) == new.to_csv(index=False), "CSV differs"
+    assert [nan_to_none(r) for r in legacy_tuples(old)] == to_insert_tuples(new)
+    print(f"✅ vectorized output matches the iterrows loops on {rows:,} rows")
+
+
+def timed(fn, df):
+    start = time.perf_counter()
+    result = fn(df)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000]
+    )
+    parser.add_argument(
+        "--legacy-max",
+        type=int,
+        default=100_000,
+        help="only time the iterrows version up to this many rows",
+    )
+    args = parser.parse_args()
+
+    check_equivalence()
+    print(f"{'rows':>10}{'version':>12}{'clean r/s':>14}{'tuples r/s':>14}")
+    for rows in args.rows:
+        versions = [("vectorized", clean, to_insert_tuples)]
+        if rows <= args.legacy_max:
+            versions.append(("iterrows", legacy_clean, legacy_tuples))
+        for label, clean_fn, tuples_fn in versions:
+            df, clean_seconds = timed(clean_fn, synthetic(rows))
+            _, tuple_seconds = timed(tuples_fn, df)
+            print(
+                f"{rows:>10,}{label:>12}"
+                f"{rows / clean_seconds:>14,.0f}{rows / tuple_seconds:>14,.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
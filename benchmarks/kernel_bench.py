@@ -0,0 +1,54 @@
+"""Micro-benchmark: LinearKernel vs model.predict for one and 1000 samples.
+
+Uses the checked-in serving model. Run from the repo root:
+    python benchmarks/kernel_bench.py
+"""
+
+import json
+import os
+import sys
+import timeit
+
+import mlflow.sklearn
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.loader import ModelBundle  # noqa: E402
+
+CACHE_DIR = os.path.join("backend", "model_cache")
+SAMPLE = (1000.0, 3, 2, "Cantt, Karachi, Sindh", "House")
+
+
+def bench(label, fn, number):
+    per_call = min(timeit.repeat(fn, number=number, repeat=5)) / number
+    print(f"{label:<36} {per_call * 1e6:10.1f} µs/call")
+    return per_call
+
+
+def main():
+    model = mlflow.sklearn.load_model(os.path.join(CACHE_DIR, "ZameenPriceModelSale"))
+    with open(os.path.join(CACHE_DIR, "feature_columns.json")) as f:
+        bundle = ModelBundle.build(model, json.load(f)["sale"])
+    encoder = bundle.encoder
+    batch = [SAMPLE] * 1000
+
+    old = bench(
+        "encode + model.predict (1)",
+        lambda: model.predict(bundle.model_input(encoder.encode(*SAMPLE))),
+        200,
+    )
+    new = bench("LinearKernel.predict_one", lambda: bundle.predict_one(*SAMPLE), 100000)
+    old_batch = bench(
+        "encode_batch + model.predict (1000)",
+        lambda: model.predict(bundle.model_input(encoder.encode_batch(batch))),
+        50,
+    )
+    new_batch = bench(
+        "LinearKernel.predict_batch (1000)", lambda: bundle.predict_batch(batch), 200
+    )
+    print(f"speedup (single): {old / new:10.1f}x")
+    print(f"speedup (batch):  {old_batch / new_batch:10.1f}x")
+
+
+if __name__ == "__main__":
+    main()
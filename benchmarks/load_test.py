@@ -0,0 +1,154 @@
+"""Load test: p50/p99 latency of /health and /predict under concurrent clients.
+
+Against a running API:
+
+    python benchmarks/load_test.py --url http://localhost:8000
+
+Self-contained (boots the API with the checked-in model cache and a static
+vocabulary, no MySQL/S3 needed) - run this on two checkouts to compare
+before/after:
+
+    python benchmarks/load_test.py --serve --clients 200 --duration 15
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(ROOT, "backend", "model_cache")
+
+PAYLOAD = {
+    "coveredArea": 1000,
+    "beds": 3,
+    "bathrooms": 2,
+    "location": "Cantt, Karachi, Sindh",
+    "propType": "House",
+}
+
+
+def serve(port):
+    """Run the API in this process with local artifacts instead of S3/MySQL."""
+    sys.path.insert(0, ROOT)
+    import mlflow.sklearn
+    import uvicorn
+
+    import backend.app as api
+    from backend.loader import ModelBundle
+
+    with open(os.path.join(CACHE_DIR, "feature_columns.json")) as f:
+        columns = json.load(f)["sale"]
+    rows = [
+        {"location": c[len("location_") :], "prop_type": "House"}
+        for c in columns
+        if c.startswith("location_")
+    ]
+    local_model = mlflow.sklearn.load_model(
+        os.path.join(CACHE_DIR, "ZameenPriceModelSale")
+    )
+    api.bundle = ModelBundle.build(local_model, columns)
+    api.vocabulary._loader = lambda: rows
+    api.vocabulary.invalidate()
+    uvicorn.run(api.app, host="127.0.0.1", port=port, log_level="warning")
+
+
+def percentile(values, q):
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(q / 100 * (len(values) - 1))))]
+
+
+async def client_loop(client, method, path, deadline, latencies, statuses):
+    while time.perf_counter() < deadline:
+        start = time.perf_counter()
+        try:
+            if method == "POST":
+                response = await client.post(path, json=PAYLOAD)
+            else:
+                response = await client.get(path)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        except httpx.HTTPError as e:
+            statuses[type(e).__name__] = statuses.get(type(e).__name__, 0) + 1
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+async def run_load(url, clients, health_clients, duration):
+    limits = httpx.Limits(max_connections=clients + health_clients)
+    timeout = httpx.Timeout(30.0)
+    async with httpx.AsyncClient(base_url=url, limits=limits, timeout=timeout) as c:
+        await c.get("/health")
+        deadline = time.perf_counter() + duration
+        results = {"/predict": ([], {}), "/health": ([], {})}
+        tasks = [
+            client_loop(c, "POST", "/predict", deadline, *results["/predict"])
+            for _ in range(clients)
+        ] + [
+            client_loop(c, "GET", "/health", deadline, *results["/health"])
+            for _ in range(health_clients)
+        ]
+        await asyncio.gather(*tasks)
+
+    print(f"{clients} /predict clients + {health_clients} /health clients, {duration}s")
+    print(f"{'route':<10}{'requests':>10}{'p50 ms':>10}{'p99 ms':>10}  statuses")
+    for route, (latencies, statuses) in results.items():
+        print(
+            f"{route:<10}{len(latencies):>10}"
+            f"{percentile(latencies, 50) * 1000:>10.1f}"
+            f"{percentile(latencies, 99) * 1000:>10.1f}  {statuses}"
+        )
+
+
+def wait_until_up(url, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(f"{url}/health", timeout=1).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"API at {url} did not come up")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", default="http://127.0.0.1:8765")
+    parser.add_argument("--serve", action="store_true", help="boot a local API")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--health-clients", type=int, default=10)
+    parser.add_argument("--duration", type=float, default=15)
+    parser.add_argument("--_server", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args._server:
+        serve(args.port)
+        return
+
+    server = None
+    if args.serve:
+        args.url = f"http://127.0.0.1:{args.port}"
+        server = subprocess.Popen(
+            [sys.executable, __file__, "--_server", "--port", str(args.port)]
+        )
+    try:
+        wait_until_up(args.url)
+        asyncio.run(
+            run_load(args.url, args.clients, args.health_clients, args.duration)
+        )
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Benchmark: API cold start, import + model load, MLflow model vs serving.npz.
+
+"mlflow" reproduces the old startup: mlflow, mlflow.pyfunc and boto3 imported
+(and the S3 client built) at import time, then ``mlflow.sklearn.load_model``.
+"slim" is the current one: ``backend.app`` alone, then ``artifact.load`` of
+the serving.npz exported from the same checked-in model. Every run is a fresh
+interpreter. Run from the repo root:
+
+    python benchmarks/startup_bench.py --runs 5
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+MODEL_DIR = os.path.join(ROOT, "backend", "model_cache", "ZameenPriceModelSale")
+FEATURES = os.path.join(ROOT, "backend", "model_cache", "feature_columns.json")
+
+CHILD = """
+import json, resource, sys, time
+start = time.perf_counter()
+if {mode!r} == "mlflow":
+    import mlflow, mlflow.pyfunc, boto3
+    boto3.client("s3", region_name="eu-north-1")
+import backend.app
+imported = time.perf_counter()
+if {mode!r} == "mlflow":
+    model = mlflow.sklearn.load_model({model_dir!r})
+else:
+    from backend import artifact
+    model = artifact.load({npz!r})
+loaded = time.perf_counter()
+print(json.dumps({{
+    "import_seconds": imported - start,
+    "load_seconds": loaded - imported,
+    "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "heavy_modules": [m for m in ("mlflow", "sklearn", "pandas", "boto3", "scipy")
+                      if m in sys.modules],
+}}))
+"""
+
+
+def run(mode, npz):
+    code = CHILD.format(mode=mode, model_dir=MODEL_DIR, npz=npz)
+    env = {**os.environ, "MLFLOW_DISABLE_AGENT_HINT": "1"}
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+        env=env,
+        check=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    import mlflow.sklearn
+
+    from backend import artifact
+
+    with open(FEATURES) as f:
+        columns = json.load(f)["sale"]
+    with tempfile.TemporaryDirectory() as tmp:
+        npz = os.path.join(tmp, artifact.ARTIFACT_NAME)
+        artifact.export(npz, mlflow.sklearn.load_model(MODEL_DIR), columns)
+        print(f"serving.npz: {os.path.getsize(npz)} bytes")
+        print(
+            f"{'mode':<7} {'import s':>9} {'load s':>9} {'total s':>9} "
+            f"{'peak RSS MB':>12}  heavy modules"
+        )
+        for mode in ("mlflow", "slim"):
+            results = [run(mode, npz) for _ in range(args.runs)]
+            best = min(results, key=lambda r: r["import_seconds"] + r["load_seconds"])
+            total = best["import_seconds"] + best["load_seconds"]
+            print(
+                f"{mode:<7} {best['import_seconds']:>9.3f} {best['load_seconds']:>9.4f} "
+                f"{total:>9.3f} {best['peak_rss_mb']:>12.0f}  "
+                f"{', '.join(best['heavy_modules']) or '-'}"
+            )
+
+
+if __name__ == "__main__":
+    main()
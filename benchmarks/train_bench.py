@@ -0,0 +1,166 @@
+"""Benchmark: training fit time and peak RSS, dense vs sparse design matrix.
+
+The dense path is the old mlflowserv.py one (``pd.get_dummies`` +
+``LinearRegression`` on a DataFrame); the sparse path is FeatureEncoder's CSR
+matrix + ``mlflowserv.make_model()``. Synthetic sale listings are generated at
+multiples of today's data (748 sale rows, 50 locations, 14 property types).
+Every run is a separate process so peak RSS is its own. Run from the repo root:
+
+    python benchmarks/train_bench.py                 # 1x, 10x, 100x
+    python benchmarks/train_bench.py --scales 10 --memory-limit-mb 2048
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+ROWS, LOCATIONS, PROP_TYPES = 748, 50, 14
+
+
+def synthetic(scale, seed=0):
+    rng = np.random.default_rng(seed)
+    rows, locations = ROWS * scale, LOCATIONS * scale
+    location = rng.integers(0, locations, rows)
+    prop_type = rng.integers(0, PROP_TYPES, rows)
+    covered_area = rng.integers(50, 5000, rows)
+    beds = rng.integers(1, 8, rows)
+    baths = rng.integers(1, 7, rows)
+    location_effect = rng.normal(0, 2e7, locations)
+    price = (
+        covered_area * 20_000.0
+        + beds * 1e6
+        + location_effect[location]
+        + prop_type * 5e5
+        + rng.normal(0, 5e6, rows)
+    )
+    return pd.DataFrame(
+        {
+            "covered_area": covered_area,
+            "beds": beds,
+            "baths": baths,
+            "location": np.char.add("Location ", location.astype(str)),
+            "prop_type": np.char.add("Type ", prop_type.astype(str)),
+            "price": price,
+        }
+    )
+
+
+def fit_dense(sale_data):
+    from sklearn.linear_model import LinearRegression
+
+    start = time.perf_counter()
+    X = pd.concat(
+        [
+            sale_data[["covered_area", "beds", "baths"]],
+            pd.get_dummies(sale_data["location"], prefix="location"),
+            pd.get_dummies(sale_data["prop_type"], prefix="prop_type"),
+        ],
+        axis=1,
+    )
+    encoded = time.perf_counter()
+    LinearRegression().fit(X, sale_data["price"])
+    return X.shape[1], encoded - start, time.perf_counter() - encoded
+
+
+def fit_sparse(sale_data):
+    from backend.encoder import FeatureEncoder
+    from mlflowserv import make_model
+
+    start = time.perf_counter()
+    encoder = FeatureEncoder.fit(sale_data)
+    X = encoder.encode_sparse(sale_data)
+    encoded = time.perf_counter()
+    make_model().fit(X, sale_data["price"].to_numpy(dtype=float))
+    return X.shape[1], encoded - start, time.perf_counter() - encoded
+
+
+def child(path, scale, memory_limit_mb):
+    # Both paths import the same modules so the baseline RSS is comparable.
+    import mlflowserv  # noqa: F401
+    import sklearn.linear_model  # noqa: F401
+
+    if memory_limit_mb:
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    sale_data = synthetic(scale)
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    result = {"path": path, "scale": scale, "rows": len(sale_data)}
+    try:
+        width, encode, fit = (fit_dense if path == "dense" else fit_sparse)(sale_data)
+        result.update(width=width, encode_seconds=encode, fit_seconds=fit)
+    except MemoryError:
+        result["error"] = f"MemoryError (limit {memory_limit_mb} MB)"
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    result.update(baseline_rss_mb=baseline, peak_rss_mb=peak)
+    print(json.dumps(result))
+
+
+def run(path, scale, memory_limit_mb):
+    proc = subprocess.run(
+        [
+            sys.executable,
+            os.path.abspath(__file__),
+            "--child",
+            path,
+            "--scales",
+            str(scale),
+            "--memory-limit-mb",
+            str(memory_limit_mb),
+        ],
+        capture_output=True,
+        text=True,
+        cwd=ROOT,
+    )
+    lines = [line for line in proc.stdout.splitlines() if line.startswith("{")]
+    if proc.returncode != 0 or not lines:
+        return {"path": path, "scale": scale, "error": f"exit {proc.returncode}"}
+    return json.loads(lines[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", default="1,10,100")
+    parser.add_argument(
+        "--memory-limit-mb",
+        type=int,
+        default=4096,
+        help="address-space cap per run, so the dense path fails with "
+        "MemoryError instead of the OOM killer (0 = none)",
+    )
+    parser.add_argument("--child", choices=["dense", "sparse"], help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    scales = [int(s) for s in args.scales.split(",")]
+
+    if args.child:
+        child(args.child, scales[0], args.memory_limit_mb)
+        return
+
+    print(
+        f"{'scale':>5} {'rows':>8} {'path':<6} {'width':>6} {'encode s':>9} "
+        f"{'fit s':>8} {'peak RSS MB':>12} {'(baseline)':>10}"
+    )
+    for scale in scales:
+        for path in ("dense", "sparse"):
+            r = run(path, scale, args.memory_limit_mb)
+            if "error" in r:
+                print(f"{scale:>4}x {r.get('rows', ''):>8} {path:<6} {r['error']}")
+                continue
+            print(
+                f"{scale:>4}x {r['rows']:>8} {path:<6} {r['width']:>6} "
+                f"{r['encode_seconds']:>9.3f} {r['fit_seconds']:>8.3f} "
+                f"{r['peak_rss_mb']:>12.0f} {r['baseline_rss_mb']:>10.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
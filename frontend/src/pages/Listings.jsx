@@ -33,13 +33,12 @@ export default function Listings({ filterLocation }){
     try{
       const url = new URL(API + '/listings')
       url.searchParams.set('limit', limit)
-      const resp = await fetch(url.toString())
-      const data = await resp.json()
-      let filtered = data
       if(selectedLocation){
-        filtered = data.filter(d => d.location === selectedLocation)
+        url.searchParams.set('location', selectedLocation)
       }
-      setListings(filtered)
+      const resp = await fetch(url.toString())
+      const data = await resp.json()
+      setListings(Array.isArray(data) ? data : [])
     }catch(err){
       console.error('fetchListings', err)
     }
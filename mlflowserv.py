@@ -1,20 +1,25 @@
 import mlflow
 import mlflow.sklearn
-from sklearn.linear_model import LinearRegression
-from sklearn.model_selection import train_test_split
+from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+from sklearn.linear_model import Lasso, Ridge
+from sklearn.model_selection import ParameterGrid, train_test_split
 from sklearn.metrics import mean_absolute_error, r2_score
 import pandas as pd
+import argparse
+import joblib
 import json
 import os
+import shutil
+import tempfile
+import time
 import boto3
 from dotenv import load_dotenv
 
+from backend import artifact
+from backend.encoder import FeatureEncoder
+from DBinsert import dataset
+
 load_dotenv()
-print("AWS_ACCESS_KEY_ID:", os.getenv("AWS_ACCESS_KEY_ID"))
-print("AWS_SECRET_ACCESS_KEY:", os.getenv("AWS_SECRET_ACCESS_KEY"))
-session = boto3.Session()
-credentials = session.get_credentials()
-print(credentials.get_frozen_credentials())
 
 
 # ----------------------
@@ -22,18 +27,32 @@ print(credentials.get_frozen_credentials())
 # ----------------------
 S3_BUCKET = "zameen-project"
 S3_MODELS_PREFIX = "zameen_models"
+MODEL_NAME = "ZameenPriceModelSale"
+# What the serving API loads today; skops would refuse the tree models'
+# node arrays unless every loader listed them as trusted types.
+SERIALIZATION_FORMAT = "cloudpickle"
 s3 = boto3.client("s3")  # credentials from environment or IAM role
 
 
 def upload_to_s3(local_path, s3_bucket, s3_key):
-    """Upload a file or directory to S3"""
+    """Upload a file or directory to S3. A directory is mirrored: keys under
+    ``s3_key/`` with no local file (e.g. a previous model's serving.npz) are
+    deleted."""
     if os.path.isdir(local_path):
+        uploaded = set()
         for root, dirs, files in os.walk(local_path):
             for file in files:
                 full_path = os.path.join(root, file)
                 relative_path = os.path.relpath(full_path, local_path)
                 s3_path = os.path.join(s3_key, relative_path)
                 s3.upload_file(full_path, s3_bucket, s3_path)
+                uploaded.add(s3_path)
+        paginator = s3.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=s3_bucket, Prefix=f"{s3_key}/"):
+            for obj in page.get("Contents", []):
+                if obj["Key"] not in uploaded:
+                    s3.delete_object(Bucket=s3_bucket, Key=obj["Key"])
+                    print(f"🗑️ Deleted stale s3://{s3_bucket}/{obj['Key']}")
     else:
         s3.upload_file(local_path, s3_bucket, s3_key)
     print(f"✅ Uploaded {local_path} to s3://{s3_bucket}/{s3_key}")
@@ -42,63 +61,257 @@ def upload_to_s3(local_path, s3_bucket, s3_key):
 # ----------------------
 # Load and preprocess data
 # ----------------------
-df = pd.read_csv("zameen_cleaned.csv")
+DATASET_PATH = "zameen_cleaned.parquet"
+CSV_PATH = "zameen_cleaned.csv"
+TRAINING_COLUMNS = ["covered_area", "beds", "baths", "location", "prop_type", "price"]
+
+
+def load_sale_data(path=None):
+    """Sale listings with the training columns. Reads only the purpose=sale
+    partition of the Parquet dataset written by DBinsert/format.py, falling
+    back to the cleaned CSV when the dataset is missing."""
+    path = path or (DATASET_PATH if os.path.isdir(DATASET_PATH) else CSV_PATH)
+    if os.path.isdir(path):
+        return dataset.read(path, TRAINING_COLUMNS, purpose="sale")
+    df = pd.read_csv(path)
+    # Filter only "for sale" data
+    return df[df["purpose"].str.strip().str.lower() == "for sale"]
 
-# Filter only "for sale" data
-sale_data = df[df["purpose"].str.strip().str.lower() == "for sale"]
 
-# Save valid metadata
-valid_metadata = {
-    "sale": {
-        "locations": sorted(sale_data["location"].dropna().unique().tolist()),
-        "prop_types": sorted(sale_data["prop_type"].dropna().unique().tolist()),
+def valid_metadata_for(sale_data):
+    return {
+        "sale": {
+            "locations": sorted(sale_data["location"].dropna().unique().tolist()),
+            "prop_types": sorted(sale_data["prop_type"].dropna().unique().tolist()),
+        }
     }
-}
-
-with open("valid_metadata.json", "w") as f:
-    json.dump(valid_metadata, f, indent=4)
-
-# One-hot encode locations and property types
-locations_sale = pd.get_dummies(sale_data["location"], prefix="location")
-prop_types_sale = pd.get_dummies(sale_data["prop_type"], prefix="prop_type")
-X_sale = pd.concat(
-    [sale_data[["covered_area", "beds", "baths"]], locations_sale, prop_types_sale],
-    axis=1,
-)
-y_sale = sale_data["price"]
-
-# Train/test split
-X_train_sale, X_test_sale, y_train_sale, y_test_sale = train_test_split(
-    X_sale, y_sale, test_size=0.3, random_state=42
-)
-
-# Save feature columns
-feature_columns = {"sale": list(X_sale.columns)}
-with open("feature_columns.json", "w") as f:
-    json.dump(feature_columns, f, indent=4)
+
+
+def make_model():
+    # Least squares on the sparse matrix. LinearRegression's sparse path runs
+    # lsqr at a fixed, loose tolerance; this matches the old dense
+    # LinearRegression predictions to a few rupees.
+    return Ridge(alpha=1e-8, solver="lsqr", tol=1e-12)
+
+
+def split(sale_data):
+    """The encoder and ``(X_train, X_test, y_train, y_test)``, X as CSR."""
+    encoder = FeatureEncoder.fit(sale_data)
+    X_sale = encoder.encode_sparse(sale_data)
+    y_sale = sale_data["price"].to_numpy(dtype=float)
+
+    # Train/test split
+    return encoder, train_test_split(X_sale, y_sale, test_size=0.3, random_state=42)
+
+
+def train(sale_data):
+    """Fit on a CSR one-hot design matrix. Returns the model, the encoder that
+    built its columns and the held-out MAE / R²."""
+    encoder, (X_train_sale, X_test_sale, y_train_sale, y_test_sale) = split(sale_data)
+
+    model_sale = make_model()
+    model_sale.fit(X_train_sale, y_train_sale)
+    y_pred_sale = model_sale.predict(X_test_sale)
+
+    mae_sale = mean_absolute_error(y_test_sale, y_pred_sale)
+    r2_sale = r2_score(y_test_sale, y_pred_sale)
+    return model_sale, encoder, mae_sale, r2_sale
+
 
 # ----------------------
-# Train Sale Model
+# Sweep
 # ----------------------
-model_sale = LinearRegression()
-model_sale.fit(X_train_sale, y_train_sale)
-y_pred_sale = model_sale.predict(X_test_sale)
-
-mae_sale = mean_absolute_error(y_test_sale, y_pred_sale)
-r2_sale = r2_score(y_test_sale, y_pred_sale)
-
-# Save model locally
-mlflow.sklearn.save_model(model_sale, "ZameenPriceModelSale")
-
-# Upload model and artifacts to S3
-upload_to_s3(
-    "ZameenPriceModelSale", S3_BUCKET, f"{S3_MODELS_PREFIX}/ZameenPriceModelSale"
-)
-upload_to_s3(
-    "feature_columns.json", S3_BUCKET, f"{S3_MODELS_PREFIX}/feature_columns.json"
-)
-upload_to_s3(
-    "valid_metadata.json", S3_BUCKET, f"{S3_MODELS_PREFIX}/valid_metadata.json"
-)
-
-print(f"✅ Sale model trained and uploaded. MAE: {mae_sale:.2f}, R²: {r2_sale:.4f}")
+# (name, estimator class, fixed params, grid). All accept CSR input.
+CANDIDATES = [
+    ("ridge", Ridge, {"solver": "lsqr", "tol": 1e-12}, {"alpha": [1e-8, 1.0, 10.0]}),
+    ("lasso", Lasso, {"max_iter": 20000}, {"alpha": [1e2, 1e4]}),
+    (
+        "random_forest",
+        RandomForestRegressor,
+        {"n_estimators": 200, "random_state": 42},
+        {"max_depth": [None, 12], "min_samples_leaf": [1, 3]},
+    ),
+    (
+        "gradient_boosting",
+        GradientBoostingRegressor,
+        {"n_estimators": 300, "random_state": 42},
+        {"learning_rate": [0.05, 0.1], "max_depth": [3]},
+    ),
+]
+SWEEP_EXPERIMENT = os.getenv("MLFLOW_SWEEP_EXPERIMENT", "zameen-price-sweep")
+# The local store the README's `mlflow server` serves; MLflow's own default
+# (./mlruns) is a file store it no longer writes to.
+TRACKING_URI = os.getenv("MLFLOW_TRACKING_URI", "sqlite:///mlflow.db")
+
+
+def candidate_runs(candidates=None):
+    estimators = {name: cls for name, cls, _, _ in candidates or CANDIDATES}
+    runs = [
+        (name, {**fixed, **params})
+        for name, _, fixed, grid in candidates or CANDIDATES
+        for params in ParameterGrid(grid)
+    ]
+    return estimators, runs
+
+
+def share(directory, **arrays):
+    """Dump arrays (dense or CSR) once; workers reopen them memory-mapped
+    instead of receiving a pickled copy each."""
+    paths = {}
+    for name, value in arrays.items():
+        paths[name] = os.path.join(directory, f"{name}.joblib")
+        joblib.dump(value, paths[name])
+    return paths
+
+
+def fit_candidate(name, estimator, params, paths):
+    data = {key: joblib.load(path, mmap_mode="r") for key, path in paths.items()}
+    model = estimator(**params)
+    start = time.perf_counter()
+    model.fit(data["X_train"], data["y_train"])
+    fit_seconds = time.perf_counter() - start
+    y_pred = model.predict(data["X_test"])
+    return {
+        "name": name,
+        "params": params,
+        "model": model,
+        "mae": mean_absolute_error(data["y_test"], y_pred),
+        "r2": r2_score(data["y_test"], y_pred),
+        "fit_seconds": fit_seconds,
+    }
+
+
+def rank(result):
+    # Lowest MAE first; R² breaks ties.
+    return (result["mae"], -result["r2"])
+
+
+def sweep(sale_data, n_jobs=-1, candidates=None):
+    """Fit every candidate in parallel on one shared split. Returns the
+    encoder and the results, best first."""
+    encoder, (X_train, X_test, y_train, y_test) = split(sale_data)
+    estimators, runs = candidate_runs(candidates)
+    with tempfile.TemporaryDirectory(prefix="sweep-") as directory:
+        paths = share(
+            directory, X_train=X_train, X_test=X_test, y_train=y_train, y_test=y_test
+        )
+        results = joblib.Parallel(n_jobs=n_jobs)(
+            joblib.delayed(fit_candidate)(name, estimators[name], params, paths)
+            for name, params in runs
+        )
+    return encoder, sorted(results, key=rank)
+
+
+def log_sweep(results, encoder, experiment=SWEEP_EXPERIMENT):
+    """One MLflow run per candidate, nested under a sweep run. The best one
+    also gets its model and encoder logged and is tagged ``promoted``."""
+    mlflow.set_experiment(experiment)
+    with mlflow.start_run(run_name="sweep") as parent:
+        for i, result in enumerate(results):
+            with mlflow.start_run(run_name=result["name"], nested=True):
+                mlflow.log_param("estimator", result["name"])
+                mlflow.log_params(result["params"])
+                mlflow.log_metrics(
+                    {
+                        "mae": result["mae"],
+                        "r2": result["r2"],
+                        "fit_seconds": result["fit_seconds"],
+                    }
+                )
+                mlflow.set_tag("promoted", str(i == 0).lower())
+                if i == 0:
+                    mlflow.sklearn.log_model(
+                        result["model"],
+                        name="model",
+                        serialization_format=SERIALIZATION_FORMAT,
+                    )
+                    mlflow.log_dict(
+                        {"sale": encoder.columns}, "model/feature_columns.json"
+                    )
+        best = results[0]
+        mlflow.log_metrics({"best_mae": best["mae"], "best_r2": best["r2"]})
+        mlflow.set_tag("best_estimator", best["name"])
+    return parent.info.run_id
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train and publish the sale model.")
+    parser.add_argument(
+        "--sweep",
+        action="store_true",
+        help="fit every candidate in CANDIDATES in parallel, log each run to "
+        "MLflow and publish the best by MAE (then R²)",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=-1,
+        help="parallel workers for --sweep (default: one per CPU)",
+    )
+    args = parser.parse_args(argv)
+
+    print("AWS_ACCESS_KEY_ID:", os.getenv("AWS_ACCESS_KEY_ID"))
+    print("AWS_SECRET_ACCESS_KEY:", os.getenv("AWS_SECRET_ACCESS_KEY"))
+    session = boto3.Session()
+    credentials = session.get_credentials()
+    print(credentials.get_frozen_credentials())
+
+    sale_data = load_sale_data()
+
+    # Save valid metadata
+    with open("valid_metadata.json", "w") as f:
+        json.dump(valid_metadata_for(sale_data), f, indent=4)
+
+    # ----------------------
+    # Train Sale Model
+    # ----------------------
+    if args.sweep:
+        encoder, results = sweep(sale_data, n_jobs=args.jobs)
+        for result in results:
+            print(
+                f"  {result['name']:<18} MAE {result['mae']:>16,.0f}  "
+                f"R² {result['r2']:>7.4f}  {result['fit_seconds']:6.2f}s  "
+                f"{result['params']}"
+            )
+        mlflow.set_tracking_uri(TRACKING_URI)
+        run_id = log_sweep(results, encoder)
+        best = results[0]
+        model_sale, mae_sale, r2_sale = best["model"], best["mae"], best["r2"]
+        print(f"🏆 Promoting {best['name']} (MLflow sweep run {run_id})")
+    else:
+        model_sale, encoder, mae_sale, r2_sale = train(sale_data)
+
+    # Save model locally, with the encoder inside the model folder so serving
+    # always decodes with the columns this model was trained on. The
+    # top-level feature_columns.json is kept for older API builds.
+    shutil.rmtree(MODEL_NAME, ignore_errors=True)
+    mlflow.sklearn.save_model(
+        model_sale, MODEL_NAME, serialization_format=SERIALIZATION_FORMAT
+    )
+    encoder.to_json(os.path.join(MODEL_NAME, "feature_columns.json"))
+    encoder.to_json("feature_columns.json")
+    # Linear models also get the slim serving.npz the API loads without mlflow.
+    try:
+        artifact.export(
+            os.path.join(MODEL_NAME, artifact.ARTIFACT_NAME),
+            model_sale,
+            encoder.columns,
+            model_uuid=artifact.mlmodel_uuid(MODEL_NAME),
+        )
+    except ValueError as e:
+        print(f"ℹ️ No slim serving artifact ({e}); the API loads the MLflow model.")
+
+    # Upload model and artifacts to S3
+    upload_to_s3(MODEL_NAME, S3_BUCKET, f"{S3_MODELS_PREFIX}/{MODEL_NAME}")
+    upload_to_s3(
+        "feature_columns.json", S3_BUCKET, f"{S3_MODELS_PREFIX}/feature_columns.json"
+    )
+    upload_to_s3(
+        "valid_metadata.json", S3_BUCKET, f"{S3_MODELS_PREFIX}/valid_metadata.json"
+    )
+
+    print(f"✅ Sale model trained and uploaded. MAE: {mae_sale:.2f}, R²: {r2_sale:.4f}")
+
+
+if __name__ == "__main__":
+    main()
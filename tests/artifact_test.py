@@ -0,0 +1,135 @@
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+import mlflow.sklearn
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+import backend.app as api
+from backend import artifact
+from backend.loader import ModelBundle
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+CACHE_DIR = os.path.join(ROOT, "backend", "model_cache")
+SAMPLES = [
+    (1000.0, 3, 2, "Cantt, Karachi, Sindh", "House"),
+    (250.0, 1, 1, "Clifton, Karachi, Sindh", "Flat"),
+    (5000.0, 6, 6, "Unknown Town", "Castle"),
+]
+
+
+@pytest.fixture(scope="module")
+def model():
+    return mlflow.sklearn.load_model(os.path.join(CACHE_DIR, "ZameenPriceModelSale"))
+
+
+@pytest.fixture(scope="module")
+def columns():
+    with open(os.path.join(CACHE_DIR, "feature_columns.json")) as f:
+        return json.load(f)["sale"]
+
+
+def test_roundtrip_predicts_like_sklearn(tmp_path, model, columns):
+    path = str(tmp_path / artifact.ARTIFACT_NAME)
+    artifact.export(path, model, columns)
+    slim = artifact.load(path)
+    assert slim.columns == columns
+
+    original = ModelBundle.build(model, columns, kernel=False)
+    served = ModelBundle.build(slim, slim.columns)
+    assert served.kernel is not None
+    expected = original.predict_batch(SAMPLES)
+    assert np.allclose(served.predict_batch(SAMPLES), expected, rtol=1e-12)
+    fallback = ModelBundle.build(slim, slim.columns, kernel=False)
+    assert np.allclose(fallback.predict_batch(SAMPLES), expected, rtol=1e-12)
+
+
+def test_rejects_tampered_artifact(tmp_path, model, columns):
+    path = str(tmp_path / artifact.ARTIFACT_NAME)
+    artifact.export(path, model, columns)
+    with np.load(path) as data:
+        arrays = dict(data)
+    arrays["coef"] = arrays["coef"] * 2
+    with open(path, "wb") as f:
+        np.savez(f, **arrays)
+    with pytest.raises(ValueError, match="Checksum"):
+        artifact.load(path)
+
+
+def test_non_linear_models_are_not_exported(tmp_path, columns):
+    forest = RandomForestRegressor(n_estimators=2).fit(
+        np.eye(len(columns)), np.arange(len(columns), dtype=float)
+    )
+    with pytest.raises(ValueError):
+        artifact.export(str(tmp_path / "x.npz"), forest, columns)
+    assert not os.listdir(tmp_path)
+
+
+def test_api_loads_slim_artifact_without_mlflow(tmp_path, monkeypatch, model, columns):
+    cache = tmp_path / "model_cache"
+    shutil.copytree(CACHE_DIR, cache)
+    model_dir = cache / api.MODEL_NAME
+    artifact.export(
+        str(model_dir / artifact.ARTIFACT_NAME),
+        model,
+        columns,
+        model_uuid=artifact.mlmodel_uuid(str(model_dir)),
+    )
+    monkeypatch.chdir(tmp_path)
+    loaded, loaded_columns, _ = api.read_model_artifacts()
+    assert isinstance(loaded, artifact.LinearModel)
+    assert loaded_columns == columns
+
+    # A fresh interpreter serving from it never imports the heavy stack.
+    code = (
+        "import sys, backend.app as api; api.read_model_artifacts(); "
+        "print(sorted(m for m in ('mlflow', 'sklearn', 'pandas', 'boto3') "
+        "if m in sys.modules))"
+    )
+    env = {**os.environ, "PYTHONPATH": os.path.abspath(ROOT)}
+    out = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=tmp_path,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert out.stdout.strip().splitlines()[-1] == "[]"
+
+
+def test_stale_artifact_next_to_a_new_model_is_ignored(
+    tmp_path, monkeypatch, model, columns
+):
+    cache = tmp_path / "model_cache"
+    shutil.copytree(CACHE_DIR, cache)
+    model_dir = cache / api.MODEL_NAME
+    stale = tmp_path / artifact.ARTIFACT_NAME
+    artifact.export(
+        str(stale), model, columns, model_uuid=artifact.mlmodel_uuid(str(model_dir))
+    )
+    # A later sweep promoted a forest; the linear run's npz is still synced.
+    forest = RandomForestRegressor(n_estimators=2, random_state=0).fit(
+        np.eye(len(columns)), np.arange(len(columns), dtype=float)
+    )
+    shutil.rmtree(model_dir)
+    mlflow.sklearn.save_model(
+        forest, str(model_dir), serialization_format="cloudpickle"
+    )
+    shutil.copy(stale, model_dir / artifact.ARTIFACT_NAME)
+
+    monkeypatch.chdir(tmp_path)
+    loaded, _, _ = api.read_model_artifacts()
+    assert isinstance(loaded, RandomForestRegressor)
+
+
+def test_artifact_without_a_model_uuid_is_ignored(tmp_path, model, columns):
+    artifact.export(str(tmp_path / artifact.ARTIFACT_NAME), model, columns)
+    shutil.copy(
+        os.path.join(CACHE_DIR, api.MODEL_NAME, "MLmodel"), tmp_path / "MLmodel"
+    )
+    assert artifact.load_if_current(str(tmp_path)) is None
@@ -1,6 +1,6 @@
 import pytest
 from fastapi.testclient import TestClient
-from backend.app import app, load_model, model as m
+from backend.app import app, load_model, model_loader
 
 client = TestClient(app)
 
@@ -58,7 +58,10 @@ def model_resources():
     return m, sale_feature_columns, valid_metadata
 
 
-skip_if_no_model = pytest.mark.skipif(m is None, reason="MLflow model not loaded")
+# The model loads in the background; wait for the first attempt to finish.
+skip_if_no_model = pytest.mark.skipif(
+    not model_loader.wait(timeout=300), reason="MLflow model not loaded"
+)
 
 
 @skip_if_no_model
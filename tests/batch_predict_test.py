@@ -0,0 +1,198 @@
+import copy
+import dataclasses
+import json
+import os
+
+import mlflow.sklearn
+import pytest
+from fastapi.testclient import TestClient
+
+import backend.app as api
+from backend.batcher import BATCH_SIZE
+from backend.executors import Overloaded
+from backend.loader import ModelBundle
+from backend.snapshot_cache import SnapshotCache
+
+CACHE_DIR = os.path.join(os.path.dirname(__file__), "..", "backend", "model_cache")
+
+VALID = {
+    "coveredArea": 1000,
+    "beds": 3,
+    "bathrooms": 2,
+    "location": "Cantt, Karachi, Sindh",
+    "propType": "House",
+}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """API wired to the checked-in model cache and a fixed vocabulary."""
+    local_model = mlflow.sklearn.load_model(
+        os.path.join(CACHE_DIR, "ZameenPriceModelSale")
+    )
+    with open(os.path.join(CACHE_DIR, "feature_columns.json")) as f:
+        columns = json.load(f)["sale"]
+    rows = [
+        {"location": c[len("location_") :], "prop_type": "House"}
+        for c in columns
+        if c.startswith("location_")
+    ]
+    monkeypatch.setattr(api, "bundle", ModelBundle.build(local_model, columns))
+    monkeypatch.setattr(api, "vocabulary", SnapshotCache(lambda: rows))
+    return TestClient(api.app)
+
+
+def test_batch_matches_single_predictions(client):
+    other = {**VALID, "coveredArea": 240, "location": "Clifton, Karachi, Sindh"}
+    response = client.post("/predict/batch", json=[VALID, other])
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == 2 and body["errors"] == 0
+    for item, result in zip([VALID, other], body["results"]):
+        single = client.post("/predict", json=item).json()
+        assert result["prediction"] == pytest.approx(single["prediction"])
+
+
+def test_batch_reports_per_item_errors(client):
+    bad_location = {**VALID, "location": "Atlantis"}
+    bad_schema = {**VALID, "beds": "three"}
+    response = client.post("/predict/batch", json=[bad_location, VALID, bad_schema])
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert "Invalid location" in results[0]["error"]
+    assert "prediction" in results[1]
+    assert results[2]["index"] == 2 and "beds" in results[2]["error"]
+
+
+def test_batch_rejects_oversized_requests(client, monkeypatch):
+    monkeypatch.setattr(api, "BATCH_MAX_ITEMS", 1)
+    response = client.post("/predict/batch", json=[VALID, VALID])
+    assert response.status_code == 413
+
+
+def test_stream_scores_ndjson_in_chunks(client, monkeypatch):
+    monkeypatch.setattr(api, "STREAM_CHUNK_SIZE", 2)
+    lines = [json.dumps(VALID), "{not json", json.dumps({**VALID, "propType": "Ufo"})]
+    response = client.post(
+        "/predict/stream",
+        content="\n".join(lines * 2),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    assert response.status_code == 200
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["index"] for r in results] == list(range(6))
+    assert "prediction" in results[0] and "prediction" in results[3]
+    assert "Invalid input" in results[1]["error"]
+    assert "Invalid property type" in results[5]["error"]
+
+
+def test_predict_serves_repeated_inputs_from_cache(client, monkeypatch):
+    monkeypatch.setattr(api, "prediction_cache", api.ResultCache(max_entries=10))
+    first = client.post("/predict", json=VALID).json()
+    # Same input modulo number formatting and the non-feature purpose field.
+    second = client.post(
+        "/predict", json={**VALID, "coveredArea": 1000.0, "purpose": "rent"}
+    ).json()
+    assert first == second
+    stats = api.prediction_cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+
+    api.publish_model(api.bundle)
+    assert api.prediction_cache.stats()["entries"] == 0
+
+
+def test_coalesced_predictions_match_direct_ones(client, monkeypatch):
+    single = client.post("/predict", json=VALID).json()
+    api.prediction_cache.clear()
+    # No kernel, so /predict goes through the batcher.
+    monkeypatch.setattr(api, "bundle", dataclasses.replace(api.bundle, kernel=None))
+    monkeypatch.setattr(api, "PREDICT_BATCHING", True)
+    batches = BATCH_SIZE.snapshot(batcher="predict")[0]
+    response = client.post("/predict", json=VALID)
+    assert response.status_code == 200
+    assert BATCH_SIZE.snapshot(batcher="predict")[0] == batches + 1
+    assert response.json()["prediction"] == pytest.approx(single["prediction"])
+
+
+def test_metrics_break_predict_down_by_stage(client):
+    client.post("/predict", json=VALID)
+    body = client.get("/metrics").text
+    assert 'http_request_duration_seconds_count{method="POST",route="/predict"' in body
+    for stage in ("vocabulary", "cache_lookup", "inference"):
+        assert f'request_stage_seconds_count{{stage="{stage}",pid=' in body
+
+
+def test_non_object_items_are_reported_per_item(client):
+    response = client.post("/predict/batch", json=[VALID, 5, "x", None])
+    assert response.status_code == 200
+    body = response.json()
+    assert body["count"] == 4 and body["errors"] == 3
+    assert "prediction" in body["results"][0]
+    for i, result in enumerate(body["results"][1:], start=1):
+        assert result["index"] == i and "Invalid input" in result["error"]
+
+
+@pytest.mark.parametrize("area", ["NaN", "Infinity", "-Infinity"])
+def test_non_finite_inputs_are_rejected_everywhere(client, area):
+    bad = {**VALID, "coveredArea": area}
+    assert client.post("/predict", json=bad).status_code == 422
+
+    response = client.post("/predict/batch", json=[VALID, bad])
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert "prediction" in results[0] and "coveredArea" in results[1]["error"]
+
+    response = client.post(
+        "/predict/stream",
+        content=json.dumps(VALID) + "\n" + json.dumps(bad),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert "prediction" in results[0] and "coveredArea" in results[1]["error"]
+
+
+def test_non_finite_predictions_are_not_cached(client, monkeypatch):
+    monkeypatch.setattr(api, "prediction_cache", api.ResultCache(max_entries=10))
+    kernel = copy.copy(api.bundle.kernel)
+    monkeypatch.setattr(kernel, "intercept", float("inf"))
+    monkeypatch.setattr(api, "bundle", dataclasses.replace(api.bundle, kernel=kernel))
+    response = client.post("/predict", json=VALID)
+    assert response.status_code == 500
+    assert "Prediction failed" in response.json()["detail"]
+    assert api.prediction_cache.stats()["entries"] == 0
+
+
+def test_json_encoded_string_items_are_not_parsed(client):
+    response = client.post("/predict/batch", json=[json.dumps(VALID)])
+    result = response.json()["results"][0]
+    assert "prediction" not in result
+    assert "valid dictionary" in result["error"]
+
+
+class FullExecutor:
+    """Accepts the first ``accept`` tasks, then reports a full queue."""
+
+    def __init__(self, accept):
+        self.accept = accept
+
+    async def run(self, fn, *args):
+        if self.accept == 0:
+            raise Overloaded("inference", 0)
+        self.accept -= 1
+        return fn(*args)
+
+
+def test_stream_is_backpressured_by_the_inference_executor(client, monkeypatch):
+    monkeypatch.setattr(api, "STREAM_CHUNK_SIZE", 1)
+    body = "\n".join([json.dumps(VALID)] * 3)
+    headers = {"Content-Type": "application/x-ndjson"}
+
+    monkeypatch.setattr(api, "inference_executor", FullExecutor(accept=0))
+    response = client.post("/predict/stream", content=body, headers=headers)
+    assert response.status_code == 503
+
+    monkeypatch.setattr(api, "inference_executor", FullExecutor(accept=1))
+    response = client.post("/predict/stream", content=body, headers=headers)
+    results = [json.loads(line) for line in response.text.splitlines()]
+    assert "prediction" in results[0]
+    assert results[1]["index"] == 1 and "Server busy" in results[1]["error"]
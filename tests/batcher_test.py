@@ -0,0 +1,88 @@
+import asyncio
+
+import pytest
+
+from backend.batcher import BATCH_SIZE, MicroBatcher
+
+
+class FakeBundle:
+    def __init__(self, offset=0.0):
+        self.offset = offset
+        self.calls = []
+
+    def predict_batch(self, samples):
+        self.calls.append(list(samples))
+        return [sample[0] + self.offset for sample in samples]
+
+
+async def run_inline(fn, *args):
+    return fn(*args)
+
+
+def sample(area):
+    return (area, 3, 2, "Cantt, Karachi, Sindh", "House")
+
+
+def test_coalesces_concurrent_requests_into_one_call():
+    batcher = MicroBatcher("coalesce", run_inline, max_batch_size=32, max_wait=0.01)
+    bundle = FakeBundle()
+
+    async def main():
+        return await asyncio.gather(
+            *(batcher.predict(bundle, sample(area)) for area in range(5))
+        )
+
+    assert asyncio.run(main()) == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert len(bundle.calls) == 1 and len(bundle.calls[0]) == 5
+    assert BATCH_SIZE.snapshot(batcher="coalesce") == (1, 5.0)
+
+
+def test_flushes_as_soon_as_the_batch_is_full():
+    # A window far longer than the test: only the size cap can flush.
+    batcher = MicroBatcher("full", run_inline, max_batch_size=2, max_wait=60)
+    bundle = FakeBundle()
+
+    async def main():
+        return await asyncio.wait_for(
+            asyncio.gather(*(batcher.predict(bundle, sample(a)) for a in range(4))),
+            timeout=5,
+        )
+
+    assert asyncio.run(main()) == [0.0, 1.0, 2.0, 3.0]
+    assert [len(call) for call in bundle.calls] == [2, 2]
+
+
+def test_never_mixes_bundles_in_one_call():
+    batcher = MicroBatcher("swap", run_inline, max_wait=0.01)
+    old, new = FakeBundle(), FakeBundle(offset=100.0)
+
+    async def main():
+        return await asyncio.gather(
+            batcher.predict(old, sample(1)),
+            batcher.predict(new, sample(1)),
+            batcher.predict(old, sample(2)),
+        )
+
+    assert asyncio.run(main()) == [1.0, 101.0, 2.0]
+    assert len(old.calls) == 1 and len(new.calls) == 1
+
+
+def test_batch_failure_reaches_every_caller():
+    class Broken:
+        def predict_batch(self, samples):
+            raise RuntimeError("boom")
+
+    batcher = MicroBatcher("broken", run_inline, max_wait=0.001)
+
+    async def main():
+        return await asyncio.gather(
+            *(batcher.predict(Broken(), sample(a)) for a in range(3)),
+            return_exceptions=True,
+        )
+
+    assert all(isinstance(r, RuntimeError) for r in asyncio.run(main()))
+
+
+def test_rejects_invalid_sizes():
+    with pytest.raises(ValueError):
+        MicroBatcher("bad", run_inline, max_batch_size=0)
@@ -0,0 +1,151 @@
+import csv
+import re
+import sqlite3
+
+import pytest
+
+from DBinsert import bulkload
+
+ROWS = [
+    ("House", "For Sale", 1000.0, 5000000.0, "Cantt, Karachi, Sindh", 3, 2, ""),
+    (None, "For Rent", None, None, "Clifton, Karachi, Sindh", None, 1, 'say "hi"'),
+    ("Flat", None, 240.5, 120000.0, None, 2, None, "line one\nline two"),
+]
+
+
+class SqliteConnection:
+    """The slice of a mysql.connector connection the loaders use, on SQLite."""
+
+    def __init__(self):
+        self.db = sqlite3.connect(":memory:")
+        self.db.execute(
+            "CREATE TABLE property_data (id INTEGER PRIMARY KEY, prop_type TEXT, "
+            "purpose TEXT, covered_area REAL, price REAL, location TEXT, "
+            "beds INTEGER, baths INTEGER, amenities TEXT)"
+        )
+
+    def cursor(self):
+        db = self.db
+
+        class Cursor:
+            def execute(self, sql, params=()):
+                db.execute(sql.replace("%s", "?"), params)
+
+            def executemany(self, sql, rows):
+                db.executemany(sql.replace("%s", "?"), rows)
+
+            def close(self):
+                pass
+
+        return Cursor()
+
+    def commit(self):
+        self.db.commit()
+
+    def rollback(self):
+        self.db.rollback()
+
+    def rows(self):
+        columns = ", ".join(bulkload.COLUMNS)
+        return self.db.execute(f"SELECT {columns} FROM property_data").fetchall()
+
+
+@pytest.mark.parametrize("strategy", ["multirow", "executemany"])
+def test_insert_strategies_load_identical_rows(strategy):
+    conn = SqliteConnection()
+    report = bulkload.load(conn, ROWS * 5, strategy, batch_size=4)
+    assert conn.rows() == ROWS * 5
+    assert report.strategy == strategy and report.rows == 15
+    assert "rows/s" in str(report)
+
+
+def test_failed_load_rolls_back_the_whole_batch():
+    conn = SqliteConnection()
+    with pytest.raises(sqlite3.Error):
+        bulkload.load(conn, ROWS + [("too", "short")], "multirow", batch_size=2)
+    assert conn.rows() == []
+
+
+class RecordingConnection:
+    def __init__(self, fail_load_data=False, indexes=("idx_price",)):
+        self.fail_load_data = fail_load_data
+        self.indexes = {"PRIMARY", *indexes}
+        self.statements = []
+        self.loaded_csv = None
+        self.commits = 0
+        self.rollbacks = 0
+
+    def cursor(self):
+        conn = self
+
+        class Cursor:
+            def execute(self, sql, params=()):
+                conn.statements.append(sql)
+                if sql.startswith("LOAD DATA"):
+                    if conn.fail_load_data:
+                        raise RuntimeError("Loading local data is disabled")
+                    with open(params[0], newline="", encoding="utf-8") as f:
+                        conn.loaded_csv = list(csv.reader(f))
+                for action, name in re.findall(r"(DROP|ADD) INDEX (\w+)", sql):
+                    if action == "DROP":
+                        conn.indexes.discard(name)
+                    else:
+                        conn.indexes.add(name)
+
+            def fetchall(self):
+                return [("property_data", 1, name) for name in sorted(conn.indexes)]
+
+            def close(self):
+                pass
+
+        return Cursor()
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def test_load_data_writes_quoted_csv_with_nulls():
+    conn = RecordingConnection()
+    report = bulkload.load(conn, ROWS, "load-data")
+    assert report.strategy == "load-data" and conn.commits == 1
+    assert conn.loaded_csv[1] == [
+        "",
+        "For Rent",
+        "",
+        "",
+        "Clifton, Karachi, Sindh",
+        "",
+        "1",
+        'say "hi"',
+    ]
+    assert conn.loaded_csv[2][-1] == "line one\nline two"
+    assert "NULLIF(@price, '')" in conn.statements[0]
+
+
+def test_load_data_falls_back_to_multirow():
+    conn = RecordingConnection(fail_load_data=True)
+    report = bulkload.load(conn, ROWS, "load-data")
+    assert report.strategy == "multirow"
+    assert conn.rollbacks == 1 and conn.commits == 1
+    assert conn.statements[-1].startswith("INSERT INTO property_data")
+
+
+def test_deferred_indexes_drops_and_rebuilds_existing_secondary_indexes():
+    conn = RecordingConnection(indexes=bulkload.SECONDARY_INDEXES)
+    with bulkload.deferred_indexes(conn) as deferred:
+        assert deferred == list(bulkload.SECONDARY_INDEXES)
+        assert conn.indexes == {"PRIMARY"}
+    assert conn.indexes == {"PRIMARY", *bulkload.SECONDARY_INDEXES}
+    alters = [s for s in conn.statements if s.startswith("ALTER")]
+    assert len(alters) == 2
+
+
+def test_deferred_indexes_restores_indexes_a_killed_run_left_dropped():
+    # A previous run died mid-load: only idx_price survived.
+    conn = RecordingConnection(indexes=("idx_price",))
+    with bulkload.deferred_indexes(conn) as deferred:
+        assert deferred == ["idx_price"]
+    assert conn.indexes == {"PRIMARY", *bulkload.SECONDARY_INDEXES}
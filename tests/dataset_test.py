@@ -0,0 +1,39 @@
+import os
+
+import pandas as pd
+
+from DBinsert import dataset
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+
+def test_partition_keys():
+    purposes = pd.Series(["For Sale", " for rent ", "", None])
+    assert dataset.purpose_key(purposes).tolist() == [
+        "sale",
+        "rent",
+        "unknown",
+        "unknown",
+    ]
+    locations = pd.Series(["Clifton, Karachi, Sindh", "Lahore", None])
+    assert dataset.city_of(locations).tolist() == ["Karachi", "Lahore", "unknown"]
+
+
+def test_roundtrip_reads_only_requested_partition_and_columns(tmp_path):
+    cleaned = pd.read_csv(os.path.join(ROOT, "zameen_cleaned.csv"))
+    root = str(tmp_path / "cleaned.parquet")
+    dataset.write(cleaned.iloc[:500], root, part=0)
+    dataset.write(cleaned.iloc[500:], root, part=1)
+    assert sorted(os.listdir(root)) == ["purpose=rent", "purpose=sale"]
+
+    sale = dataset.read(
+        root, ["location", "prop_type", "price", "beds"], purpose="sale"
+    )
+    assert list(sale.columns) == ["location", "prop_type", "price", "beds"]
+    assert len(sale) == (cleaned["purpose"] == "For Sale").sum()
+    assert isinstance(sale["location"].dtype, pd.CategoricalDtype)
+    assert str(sale["beds"].dtype) == "int16"
+
+    # Rewriting a part replaces its files instead of duplicating rows.
+    dataset.write(cleaned.iloc[500:], root, part=1)
+    assert len(dataset.read(root, ["price"])) == len(cleaned)
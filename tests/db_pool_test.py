@@ -0,0 +1,123 @@
+import threading
+
+import pytest
+
+from backend.db import (
+    DB_QUERY,
+    POOL_CHECKOUTS,
+    POOL_CONNECT,
+    ConnectionPool,
+    PoolTimeout,
+)
+
+
+class FakeConnection:
+    def __init__(self):
+        self.closed = False
+        self.alive = True
+        self.in_transaction = False
+        self.rollbacks = 0
+
+    def ping(self, reconnect=False):
+        if not self.alive:
+            raise ConnectionError("gone away")
+
+    def rollback(self):
+        self.rollbacks += 1
+        self.in_transaction = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_pool(**kwargs):
+    opened = []
+
+    def connect():
+        conn = FakeConnection()
+        opened.append(conn)
+        return conn
+
+    return ConnectionPool(connect, **kwargs), opened
+
+
+def test_reuses_idle_connection():
+    pool, opened = make_pool(size=2, name="reuse")
+    with pool.connection() as first:
+        pass
+    with pool.connection() as second:
+        pass
+    assert first is second
+    assert len(opened) == 1
+    assert POOL_CHECKOUTS.value(pool="reuse") == 2
+
+
+def test_times_out_when_exhausted():
+    pool, _ = make_pool(size=1, timeout=0.05, name="exhausted")
+    held = pool.acquire()
+    with pytest.raises(PoolTimeout):
+        pool.acquire()
+    pool.release(held)
+    with pool.connection():
+        pass
+
+
+def test_bounded_under_concurrency():
+    pool, opened = make_pool(size=3, name="bounded")
+    barrier = threading.Barrier(6)
+
+    def worker():
+        barrier.wait()
+        for _ in range(20):
+            with pool.connection():
+                pass
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(opened) <= 3
+    assert pool.stats()["in_use"] == 0
+
+
+def test_recycles_stale_and_dead_connections():
+    clock = FakeClock()
+    pool, opened = make_pool(recycle=60, ping_after=1, clock=clock, name="recycle")
+    with pool.connection():
+        pass
+    clock.now = 61
+    with pool.connection() as conn:
+        assert conn is opened[1]
+    assert opened[0].closed
+
+    conn.alive = False
+    clock.now = 70
+    with pool.connection() as replacement:
+        assert replacement is opened[2]
+    assert opened[1].closed
+
+
+def test_rolls_back_open_transaction_on_release():
+    pool, opened = make_pool(name="rollback")
+    with pool.connection() as conn:
+        conn.in_transaction = True
+    assert conn.rollbacks == 1
+
+
+def test_records_connect_and_labelled_query_times():
+    pool, _ = make_pool(size=1, name="timed")
+    with pool.connection(query="listings"):
+        pass
+    with pool.connection():
+        pass
+    assert POOL_CONNECT.snapshot(pool="timed")[0] == 1
+    assert DB_QUERY.snapshot(pool="timed", query="listings")[0] == 1
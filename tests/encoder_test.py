@@ -0,0 +1,77 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.encoder import FeatureEncoder
+
+FEATURES = os.path.join(
+    os.path.dirname(__file__), "..", "backend", "model_cache", "feature_columns.json"
+)
+
+
+def pandas_encode(columns, covered_area, beds, baths, location, prop_type):
+    # Reference: the get_dummies + align logic predict_price used to run.
+    base_df = pd.DataFrame(
+        [[covered_area, beds, baths]], columns=["covered_area", "beds", "baths"]
+    )
+    loc_df = pd.get_dummies(pd.Series([location]), prefix="location")
+    prop_df = pd.get_dummies(pd.Series([prop_type]), prefix="prop_type")
+    input_df = pd.concat([base_df, loc_df, prop_df], axis=1)
+    for col in columns:
+        if col not in input_df.columns:
+            input_df[col] = 0
+    return input_df[columns].to_numpy(dtype=float)
+
+
+@pytest.fixture(scope="module")
+def encoder():
+    return FeatureEncoder.from_json(FEATURES)
+
+
+def test_matches_pandas_alignment_for_every_category(encoder):
+    locations = list(encoder.location_idx) + ["Unknown Town, Karachi, Sindh"]
+    prop_types = list(encoder.prop_type_idx) + ["Castle"]
+    for location in locations:
+        for prop_type in prop_types:
+            sample = (1250.5, 4, 3, location, prop_type)
+            expected = pandas_encode(encoder.columns, *sample)
+            assert np.array_equal(encoder.encode(*sample), expected)
+
+
+def test_to_frame_keeps_training_column_order(encoder):
+    frame = encoder.to_frame(encoder.encode(100.0, 1, 1, "x", "y"))
+    assert list(frame.columns) == encoder.columns
+
+
+def test_rejects_columns_without_numeric_features():
+    with pytest.raises(ValueError):
+        FeatureEncoder(["location_A", "prop_type_B"])
+
+
+def test_fit_matches_get_dummies_order(encoder):
+    frame = pd.DataFrame(
+        {
+            "location": [name for name in encoder.location_idx][::-1],
+            "prop_type": [
+                list(encoder.prop_type_idx)[i % len(encoder.prop_type_idx)]
+                for i in range(len(encoder.location_idx))
+            ],
+        }
+    )
+    assert FeatureEncoder.fit(frame).columns == encoder.columns
+
+
+def test_encode_sparse_matches_dense_batch(encoder):
+    samples = [
+        (1250.5, 4, 3, location, prop_type)
+        for location in list(encoder.location_idx)[:5] + ["Unknown Town"]
+        for prop_type in list(encoder.prop_type_idx)[:3] + ["Castle"]
+    ]
+    frame = pd.DataFrame(
+        samples, columns=["covered_area", "beds", "baths", "location", "prop_type"]
+    )
+    X = encoder.encode_sparse(frame)
+    assert X.format == "csr"
+    assert np.array_equal(X.toarray(), encoder.encode_batch(samples))
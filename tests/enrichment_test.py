@@ -0,0 +1,230 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from DBinsert import insertsentiments
+from DBinsert.enrichment import TokenBucket, backoff_delay, call_with_backoff, enrich
+from DBinsert.response_cache import ResponseCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+def test_token_bucket_allows_burst_then_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, burst=2, clock=clock, sleep=clock.sleep)
+    for _ in range(4):
+        bucket.acquire()
+    # 2 from the burst, then one every 0.5s
+    assert clock.now == pytest.approx(1.0)
+
+
+def test_backoff_is_exponential_capped_and_jittered():
+    assert [backoff_delay(a, base=1, cap=5, rng=lambda: 1.0) for a in (1, 2, 3, 4)] == [
+        1,
+        2,
+        4,
+        5,
+    ]
+    assert backoff_delay(3, base=1, cap=5, rng=lambda: 0.5) == 2
+
+
+def test_call_with_backoff_retries_then_gives_up():
+    calls, delays = [], []
+
+    def flaky(x):
+        calls.append(x)
+        if len(calls) < 3:
+            raise RuntimeError("429")
+        return x * 2
+
+    assert call_with_backoff(flaky, 21, retries=3, sleep=delays.append) == 42
+    assert len(delays) == 2
+
+    def always_fails():
+        raise RuntimeError("500")
+
+    with pytest.raises(RuntimeError):
+        call_with_backoff(always_fails, retries=2, sleep=delays.append)
+    assert len(delays) == 4
+
+
+class FakeLLM:
+    """Stands in for the Gemini client: fixed latency, optional failures."""
+
+    def __init__(self, latency=0.05, fail_times=None):
+        self.latency = latency
+        self.fail_times = dict(fail_times or {})
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+        self.models = SimpleNamespace(generate_content=self.generate_content)
+
+    def generate_content(self, model, contents):
+        location = contents.split('"')[1]
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            failing = self.fail_times.get(location, 0) > 0
+            if failing:
+                self.fail_times[location] -= 1
+        try:
+            time.sleep(self.latency)
+            if failing:
+                raise RuntimeError("429 Resource exhausted")
+            return SimpleNamespace(
+                text=f"water: Good\nsafety: Fair\nexplain: {location}"
+            )
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def test_enrich_runs_concurrently_and_batches_writes():
+    llm = FakeLLM(latency=0.05)
+    batches = []
+    items = [f"loc{i}" for i in range(40)]
+    start = time.perf_counter()
+    stats = enrich(
+        items,
+        lambda loc: insertsentiments.get_sentiment_from_gemini(llm, loc),
+        lambda batch: batches.append(batch) or len(batch),
+        concurrency=8,
+        rate=1000,
+        batch_size=15,
+    )
+    elapsed = time.perf_counter() - start
+    # sequential would be 40 * 50ms = 2s
+    assert elapsed < 1.0
+    assert llm.max_in_flight == 8
+    assert stats["ok"] == 40 and stats["failed"] == 0
+    assert [len(b) for b in batches] == [15, 15, 10]
+
+
+def test_enrich_retries_failures_without_blocking_others():
+    llm = FakeLLM(latency=0.01, fail_times={"loc0": 2, "loc1": 10})
+    written = []
+    stats = enrich(
+        [f"loc{i}" for i in range(6)],
+        lambda loc: insertsentiments.get_sentiment_from_gemini(llm, loc),
+        lambda batch: written.extend(batch) or len(batch),
+        concurrency=3,
+        rate=1000,
+        retries=2,
+        backoff_base=0.01,
+    )
+    assert stats["ok"] == 5 and list(stats["errors"]) == ["loc1"]
+    assert "loc0" in {loc for loc, _ in written}
+
+
+def test_enrich_counts_rows_the_writer_could_not_save_as_failed():
+    stats = enrich(
+        [f"loc{i}" for i in range(5)],
+        lambda loc: {"water": 0.5},
+        lambda batch: len(batch) - 1,  # one row per batch rejected by the DB
+        concurrency=2,
+        rate=1000,
+        batch_size=3,
+    )
+    assert stats["ok"] == 3 and stats["failed"] == 2
+
+
+class RecordingConnection:
+    def __init__(self, locations, reject=()):
+        self.locations = locations
+        self.reject = set(reject)
+        self.written = []
+        self.statements = 0
+        self.selects = []
+
+    def cursor(self):
+        conn = self
+
+        class Cursor:
+            def execute(self, sql, params=()):
+                if sql.strip().startswith("SELECT"):
+                    conn.selects.append((sql, params))
+                    return
+                conn.statements += 1
+                rows = [tuple(params[i : i + 7]) for i in range(0, len(params), 7)]
+                if any(row[0] in conn.reject for row in rows):
+                    raise ValueError("Check constraint violated")
+                conn.pending = rows
+
+            def fetchall(self):
+                return [(loc,) for loc in conn.locations]
+
+            def close(self):
+                pass
+
+        return Cursor()
+
+    def commit(self):
+        self.written += self.pending
+
+    def rollback(self):
+        self.pending = []
+
+
+def test_run_writes_batches_and_isolates_bad_rows():
+    conn = RecordingConnection([f"loc{i}" for i in range(5)], reject={"loc3"})
+    stats = insertsentiments.run(
+        conn, FakeLLM(latency=0), concurrency=2, rate=1000, batch_size=5
+    )
+    assert stats["ok"] == 4 and stats["failed"] == 1
+    assert sorted(row[0] for row in conn.written) == ["loc0", "loc1", "loc2", "loc4"]
+    assert conn.written[0][1] == "Good" and conn.written[0][5] == "Fair"
+    # one rejected batch statement, then one statement per row
+    assert conn.statements == 6
+
+
+def test_response_cache_round_trip_and_expiry(tmp_path):
+    clock = FakeClock()
+    cache = ResponseCache(str(tmp_path), clock=clock)
+    assert cache.get("m", "prompt") is None
+    cache.put("m", "prompt", "water: Good")
+    assert cache.get("m", "prompt") == "water: Good"
+    assert cache.get("other-model", "prompt") is None
+    clock.now = 100
+    assert cache.get("m", "prompt", max_age=50) is None
+    assert cache.get("m", "prompt") == "water: Good"
+
+
+def test_run_asks_only_for_stale_locations():
+    conn = RecordingConnection(["loc0"])
+    insertsentiments.run(conn, FakeLLM(latency=0), max_age_days=7, rate=1000)
+    sql, params = conn.selects[0]
+    assert "LEFT JOIN location_sentiments" in sql and "s.location IS NULL" in sql
+    assert params == (7 * 86400,)
+
+
+def test_cached_responses_skip_the_api_and_can_be_replayed(tmp_path):
+    cache = ResponseCache(str(tmp_path))
+    cache.put(
+        insertsentiments.MODEL, insertsentiments.build_prompt("loc0"), "water: Poor"
+    )
+    llm = FakeLLM(latency=0)
+    conn = RecordingConnection(["loc0", "loc1"])
+    stats = insertsentiments.run(conn, llm, cache=cache, rate=1000)
+    assert llm.calls == 1 and stats["cached"] == 1
+    assert dict((row[0], row[1]) for row in conn.written) == {
+        "loc0": "Poor",
+        "loc1": "Good",
+    }
+
+    # Replay re-parses both cached responses with no client at all.
+    replayed = RecordingConnection(["loc0", "loc1"])
+    assert insertsentiments.replay(replayed, cache) == 2
+    assert len(replayed.written) == 2
@@ -0,0 +1,39 @@
+import asyncio
+import threading
+
+import pytest
+
+from backend.executors import EXECUTOR_REJECTED, BoundedExecutor, Overloaded
+
+
+def test_runs_work_off_the_event_loop_thread():
+    executor = BoundedExecutor("offloop", workers=2, max_pending=4)
+
+    async def main():
+        return await executor.run(threading.get_ident)
+
+    assert asyncio.run(main()) != threading.get_ident()
+    executor.shutdown()
+
+
+def test_rejects_work_past_queue_depth():
+    executor = BoundedExecutor("full", workers=1, max_pending=2)
+    release = threading.Event()
+
+    async def main():
+        blocked = [asyncio.ensure_future(executor.run(release.wait)) for _ in range(2)]
+        await asyncio.sleep(0.05)
+        with pytest.raises(Overloaded):
+            await executor.run(lambda: None)
+        release.set()
+        await asyncio.gather(*blocked)
+        assert executor.pending == 0
+
+    asyncio.run(main())
+    assert EXECUTOR_REJECTED.value(executor="full") == 1
+    executor.shutdown()
+
+
+def test_rejects_invalid_sizes():
+    with pytest.raises(ValueError):
+        BoundedExecutor("bad", workers=4, max_pending=2)
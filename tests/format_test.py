@@ -0,0 +1,114 @@
+import os
+
+import pandas as pd
+import pytest
+
+from DBinsert import dataset
+from DBinsert.format import clean, normalize_columns, stream, to_insert_tuples
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+
+def frame(**overrides):
+    row = {
+        "prop_type": "House",
+        "purpose": "For Sale",
+        "covered_area": "1,000 Sq. Yd.",
+        "price": 5000000,
+        "location": "Cantt, Karachi, Sindh",
+        "beds": "3",
+        "baths": "2",
+        "amenities": "",
+    }
+    row.update(overrides)
+    return pd.DataFrame([row])
+
+
+def test_clean_reproduces_checked_in_csv():
+    df = normalize_columns(pd.read_csv(os.path.join(ROOT, "properties.csv")))
+    with open(os.path.join(ROOT, "zameen_cleaned.csv"), newline="") as f:
+        expected = f.read()
+    assert clean(df).to_csv(index=False) == expected
+
+
+def test_missing_counts_come_from_amenities():
+    df = clean(frame(beds="-", baths="0", amenities="4 Bedrooms\n3 baths"))
+    assert (df.loc[0, "beds"], df.loc[0, "baths"]) == (4, 3)
+    df = clean(frame(beds="", baths="2", amenities="Parking Spaces"))
+    assert (df.loc[0, "beds"], df.loc[0, "baths"]) == (0, 2)
+
+
+def test_insert_tuples_use_null_for_blanks():
+    df = clean(frame(covered_area="-", prop_type=None, amenities="2 br"))
+    assert to_insert_tuples(df) == [
+        (None, "For Sale", None, 5000000.0, "Cantt, Karachi, Sindh", 3, 2, "2 br")
+    ]
+
+
+class FakeCursor:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def execute(self, query, params):
+        # multi-row INSERT: 8 columns per row
+        if self.conn.fail_on == len(self.conn.batches):
+            raise RuntimeError("insert failed")
+        self.conn.pending += [
+            tuple(params[i : i + 8]) for i in range(0, len(params), 8)
+        ]
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.batches = []
+        self.pending = []
+        self.rollbacks = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.batches.append(self.pending)
+        self.pending = []
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def test_stream_matches_whole_file_and_resumes(tmp_path):
+    source = os.path.join(ROOT, "properties.csv")
+    output = str(tmp_path / "cleaned.csv")
+
+    conn = FakeConnection(fail_on=3)
+    with pytest.raises(RuntimeError):
+        stream(source, output, conn, chunk_size=300)
+    assert len(conn.batches) == 3 and conn.rollbacks == 1
+
+    resumed = FakeConnection()
+    report = stream(source, output, resumed, chunk_size=300, batch_size=100)
+    assert len(resumed.batches) == 2
+    assert report.rows == sum(len(b) for b in resumed.batches)
+    assert report.rows + sum(len(b) for b in conn.batches) == 1302
+
+    with open(os.path.join(ROOT, "zameen_cleaned.csv"), "rb") as f:
+        expected = f.read()
+    with open(output, "rb") as f:
+        assert f.read() == expected
+
+    # A finished load is a no-op until the input changes or --restart.
+    assert stream(source, output, FakeConnection(), chunk_size=300).rows == 0
+
+
+def test_stream_writes_parquet_dataset(tmp_path):
+    source = os.path.join(ROOT, "properties.csv")
+    root = str(tmp_path / "cleaned.parquet")
+    conn = FakeConnection(fail_on=2)
+    with pytest.raises(RuntimeError):
+        stream(source, str(tmp_path / "c.csv"), conn, 500, dataset_root=root)
+    stream(source, str(tmp_path / "c.csv"), FakeConnection(), 500, dataset_root=root)
+    frame = dataset.read(root, ["price"])
+    assert len(frame) == 1302
@@ -0,0 +1,111 @@
+import re
+import sqlite3
+
+from DBinsert import incremental
+
+ROWS = [
+    ("House", "For Sale", 1000.0, 5000000.0, "Cantt, Karachi, Sindh", 3, 2, ""),
+    ("Flat", "For Rent", 240.0, 60000.0, "Clifton, Karachi, Sindh", 2, 1, "Lift"),
+    ("Plot", "For Sale", 500.0, None, "DHA Defence, Lahore", 0, 0, ""),
+]
+
+
+class SqliteConnection:
+    """mysql.connector-shaped connection on SQLite; MySQL upserts are
+    rewritten to ON CONFLICT."""
+
+    def __init__(self):
+        self.db = sqlite3.connect(":memory:")
+        self.db.executescript("""
+            CREATE TABLE property_data (
+                id INTEGER PRIMARY KEY, prop_type TEXT, purpose TEXT,
+                covered_area REAL, price REAL, location TEXT, beds INTEGER,
+                baths INTEGER, amenities TEXT, listing_key TEXT UNIQUE,
+                content_hash TEXT);
+            CREATE TABLE ingestion_watermarks (
+                source TEXT PRIMARY KEY, file_sha256 TEXT NOT NULL,
+                rows_written INTEGER, rows_unchanged INTEGER);
+            """)
+
+    def cursor(self):
+        return SqliteCursor(self.db)
+
+    def commit(self):
+        self.db.commit()
+
+    def rollback(self):
+        self.db.rollback()
+
+    def close(self):
+        pass
+
+    def count(self):
+        return self.db.execute("SELECT COUNT(*) FROM property_data").fetchone()[0]
+
+
+class SqliteCursor:
+    def __init__(self, db):
+        self._cursor = db.cursor()
+
+    def execute(self, sql, params=()):
+        target = "source" if "ingestion_watermarks" in sql else "listing_key"
+        sql = sql.replace(
+            " ON DUPLICATE KEY UPDATE ", f" ON CONFLICT({target}) DO UPDATE SET "
+        )
+        sql = re.sub(r"VALUES\((\w+)\)", r"excluded.\1", sql)
+        self._cursor.execute(sql.replace("%s", "?"), params)
+
+    def fetchall(self):
+        return self._cursor.fetchall()
+
+    def fetchone(self):
+        return self._cursor.fetchone()
+
+    def close(self):
+        self._cursor.close()
+
+
+def test_rerun_is_a_no_op():
+    conn = SqliteConnection()
+    first = incremental.upsert(conn, ROWS)
+    assert (first.rows, first.unchanged) == (3, 0)
+    again = incremental.upsert(conn, ROWS)
+    assert (again.rows, again.unchanged) == (0, 3)
+    assert conn.count() == 3
+
+
+def test_only_new_and_changed_rows_are_written():
+    conn = SqliteConnection()
+    incremental.upsert(conn, ROWS)
+    repriced = ROWS[0][:3] + (5500000.0,) + ROWS[0][4:]
+    new = ("Shop", "For Sale", 80.0, 900000.0, "Saddar, Karachi, Sindh", 0, 1, "")
+    report = incremental.upsert(conn, [repriced, ROWS[1], ROWS[2], new])
+    assert (report.rows, report.unchanged) == (2, 2)
+    assert conn.count() == 4
+    price = conn.db.execute(
+        "SELECT price FROM property_data WHERE prop_type = 'House'"
+    ).fetchone()[0]
+    assert price == 5500000.0
+
+
+def test_duplicate_listings_in_one_file_collapse():
+    hashed = incremental.with_hashes([ROWS[0], ROWS[0], ROWS[1]])
+    assert len(hashed) == 2
+    assert len({row[-2] for row in hashed}) == 2
+
+
+def test_watermark_tracks_file_digest(tmp_path):
+    conn = SqliteConnection()
+    scrape = tmp_path / "properties.csv"
+    scrape.write_text("prop_type\nHouse\n")
+    digest = incremental.file_sha256(scrape)
+    assert not incremental.already_loaded(conn, "properties.csv", digest)
+    report = incremental.upsert(conn, ROWS)
+    incremental.record_watermark(conn, "properties.csv", digest, report)
+    assert incremental.already_loaded(conn, "properties.csv", digest)
+
+    scrape.write_text("prop_type\nFlat\n")
+    changed = incremental.file_sha256(scrape)
+    assert not incremental.already_loaded(conn, "properties.csv", changed)
+    incremental.record_watermark(conn, "properties.csv", changed, report)
+    assert incremental.already_loaded(conn, "properties.csv", changed)
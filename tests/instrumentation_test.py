@@ -0,0 +1,61 @@
+import os
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from backend import metrics
+from backend.instrumentation import REQUEST_SECONDS, STAGE_SECONDS, RequestTimer, timed
+
+
+def make_client():
+    app = FastAPI()
+    app.add_middleware(RequestTimer)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        with timed("lookup"):
+            return {"id": item_id}
+
+    return TestClient(app)
+
+
+def test_requests_are_labelled_with_the_route_template():
+    client = make_client()
+    before = REQUEST_SECONDS.snapshot(
+        method="GET", route="/items/{item_id}", status=200
+    )
+    client.get("/items/1")
+    client.get("/items/2")
+    after = REQUEST_SECONDS.snapshot(method="GET", route="/items/{item_id}", status=200)
+    assert after[0] == before[0] + 2
+    assert STAGE_SECONDS.snapshot(stage="lookup")[0] >= 2
+
+
+def test_unknown_paths_share_one_label():
+    client = make_client()
+    before = REQUEST_SECONDS.snapshot(method="GET", route="unmatched", status=404)
+    client.get("/nope/1")
+    client.get("/nope/2")
+    after = REQUEST_SECONDS.snapshot(method="GET", route="unmatched", status=404)
+    assert after[0] == before[0] + 2
+
+
+def test_histogram_time_observes_the_block():
+    histogram = metrics.histogram("test_timer_seconds", "Timer test")
+    with histogram.time():
+        pass
+    count, total = histogram.snapshot()
+    assert count == 1 and 0 <= total < 1
+
+
+def test_every_sample_carries_the_worker_pid():
+    registry = metrics.Registry()
+    registry.counter("jobs_total", "Jobs", ["kind"]).inc(kind="a")
+    registry.histogram("job_seconds", "Job time", buckets=(1.0,)).observe(0.5)
+    pid = f'pid="{os.getpid()}"'
+    samples = [
+        line for line in registry.render().splitlines() if not line.startswith("#")
+    ]
+    assert samples and all(pid in line for line in samples)
+    assert f'jobs_total{{kind="a",{pid}}} 1.0' in samples
+    assert f'job_seconds_bucket{{le="1.0",{pid}}} 1.0' in samples
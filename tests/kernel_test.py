@@ -0,0 +1,79 @@
+import json
+import os
+
+import mlflow.sklearn
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import Ridge
+
+from backend.encoder import FeatureEncoder
+from backend.kernel import LinearKernel
+from backend.loader import ModelBundle
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+CACHE_DIR = os.path.join(ROOT, "backend", "model_cache")
+
+
+@pytest.fixture(scope="module")
+def samples():
+    df = pd.read_csv(os.path.join(ROOT, "zameen_cleaned.csv"))
+    return list(zip(df.covered_area, df.beds, df.baths, df.location, df.prop_type))
+
+
+@pytest.fixture(scope="module")
+def served():
+    model = mlflow.sklearn.load_model(os.path.join(CACHE_DIR, "ZameenPriceModelSale"))
+    with open(os.path.join(CACHE_DIR, "feature_columns.json")) as f:
+        return ModelBundle.build(model, json.load(f)["sale"])
+
+
+def sklearn_predict(bundle, samples):
+    X = bundle.encoder.encode_batch(samples)
+    return bundle.model.predict(bundle.model_input(X))
+
+
+def test_matches_sklearn_on_every_cleaned_row(served, samples):
+    # Includes rent listings and locations the model has never seen.
+    assert served.kernel is not None
+    expected = sklearn_predict(served, samples)
+    assert np.allclose(served.predict_batch(samples), expected, rtol=1e-12, atol=1e-6)
+    single = [served.predict_one(*sample) for sample in samples]
+    assert np.array_equal(single, served.predict_batch(samples))
+
+
+def test_matches_sparse_trained_ridge(samples):
+    frame = pd.DataFrame(
+        samples, columns=["covered_area", "beds", "baths", "location", "prop_type"]
+    )
+    encoder = FeatureEncoder.fit(frame)
+    price = np.arange(len(frame), dtype=float) * 1e4 + 1e6
+    model = Ridge(alpha=1.0, solver="lsqr").fit(encoder.encode_sparse(frame), price)
+    bundle = ModelBundle.build(model, encoder.columns)
+    assert np.allclose(
+        bundle.predict_batch(samples),
+        sklearn_predict(bundle, samples),
+        rtol=1e-12,
+        atol=1e-6,
+    )
+
+
+def test_non_linear_models_fall_back_to_predict(served, samples):
+    X = served.encoder.encode_batch(samples[:50])
+    forest = RandomForestRegressor(n_estimators=3, random_state=0)
+    forest.fit(X, np.arange(50.0))
+    bundle = ModelBundle.build(forest, served.feature_columns)
+    assert bundle.kernel is None
+    assert np.array_equal(bundle.predict_batch(samples[:50]), forest.predict(X))
+    assert bundle.predict_one(*samples[0]) == forest.predict(X[:1])[0]
+
+
+def test_kernel_can_be_disabled(served):
+    bundle = ModelBundle.build(served.model, served.feature_columns, kernel=False)
+    assert bundle.kernel is None
+
+
+def test_rejects_coefficients_of_another_width(served):
+    encoder = FeatureEncoder(served.feature_columns[:-1])
+    assert LinearKernel.from_model(served.model, encoder) is None
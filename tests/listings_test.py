@@ -0,0 +1,124 @@
+import json
+import sqlite3
+from contextlib import contextmanager
+
+import pytest
+from fastapi.testclient import TestClient
+
+import backend.app as api
+from backend import listings
+
+
+class SqliteCursor:
+    """mysql.connector-style dictionary cursor over sqlite3."""
+
+    def __init__(self, conn):
+        self._cursor = conn.cursor()
+
+    def execute(self, sql, params=()):
+        self._cursor.execute(sql.replace("%s", "?"), params)
+
+    def fetchall(self):
+        names = [d[0] for d in self._cursor.description]
+        return [dict(zip(names, row)) for row in self._cursor.fetchall()]
+
+    def close(self):
+        self._cursor.close()
+
+
+class SqlitePool:
+    def __init__(self, rows):
+        self.conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE property_data (id INTEGER PRIMARY KEY, prop_type TEXT, "
+            "purpose TEXT, covered_area REAL, price INTEGER, location TEXT, "
+            "beds INTEGER, baths INTEGER)"
+        )
+        self.conn.executemany(
+            "INSERT INTO property_data VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+        )
+        self.queries = 0
+
+    @contextmanager
+    def connection(self, query=None):
+        self.queries += 1
+        conn = self.conn
+
+        class Conn:
+            def cursor(self, dictionary=False):
+                return SqliteCursor(conn)
+
+        yield Conn()
+
+
+ROWS = [
+    (i, "House" if i % 2 else "Flat", "sale", 100.0 * i, 1_000_000 * i, loc, 3, 2)
+    for i, loc in zip(range(1, 11), ["Cantt", "Clifton"] * 5)
+]
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    pool = SqlitePool(ROWS)
+    monkeypatch.setattr(api, "db_pool", pool)
+    return pool
+
+
+@pytest.fixture
+def client(pool):
+    return TestClient(api.app)
+
+
+def test_build_query_binds_filters_and_cursor():
+    sql, params = listings.build_query(
+        ("id", "price"), {"location": "Cantt", "min_price": 5}, after=7, limit=3
+    )
+    assert sql == (
+        "SELECT id, price FROM property_data "
+        "WHERE location = %s AND price >= %s AND id > %s ORDER BY id LIMIT %s"
+    )
+    assert params == ("Cantt", 5, 7, 3)
+
+
+def test_parse_fields_always_keeps_id():
+    assert listings.parse_fields("price,location,price") == ("id", "price", "location")
+    with pytest.raises(ValueError):
+        listings.parse_fields("price,password")
+
+
+def test_pages_follow_cursor_to_the_end(client):
+    seen, cursor = [], None
+    while True:
+        params = {"limit": 4, **({"cursor": cursor} if cursor else {})}
+        response = client.get("/listings", params=params)
+        assert response.status_code == 200
+        seen += [row["id"] for row in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert seen == list(range(1, 11))
+
+
+def test_filters_and_projection(client):
+    response = client.get(
+        "/listings",
+        params={"location": "Clifton", "min_area": 300, "max_price": 8_000_000},
+    )
+    assert [row["id"] for row in response.json()] == [4, 6, 8]
+    response = client.get("/listings", params={"fields": "price", "limit": 1})
+    assert response.json() == [{"id": 1, "price": 1_000_000}]
+
+
+def test_limit_and_fields_are_validated(client):
+    over = client.get("/listings", params={"limit": api.LISTINGS_MAX_LIMIT + 1})
+    assert over.status_code == 422
+    assert client.get("/listings", params={"fields": "secret"}).status_code == 400
+
+
+def test_export_streams_every_page(client, pool, monkeypatch):
+    monkeypatch.setattr(api, "LISTINGS_EXPORT_CHUNK", 3)
+    response = client.get("/listings/export", params={"purpose": "sale"})
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["id"] for row in rows] == list(range(1, 11))
+    assert pool.queries == 4
@@ -0,0 +1,58 @@
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+import backend.app as api
+from backend.loader import BackgroundLoader
+from backend.snapshot_cache import SnapshotCache
+
+
+def test_loader_publishes_result_and_timings():
+    published = []
+
+    def load(timings):
+        timings["step_seconds"] = 0.01
+        return "model"
+
+    loader = BackgroundLoader("test", load, published.append)
+    assert loader.wait(timeout=5)
+    status = loader.status()
+    assert published == ["model"]
+    assert status["state"] == "ready" and status["timings"] == {"step_seconds": 0.01}
+
+
+def test_loader_retries_after_failure():
+    calls = []
+
+    def load(timings):
+        calls.append(1)
+        if len(calls) == 1:
+            raise RuntimeError("s3 unavailable")
+        return "model"
+
+    loader = BackgroundLoader("flaky", load, lambda result: None, retry_after=0.01)
+    assert not loader.wait(timeout=5)
+    assert "s3 unavailable" in loader.status()["error"]
+    loader._thread.join(timeout=5)
+    assert loader.state == "ready" and loader.attempts == 2
+
+
+def test_ready_reports_503_until_model_and_vocabulary_loaded(monkeypatch):
+    client = TestClient(api.app)
+    monkeypatch.setattr(api, "bundle", None)
+    monkeypatch.setattr(
+        api,
+        "vocabulary",
+        SnapshotCache(lambda: [{"location": "A", "prop_type": "B"}]),
+    )
+    response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["ready"] is False
+    assert client.get("/health").status_code == 200
+
+    api.vocabulary.refresh()
+    monkeypatch.setattr(api, "bundle", SimpleNamespace(version="v1", loaded_at=0.0))
+    response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["vocabulary"]["locations"] == 1
+    assert response.json()["model"]["version"] == "v1"
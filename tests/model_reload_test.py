@@ -0,0 +1,144 @@
+import json
+import os
+
+import mlflow.sklearn
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+
+import backend.app as api
+from backend.loader import ModelBundle
+from backend.model_store import RemoteObject
+from backend.snapshot_cache import SnapshotCache
+
+CACHE_DIR = os.path.join(os.path.dirname(__file__), "..", "backend", "model_cache")
+
+PAYLOAD = {
+    "coveredArea": 1000,
+    "beds": 3,
+    "bathrooms": 2,
+    "location": "Cantt, Karachi, Sindh",
+    "propType": "House",
+}
+
+
+class ScaledModel:
+    """Wraps the real model so two 'versions' give different predictions."""
+
+    def __init__(self, model, factor):
+        self.model = model
+        self.factor = factor
+
+    def predict(self, X):
+        return self.model.predict(X) * self.factor
+
+
+@pytest.fixture
+def remote(monkeypatch):
+    local_model = mlflow.sklearn.load_model(
+        os.path.join(CACHE_DIR, "ZameenPriceModelSale")
+    )
+    with open(os.path.join(CACHE_DIR, "feature_columns.json")) as f:
+        columns = json.load(f)["sale"]
+    state = {"etag": "v1", "factor": 1.0}
+
+    def list_model_objects(model_name=api.MODEL_NAME):
+        return [
+            RemoteObject("models/Sale/model.pkl", "Sale/model.pkl", state["etag"], 1)
+        ]
+
+    def load_model_artifacts(model_name=api.MODEL_NAME, timings=None, objects=None):
+        return ScaledModel(local_model, state["factor"]), columns, {}
+
+    monkeypatch.setattr(api, "list_model_objects", list_model_objects)
+    monkeypatch.setattr(api, "load_model_artifacts", load_model_artifacts)
+    monkeypatch.setattr(api, "bundle", api.load_bundle())
+    rows = [{"location": PAYLOAD["location"], "prop_type": PAYLOAD["propType"]}]
+    monkeypatch.setattr(api, "vocabulary", SnapshotCache(lambda: rows))
+    return state
+
+
+def test_reload_is_a_noop_when_version_unchanged(remote):
+    before = api.bundle
+    current, reloaded, _ = api.reload_model()
+    assert not reloaded and current is before
+
+
+def test_reload_swaps_in_new_version(remote, monkeypatch):
+    monkeypatch.setattr(api, "ADMIN_TOKEN", "s3cret")
+    client = TestClient(api.app)
+    old = client.post("/predict", json=PAYLOAD).json()
+
+    remote.update(etag="v2", factor=2.0)
+    response = client.post("/admin/model/reload", headers={"X-Admin-Token": "s3cret"})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["reloaded"] and body["previous_version"] == old["model_version"]
+
+    new = client.post("/predict", json=PAYLOAD).json()
+    assert new["model_version"] == body["version"] != old["model_version"]
+    assert new["prediction"] == pytest.approx(2 * old["prediction"])
+
+
+def test_in_flight_requests_keep_their_bundle(remote):
+    captured = api.bundle
+    remote.update(etag="v2", factor=2.0)
+    api.reload_model()
+    assert api.bundle is not captured
+    assert captured.model.factor == 1.0
+
+
+def test_broken_model_is_not_swapped_in(remote, monkeypatch):
+    before = api.bundle
+
+    class NaNModel:
+        def predict(self, X):
+            return np.full(len(X), np.nan)
+
+    columns = before.feature_columns
+    monkeypatch.setattr(
+        api, "load_model_artifacts", lambda **kwargs: (NaNModel(), columns, {})
+    )
+    remote.update(etag="v3")
+    with pytest.raises(ValueError):
+        api.reload_model()
+    assert api.bundle is before
+
+
+def test_bundle_build_defaults_version():
+    bundle = ModelBundle.build(object(), ["covered_area", "beds", "baths"])
+    assert bundle.version == "unversioned"
+
+
+def test_admin_routes_fail_closed_without_a_token(monkeypatch):
+    monkeypatch.setattr(api, "ADMIN_TOKEN", None)
+    monkeypatch.setattr(api, "ADMIN_ALLOW_ANONYMOUS", False)
+    client = TestClient(api.app)
+    assert client.post("/admin/model/reload?force=true").status_code == 403
+    assert client.post("/admin/vocabulary/invalidate").status_code == 403
+
+
+def test_admin_routes_reject_a_wrong_token(monkeypatch):
+    monkeypatch.setattr(api, "ADMIN_TOKEN", "s3cret")
+    client = TestClient(api.app)
+    response = client.post("/admin/model/reload", headers={"X-Admin-Token": "guess"})
+    assert response.status_code == 401
+
+
+def test_vocabulary_refresh_keeps_serving_when_the_db_is_down(monkeypatch):
+    state = {"down": False}
+
+    def loader():
+        if state["down"]:
+            raise ConnectionError("MySQL is down")
+        return [{"location": "Cantt, Karachi, Sindh", "prop_type": "House"}]
+
+    monkeypatch.setattr(api, "vocabulary", SnapshotCache(loader))
+    monkeypatch.setattr(api, "ADMIN_TOKEN", "s3cret")
+    client = TestClient(api.app, headers={"X-Admin-Token": "s3cret"})
+    assert client.post("/admin/vocabulary/invalidate").status_code == 200
+
+    state["down"] = True
+    response = client.post("/admin/vocabulary/invalidate")
+    assert response.status_code == 503
+    assert api.vocabulary.get().locations == ("Cantt, Karachi, Sindh",)
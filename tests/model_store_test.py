@@ -0,0 +1,110 @@
+import hashlib
+import os
+
+import pytest
+
+from backend.model_store import S3ModelCache
+
+
+class FakeS3:
+    """In-memory stand-in for the boto3 client calls S3ModelCache makes."""
+
+    def __init__(self, objects):
+        self.objects = dict(objects)
+        self.gets = []
+        self.fail_on = None
+
+    def _etag(self, key):
+        return '"' + hashlib.md5(self.objects[key]).hexdigest() + '"'
+
+    def get_paginator(self, name):
+        fake = self
+
+        class Paginator:
+            def paginate(self, Bucket, Prefix):
+                yield {
+                    "Contents": [
+                        {"Key": k, "ETag": fake._etag(k), "Size": len(v)}
+                        for k, v in sorted(fake.objects.items())
+                        if k.startswith(Prefix)
+                    ]
+                }
+
+        return Paginator()
+
+    def head_object(self, Bucket, Key):
+        return {"ETag": self._etag(Key), "ContentLength": len(self.objects[Key])}
+
+    def download_file(self, Bucket, Key, Filename):
+        self.gets.append(Key)
+        with open(Filename, "wb") as f:
+            f.write(self.objects[Key][:3])
+            if Key == self.fail_on:
+                raise ConnectionError("connection reset")
+            f.write(self.objects[Key][3:])
+
+
+def remote_objects(cache):
+    objects = cache.list_prefix("models/Sale", "Sale")
+    objects.append(cache.head("models/feature_columns.json", "feature_columns.json"))
+    return objects
+
+
+@pytest.fixture
+def s3():
+    return FakeS3(
+        {
+            "models/Sale/MLmodel": b"flavors: {}",
+            "models/Sale/model.pkl": b"pickled-model-bytes",
+            "models/feature_columns.json": b'{"sale": []}',
+        }
+    )
+
+
+def test_unchanged_artifacts_are_not_downloaded_again(tmp_path, s3):
+    cache = S3ModelCache(s3, "bucket", cache_dir=str(tmp_path))
+    first = cache.sync(remote_objects(cache))
+    assert first["downloaded"] == 3
+    assert (tmp_path / "Sale" / "model.pkl").read_bytes() == b"pickled-model-bytes"
+
+    s3.gets.clear()
+    second = cache.sync(remote_objects(cache))
+    assert second["downloaded"] == 0 and second["skipped"] == 3
+    assert s3.gets == []
+
+
+def test_only_changed_objects_are_fetched(tmp_path, s3):
+    cache = S3ModelCache(s3, "bucket", cache_dir=str(tmp_path))
+    cache.sync(remote_objects(cache))
+    s3.gets.clear()
+
+    s3.objects["models/Sale/model.pkl"] = b"retrained-model"
+    cache.sync(remote_objects(cache))
+    assert s3.gets == ["models/Sale/model.pkl"]
+    assert (tmp_path / "Sale" / "model.pkl").read_bytes() == b"retrained-model"
+
+
+def test_failed_download_keeps_previous_file(tmp_path, s3):
+    cache = S3ModelCache(s3, "bucket", cache_dir=str(tmp_path))
+    cache.sync(remote_objects(cache))
+
+    s3.objects["models/Sale/model.pkl"] = b"half-uploaded-model"
+    s3.fail_on = "models/Sale/model.pkl"
+    with pytest.raises(ConnectionError):
+        cache.sync(remote_objects(cache))
+    assert (tmp_path / "Sale" / "model.pkl").read_bytes() == b"pickled-model-bytes"
+    assert not [n for n in os.listdir(tmp_path / "Sale") if n.endswith(".part")]
+
+    s3.fail_on = None
+    s3.gets.clear()
+    cache.sync(remote_objects(cache))
+    assert s3.gets == ["models/Sale/model.pkl"]
+
+
+def test_removed_remote_files_are_pruned(tmp_path, s3):
+    cache = S3ModelCache(s3, "bucket", cache_dir=str(tmp_path))
+    cache.sync(remote_objects(cache), prune_dirs=("Sale",))
+    del s3.objects["models/Sale/MLmodel"]
+    cache.sync(remote_objects(cache), prune_dirs=("Sale",))
+    assert not (tmp_path / "Sale" / "MLmodel").exists()
+    assert "Sale/MLmodel" not in cache.read_manifest()
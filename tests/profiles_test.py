@@ -0,0 +1,131 @@
+import sqlite3
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+import backend.app as api
+from backend.profiles import LocationProfiles
+from backend.snapshot_cache import SnapshotCache
+from DBinsert import location_stats
+
+ROWS = {
+    "stats": [
+        {
+            "location": "Clifton, Karachi, Sindh",
+            "purpose": "For Sale",
+            "listings": 3,
+            "median_price": 30000000.0,
+            "median_price_per_unit_area": 15000.0,
+        },
+        {
+            "location": "Clifton, Karachi, Sindh",
+            "purpose": "For Rent",
+            "listings": 2,
+            "median_price": 150000.0,
+            "median_price_per_unit_area": None,
+        },
+        {
+            "location": "Cantt, Karachi, Sindh",
+            "purpose": "For Sale",
+            "listings": 1,
+            "median_price": 9000000.0,
+            "median_price_per_unit_area": 9000.0,
+        },
+    ],
+    "sentiments": [
+        {
+            "location": "Clifton, Karachi, Sindh",
+            "water_sentiment": "Fair",
+            "electricity_sentiment": "Good",
+            "gas_sentiment": "Poor",
+            "traffic_sentiment": "Poor",
+            "safety_sentiment": "Good",
+            "updated_at": datetime(2025, 1, 2, 3, 4, 5),
+        },
+    ],
+}
+
+
+def test_snapshot_joins_stats_and_sentiments():
+    snapshot = LocationProfiles.from_rows(ROWS)
+    assert list(snapshot.profiles) == [
+        "Cantt, Karachi, Sindh",
+        "Clifton, Karachi, Sindh",
+    ]
+    clifton = snapshot.get("Clifton, Karachi, Sindh")
+    assert clifton["total_listings"] == 5
+    assert clifton["listings"]["For Rent"]["median_price"] == 150000.0
+    assert clifton["sentiments"]["gas"] == "Poor"
+    assert clifton["sentiments"]["updated_at"] == "2025-01-02T03:04:05"
+    assert snapshot.get("Cantt, Karachi, Sindh")["sentiments"] is None
+    assert snapshot.counts() == {"locations": 2}
+
+
+@pytest.fixture
+def client(monkeypatch):
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return ROWS
+
+    cache = SnapshotCache(
+        loader, ttl=60, snapshot_type=LocationProfiles, name="location-profiles"
+    )
+    monkeypatch.setattr(api, "location_profiles", cache)
+    client = TestClient(api.app)
+    client.calls = calls
+    return client
+
+
+def test_profile_endpoints_are_served_from_snapshot(client):
+    response = client.get("/locations/Clifton, Karachi, Sindh/profile")
+    assert response.status_code == 200
+    assert response.json()["listings"]["For Sale"]["count"] == 3
+
+    profiles = client.get("/locations/profiles").json()
+    assert [p["location"] for p in profiles] == [
+        "Cantt, Karachi, Sindh",
+        "Clifton, Karachi, Sindh",
+    ]
+    assert len(client.calls) == 1
+
+
+def test_unknown_location_is_404(client):
+    assert client.get("/locations/Nowhere/profile").status_code == 404
+
+
+def test_refresh_location_stats_aggregates_in_sql():
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        "CREATE TABLE property_data (location TEXT, purpose TEXT, price INTEGER, "
+        "covered_area REAL)"
+    )
+    conn.execute(
+        "CREATE TABLE location_stats (location TEXT, purpose TEXT, listings INT, "
+        "median_price REAL, median_price_per_unit_area REAL)"
+    )
+    conn.executemany(
+        "INSERT INTO property_data VALUES (?, ?, ?, ?)",
+        [
+            ("A", "For Sale", 100, 10),
+            ("A", "For Sale", 300, 0),
+            ("A", "For Sale", 200, 20),
+            ("B", "For Rent", 50, 5),
+            ("B", "For Rent", 70, 7),
+            ("B", None, None, 5),
+            (None, "For Sale", 999, 1),
+            ("", "For Sale", 999, 1),
+        ],
+    )
+    conn.execute("INSERT INTO location_stats VALUES ('Gone', '', 1, 1, 1)")
+    assert location_stats.refresh(conn) == 3
+    rows = conn.execute(
+        "SELECT * FROM location_stats ORDER BY location, purpose"
+    ).fetchall()
+    assert rows == [
+        ("A", "For Sale", 3, 200.0, 10.0),
+        ("B", "", 1, None, None),
+        ("B", "For Rent", 2, 60.0, 10.0),
+    ]
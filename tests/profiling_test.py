@@ -0,0 +1,154 @@
+import pstats
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import backend.app as api
+from backend.profiling import ProfilingMiddleware, RequestProfiler
+
+
+def token_is(expected):
+    return lambda token: token == expected
+
+
+def make_client(profiler):
+    app = FastAPI()
+    app.add_middleware(ProfilingMiddleware, profiler=profiler)
+
+    @app.get("/predict")
+    async def predict():
+        return {"prediction": sum(range(1000))}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    return TestClient(app)
+
+
+def test_disabled_profiler_ignores_the_header(tmp_path):
+    client = make_client(RequestProfiler(directory=str(tmp_path)))
+    response = client.get("/predict", headers={"X-Profile": "1"})
+    assert "x-profile-id" not in response.headers
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_header_captures_a_loadable_pstats_file(tmp_path):
+    profiler = RequestProfiler(
+        directory=str(tmp_path), enabled=True, authorize=token_is("s3cret")
+    )
+    client = make_client(profiler)
+    response = client.get(
+        "/predict", headers={"X-Profile": "1", "X-Admin-Token": "s3cret"}
+    )
+    assert response.json() == {"prediction": 499500}
+    name = response.headers["x-profile-id"]
+    assert [p["name"] for p in profiler.list()] == [name]
+    stats = pstats.Stats(profiler.path(name))
+    assert any(func[2] == "predict" for func in stats.stats)
+
+
+def test_header_needs_an_authorized_token(tmp_path):
+    profiler = RequestProfiler(
+        directory=str(tmp_path), enabled=True, authorize=token_is("s3cret")
+    )
+    client = make_client(profiler)
+    for headers in ({"X-Profile": "1"}, {"X-Profile": "1", "X-Admin-Token": "guess"}):
+        assert "x-profile-id" not in client.get("/predict", headers=headers).headers
+    assert (
+        "x-profile-id"
+        in client.get(
+            "/predict", headers={"X-Profile": "1", "X-Admin-Token": "s3cret"}
+        ).headers
+    )
+
+
+def test_sampling_only_covers_profiled_paths(tmp_path):
+    profiler = RequestProfiler(
+        directory=str(tmp_path), enabled=True, sample_rate=1.0, max_files=2
+    )
+    client = make_client(profiler)
+    assert "x-profile-id" not in client.get("/health").headers
+    for _ in range(3):
+        assert "x-profile-id" in client.get("/predict").headers
+    assert len(profiler.list()) == 2
+
+
+def test_rejects_names_outside_the_directory(tmp_path):
+    profiler = RequestProfiler(directory=str(tmp_path))
+    assert profiler.path("../secrets.prof") is None
+    assert profiler.path("missing.prof") is None
+    with pytest.raises(ValueError):
+        profiler.configure(sample_rate=2)
+
+
+def test_admin_endpoints_toggle_list_and_fetch(tmp_path, monkeypatch):
+    monkeypatch.setattr(api.request_profiler, "directory", str(tmp_path))
+    monkeypatch.setattr(api.request_profiler, "enabled", False)
+    monkeypatch.setattr(api, "ADMIN_TOKEN", "s3cret")
+    client = TestClient(api.app, headers={"X-Admin-Token": "s3cret"})
+    status = client.post("/admin/profiling", params={"enabled": True}).json()
+    assert status["enabled"] is True
+
+    payload = {
+        "coveredArea": 1000,
+        "beds": 3,
+        "bathrooms": 2,
+        "location": "Cantt, Karachi, Sindh",
+        "propType": "House",
+    }
+    name = client.post("/predict", json=payload, headers={"X-Profile": "1"}).headers[
+        "x-profile-id"
+    ]
+    assert [p["name"] for p in client.get("/admin/profiles").json()] == [name]
+    response = client.get(f"/admin/profiles/{name}")
+    assert response.status_code == 200 and len(response.content) > 0
+    assert client.get("/admin/profiles/nope.prof").status_code == 404
+
+
+def test_header_is_ignored_without_an_authorizer(tmp_path):
+    client = make_client(RequestProfiler(directory=str(tmp_path), enabled=True))
+    response = client.get("/predict", headers={"X-Profile": "1"})
+    assert "x-profile-id" not in response.headers
+
+
+def test_anonymous_clients_cannot_profile_by_default(tmp_path, monkeypatch):
+    monkeypatch.setattr(api.request_profiler, "directory", str(tmp_path))
+    monkeypatch.setattr(api.request_profiler, "enabled", True)
+    monkeypatch.setattr(api, "ADMIN_TOKEN", None)
+    monkeypatch.setattr(api, "ADMIN_ALLOW_ANONYMOUS", False)
+    client = TestClient(api.app)
+    assert client.post("/admin/profiling?enabled=true").status_code == 403
+    assert client.get("/admin/profiles").status_code == 403
+    response = client.post("/predict", json={}, headers={"X-Profile": "1"})
+    assert "x-profile-id" not in response.headers
+
+
+def test_toggle_reaches_every_worker_sharing_the_directory(tmp_path):
+    workers = [
+        RequestProfiler(directory=str(tmp_path), sample_rate=1.0, check_every=0)
+        for _ in range(2)
+    ]
+    clients = [make_client(profiler) for profiler in workers]
+    workers[0].configure(enabled=True)
+    assert "x-profile-id" in clients[1].get("/predict").headers
+    # A partial update keeps what the other worker switched on.
+    workers[1].configure(sample_rate=0.5)
+    workers[0].sync()
+    assert workers[0].status()["enabled"] is True
+    assert workers[0].sample_rate == 0.5
+
+
+def test_settings_are_rechecked_at_most_every_check_every(tmp_path):
+    clock = [0.0]
+    reader = RequestProfiler(
+        directory=str(tmp_path), check_every=1.0, clock=lambda: clock[0]
+    )
+    reader.sync()
+    RequestProfiler(directory=str(tmp_path)).configure(enabled=True)
+    reader.sync()
+    assert reader.enabled is False
+    clock[0] = 1.0
+    reader.sync()
+    assert reader.enabled is True
@@ -0,0 +1,53 @@
+from backend.result_cache import ResultCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_put_and_hit_ratio():
+    cache = ResultCache(max_entries=10, ttl=60)
+    assert cache.get("a") is None
+    cache.put("a", {"prediction": 1.0}, cost_seconds=0.01)
+    assert cache.get("a") == {"prediction": 1.0}
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+
+
+def test_evicts_least_recently_used():
+    cache = ResultCache(max_entries=2, ttl=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+    assert cache.stats()["entries"] == 2
+
+
+def test_expired_entries_are_misses():
+    clock = FakeClock()
+    cache = ResultCache(max_entries=10, ttl=30, clock=clock)
+    cache.put("a", 1)
+    clock.now = 31
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_zero_size_disables_cache():
+    cache = ResultCache(max_entries=0)
+    cache.put("a", 1)
+    assert cache.get("a") is None
+    assert cache.stats()["entries"] == 0
+
+
+def test_clear_drops_everything():
+    cache = ResultCache()
+    cache.put("a", 1)
+    cache.clear()
+    assert cache.get("a") is None
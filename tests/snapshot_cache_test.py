@@ -0,0 +1,76 @@
+from backend.snapshot_cache import CACHE_ENTRIES, CACHE_REFRESHES, SnapshotCache
+
+ROWS = [
+    {"location": "Clifton, Karachi, Sindh", "prop_type": "House"},
+    {"location": "Cantt, Karachi, Sindh", "prop_type": "Flat"},
+    {"location": None, "prop_type": "House"},
+]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_hits_loader_once_within_ttl():
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return ROWS
+
+    cache = SnapshotCache(loader, ttl=60, clock=FakeClock())
+    first = cache.get()
+    assert cache.get() is first
+    assert len(calls) == 1
+
+
+def test_cache_serves_stale_and_refreshes():
+    clock = FakeClock()
+    rows = list(ROWS)
+    cache = SnapshotCache(lambda: rows, ttl=60, clock=clock)
+    old = cache.get()
+
+    rows.append({"location": "DHA Defence, Karachi, Sindh", "prop_type": "Plot"})
+    clock.now = 61
+    # An expired entry is returned immediately; the reload happens off-thread.
+    assert cache.get() is old
+    assert "Plot" in cache.refresh().prop_type_set
+
+
+def test_cache_keeps_snapshot_on_loader_failure():
+    state = {"fail": False}
+
+    def loader():
+        if state["fail"]:
+            raise RuntimeError("db down")
+        return ROWS
+
+    cache = SnapshotCache(loader, ttl=60, clock=FakeClock())
+    good = cache.get()
+    state["fail"] = True
+    assert cache.refresh() is good
+
+
+def test_invalidate_forces_reload():
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return ROWS
+
+    cache = SnapshotCache(loader, ttl=60, clock=FakeClock())
+    cache.get()
+    cache.invalidate()
+    cache.get()
+    assert len(calls) == 2
+
+
+def test_refresh_exports_cache_gauges():
+    cache = SnapshotCache(lambda: ROWS, name="gauged")
+    cache.refresh()
+    assert CACHE_REFRESHES.value(cache="gauged", result="ok") == 1
+    assert CACHE_ENTRIES.value(cache="gauged", kind="locations") == 2
@@ -0,0 +1,136 @@
+import os
+
+import joblib
+import mlflow
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression, Ridge
+
+import mlflowserv
+from backend.encoder import FeatureEncoder
+from backend.loader import ModelBundle
+from DBinsert import dataset
+
+DATA = os.path.join(os.path.dirname(__file__), "..", "zameen_cleaned.csv")
+
+
+def test_sparse_training_matches_dense_linear_regression():
+    sale_data = mlflowserv.load_sale_data(DATA)
+    model, encoder, mae, r2 = mlflowserv.train(sale_data)
+
+    # The old script: get_dummies + LinearRegression on the full frame.
+    X = pd.concat(
+        [
+            sale_data[["covered_area", "beds", "baths"]],
+            pd.get_dummies(sale_data["location"], prefix="location"),
+            pd.get_dummies(sale_data["prop_type"], prefix="prop_type"),
+        ],
+        axis=1,
+    )
+    assert list(X.columns) == encoder.columns
+    dense = LinearRegression().fit(X, sale_data["price"])
+    sparse = mlflowserv.make_model().fit(
+        encoder.encode_sparse(sale_data), sale_data["price"]
+    )
+    expected = dense.predict(X)
+    actual = sparse.predict(encoder.encode_sparse(sale_data))
+    # Within a hundred rupees on prices in the millions.
+    assert np.allclose(actual, expected, rtol=0, atol=100)
+    assert np.isfinite(mae) and np.isfinite(r2)
+
+
+def test_bundle_feeds_sparse_trained_model_a_bare_matrix():
+    sale_data = mlflowserv.load_sale_data(DATA)
+    model, encoder, _, _ = mlflowserv.train(sale_data)
+    bundle = ModelBundle.build(model, encoder.columns)
+    X = encoder.encode(1000.0, 3, 2, "Cantt, Karachi, Sindh", "House")
+    assert isinstance(bundle.model_input(X), np.ndarray)
+    assert np.isfinite(model.predict(bundle.model_input(X))).all()
+
+
+def test_parquet_and_csv_training_data_encode_identically(tmp_path):
+    root = str(tmp_path / "cleaned.parquet")
+    dataset.write(pd.read_csv(DATA), root)
+    from_csv = mlflowserv.load_sale_data(DATA)
+    from_parquet = mlflowserv.load_sale_data(root)
+    encoder = FeatureEncoder.fit(from_csv)
+    assert FeatureEncoder.fit(from_parquet).columns == encoder.columns
+    assert (
+        encoder.encode_sparse(from_csv) != encoder.encode_sparse(from_parquet)
+    ).nnz == 0
+
+
+def test_shared_arrays_are_memory_mapped(tmp_path):
+    encoder, (X_train, _, y_train, _) = mlflowserv.split(
+        mlflowserv.load_sale_data(DATA)
+    )
+    paths = mlflowserv.share(str(tmp_path), X_train=X_train, y_train=y_train)
+    X = joblib.load(paths["X_train"], mmap_mode="r")
+    assert isinstance(X.data, np.memmap)
+    assert (X != X_train).nnz == 0
+
+
+def test_sweep_ranks_and_logs_every_candidate(tmp_path):
+    candidates = [
+        ("ridge", Ridge, {"solver": "lsqr"}, {"alpha": [1e-8, 10.0]}),
+        (
+            "random_forest",
+            RandomForestRegressor,
+            {"n_estimators": 5, "random_state": 0},
+            {"max_depth": [4]},
+        ),
+    ]
+    encoder, results = mlflowserv.sweep(
+        mlflowserv.load_sale_data(DATA), n_jobs=1, candidates=candidates
+    )
+    assert len(results) == 3
+    assert [r["mae"] for r in results] == sorted(r["mae"] for r in results)
+
+    mlflow.set_tracking_uri(f"sqlite:///{tmp_path / 'mlflow.db'}")
+    try:
+        # Keep the logged model out of the repo's ./mlruns.
+        mlflow.create_experiment(
+            "test-sweep", artifact_location=(tmp_path / "artifacts").as_uri()
+        )
+        parent = mlflowserv.log_sweep(results, encoder, experiment="test-sweep")
+        runs = mlflow.search_runs(
+            experiment_names=["test-sweep"],
+            filter_string=f"tags.mlflow.parentRunId = '{parent}'",
+        )
+    finally:
+        mlflow.set_tracking_uri(None)
+    assert len(runs) == 3
+    promoted = runs[runs["tags.promoted"] == "true"]
+    assert promoted["tags.mlflow.runName"].tolist() == [results[0]["name"]]
+    assert promoted["metrics.mae"].iloc[0] == results[0]["mae"]
+
+
+class FakeS3:
+    def __init__(self, keys):
+        self.keys = set(keys)
+
+    def upload_file(self, path, bucket, key):
+        self.keys.add(key)
+
+    def delete_object(self, Bucket, Key):
+        self.keys.discard(Key)
+
+    def get_paginator(self, name):
+        fake = self
+
+        class Paginator:
+            def paginate(self, Bucket, Prefix):
+                keys = sorted(k for k in fake.keys if k.startswith(Prefix))
+                yield {"Contents": [{"Key": k} for k in keys]}
+
+        return Paginator()
+
+
+def test_model_upload_deletes_keys_the_new_folder_lacks(tmp_path, monkeypatch):
+    # The previous model was linear and uploaded a serving.npz; this one isn't.
+    (tmp_path / "model.pkl").write_bytes(b"forest")
+    s3 = FakeS3({"models/M/model.pkl", "models/M/serving.npz", "models/other.json"})
+    monkeypatch.setattr(mlflowserv, "s3", s3)
+    mlflowserv.upload_to_s3(str(tmp_path), "bucket", "models/M")
+    assert s3.keys == {"models/M/model.pkl", "models/other.json"}
@@ -0,0 +1,15 @@
+from backend.vocabulary import VocabularySnapshot
+
+ROWS = [
+    {"location": "Clifton, Karachi, Sindh", "prop_type": "House"},
+    {"location": "Cantt, Karachi, Sindh", "prop_type": "Flat"},
+    {"location": None, "prop_type": "House"},
+]
+
+
+def test_snapshot_from_rows():
+    snapshot = VocabularySnapshot.from_rows(ROWS)
+    assert snapshot.locations == ("Cantt, Karachi, Sindh", "Clifton, Karachi, Sindh")
+    assert snapshot.prop_types == ("Flat", "House")
+    assert "Cantt, Karachi, Sindh" in snapshot.location_set
+    assert snapshot.as_dict()["prop_type"] == ["Flat", "House"]